@@ -1,12 +1,20 @@
 # File: app.py
 
-from tkinter import Tk
-from frontend.main_ui import DynamicMemoryVisualizerApp
+import sys
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] != "gui":
+        # Any other arguments select the headless CLI, which never imports tkinter
+        from backend.cli import main as cli_main
+        return cli_main(argv)
+    # The GUI (and tkinter) is only imported when it is actually requested
+    from tkinter import Tk
+    from frontend.main_ui import DynamicMemoryVisualizerApp
     root = Tk()
     app = DynamicMemoryVisualizerApp(root)
     root.mainloop()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
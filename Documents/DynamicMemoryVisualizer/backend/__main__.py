@@ -0,0 +1,7 @@
+# File: backend/__main__.py
+
+import sys
+
+from backend.cli import main
+
+sys.exit(main())
@@ -0,0 +1,308 @@
+# File: backend/cli.py
+
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import json
+import sys
+
+# Nothing here may import tkinter: this entry point has to run on servers
+# without a display. Heavier modules (the sweep's process pool) are only
+# imported by the subcommands that need them.
+from backend.memory_management import (CompactPagingSimulator, CompactVirtualMemorySimulator, PagingSimulator,
+                                       SegmentationSimulator, VirtualMemorySimulator, miss_ratio_curve)
+from backend.free_space import FIT_STRATEGIES
+from backend.instrumentation import CallTimer, EventCounter, ResidencyHistogram
+from backend.multiprogramming import (REPLACEMENT_SCOPES, MultiprogrammedSimulator, equal_quotas, round_robin,
+                                      split_by_pid, trace_schedule)
+from backend.policies import available_policies
+from backend.tlb import TLB, TLB_REPLACEMENT
+from backend.trace_io import iter_segment_ops, open_trace
+from backend.working_set import WorkingSetAnalyzer
+
+# Subcommands implemented by other modules, imported on demand
+DELEGATED = {
+    "sweep": ("backend.sweep", "replay a trace across frame counts x policies in parallel"),
+    "trace": ("backend.trace_io", "convert address logs to binary traces / inspect traces"),
+}
+
+# ----------------- Commands -----------------
+def attach_sinks(simulator, args):
+    # --events: per-event counters, residency histogram and sampled call
+    # timing. Replay then goes through the per-access instrumented path.
+    if not args.events:
+        return []
+    sinks = [EventCounter(), ResidencyHistogram(), CallTimer(args.sample_every)]
+    for sink in sinks:
+        simulator.add_observer(sink)
+    return sinks
+
+def attach_working_set(simulator, args):
+    if not args.working_set:
+        return None
+    analyzer = WorkingSetAnalyzer(args.working_set, args.ws_interval or args.working_set)
+    simulator.add_observer(analyzer)
+    return analyzer
+
+def working_set_summary(analyzer, args):
+    if analyzer is None:
+        return {}
+    analyzer.flush()
+    if args.series:
+        analyzer.write_csv(args.series)
+    return {"working_set": analyzer.summary()}
+
+def sink_summaries(sinks):
+    if not sinks:
+        return {}
+    counter, residency, timer = sinks
+    return {"events": {**counter.summary(), **residency.summary(), "timing": timer.summary()}}
+
+def run_paging(args):
+    trace, trace_file = open_trace(args.trace)
+    try:
+        if args.compact:
+            simulator = CompactPagingSimulator(args.frames, args.policy, args.num_pages)
+        else:
+            simulator = PagingSimulator(args.frames, args.policy)
+        sinks = attach_sinks(simulator, args)
+        analyzer = attach_working_set(simulator, args)
+        stats = simulator.run_trace(trace, record=False).summary()
+    finally:
+        if trace_file is not None:
+            trace_file.close()
+    stats.update(frames=args.frames, policy=args.policy, **sink_summaries(sinks),
+                 **working_set_summary(analyzer, args))
+    if args.footprint:
+        stats["memory_bytes"] = simulator.memory_footprint()
+    return stats
+
+def run_virtual(args):
+    tlb = None
+    if args.tlb_entries:
+        tlb = TLB(args.tlb_entries, args.tlb_associativity or args.tlb_entries, args.tlb_replacement)
+    trace, trace_file = open_trace(args.trace)
+    try:
+        if args.compact:
+            simulator = CompactVirtualMemorySimulator(args.frames, args.levels, tlb=tlb, num_pages=args.num_pages)
+        else:
+            simulator = VirtualMemorySimulator(args.frames, args.levels, tlb=tlb)
+        sinks = attach_sinks(simulator, args)
+        analyzer = attach_working_set(simulator, args)
+        stats = simulator.run_trace(trace, record=False).summary()
+    finally:
+        if trace_file is not None:
+            trace_file.close()
+    stats.update(working_set_summary(analyzer, args))
+    stats.update(frames=args.frames, page_table_levels=args.levels,
+                 page_table_bytes=simulator.page_table_overhead(),
+                 effective_access_time_ns=simulator.effective_access_time(),
+                 **sink_summaries(sinks))
+    if args.footprint:
+        stats["memory_bytes"] = simulator.memory_footprint()
+    return stats
+
+def run_segmentation(args):
+    simulator = SegmentationSimulator(args.memory, args.strategy)
+    sinks = attach_sinks(simulator, args)
+    counts = {"allocations": 0, "failed_allocations": 0, "frees": 0, "failed_frees": 0,
+              "compactions": 0, "bytes_moved": 0}
+    failures = {}
+    for op, label, size in iter_segment_ops(args.trace):
+        if op == "alloc":
+            ok = simulator.allocate_segment(size, label)
+            if not ok:
+                reason = simulator.failure_reason(size, label)
+                if reason == "no free block large enough" and args.compact_on_failure:
+                    counts["compactions"] += 1
+                    counts["bytes_moved"] += simulator.compact()
+                    ok = simulator.allocate_segment(size, label)
+                if not ok:
+                    failures[reason] = failures.get(reason, 0) + 1
+            counts["allocations" if ok else "failed_allocations"] += 1
+        else:
+            ok = simulator.free_segment(label)
+            counts["frees" if ok else "failed_frees"] += 1
+    counts.update(failure_reasons=failures, total_memory=args.memory, strategy=args.strategy,
+                  segments=len(simulator.segment_by_label), **simulator.fragmentation_stats(),
+                  **sink_summaries(sinks))
+    return counts
+
+def run_multi(args):
+    # One process per trace file, or one per pid of a single trace with a
+    # pid column. --scheduler trace keeps the recorded interleaving.
+    opened = []
+    schedule = None
+    try:
+        for path in args.traces:
+            opened.append(open_trace(path))
+        pids = opened[0][1].pids if len(opened) == 1 and opened[0][1] is not None else None
+        if args.scheduler == "trace":
+            if pids is None:
+                raise ValueError("--scheduler trace needs a single binary trace with a pid column")
+            schedule = trace_schedule(opened[0][0], pids)
+            processes = sorted(set(pids))
+        else:
+            traces = split_by_pid(opened[0][0], pids) if pids is not None else dict(enumerate(t for t, _ in opened))
+            schedule = round_robin(traces, args.quantum)
+            processes = list(traces)
+        quotas = {}
+        if args.scope == "local":
+            quotas = dict(args.quota)
+            unlisted = [pid for pid in processes if pid not in quotas]
+            if unlisted:
+                quotas.update(equal_quotas(args.frames - sum(quotas.values()), unlisted))
+        simulator = MultiprogrammedSimulator(args.frames, args.policy, args.scope, quotas,
+                                             thrash_window=args.thrash_window,
+                                             thrash_threshold=args.thrash_threshold)
+        stats = simulator.run(schedule).summary()
+    finally:
+        if schedule is not None:
+            schedule.close()  # drops its views of the mapped columns
+        for _, trace_file in opened:
+            if trace_file is not None:
+                trace_file.close()
+    stats.update(frames=args.frames, policy=args.policy, scope=args.scope, scheduler=args.scheduler,
+                 processes=simulator.process_stats())
+    return stats
+
+def run_mrc(args):
+    trace, trace_file = open_trace(args.trace)
+    try:
+        curve = miss_ratio_curve(trace, "LRU", args.max_frames)
+    finally:
+        if trace_file is not None:
+            trace_file.close()
+    return {"algo": "LRU", "faults": curve}
+
+# ----------------- Argument Parsing -----------------
+def positive_int(text):
+    value = int(text, 0)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, not {text}")
+    return value
+
+def pid_quota(text):
+    pid, _, frames = text.partition("=")
+    try:
+        return int(pid, 0), positive_int(frames)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected PID=FRAMES, not {text}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m backend",
+        description="Run the memory simulators headlessly against trace files.")
+    # Output options shared by every simulator command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="print results as JSON")
+    common.add_argument("--output", "-o", help="also write the results as JSON to this file")
+    common.add_argument("--timing", action="store_true", help="report startup and run time on stderr")
+    # State representation and analysis options for the page-based simulators
+    paged = argparse.ArgumentParser(add_help=False)
+    paged.add_argument("--compact", action="store_true", help="keep frames and page tables in typed arrays")
+    paged.add_argument("--num-pages", type=positive_int, default=None,
+                       help="with --compact, index the page table by page number over 0..N-1")
+    paged.add_argument("--footprint", action="store_true", help="report the simulator's memory use in bytes")
+    paged.add_argument("--working-set", type=positive_int, default=None, metavar="TAU",
+                       help="track the working set W(t, TAU) and page-fault frequency")
+    paged.add_argument("--ws-interval", type=positive_int, default=None,
+                       help="references per working-set sample (default: TAU)")
+    paged.add_argument("--series", help="with --working-set, write the samples to this CSV file")
+    # Instrumentation options for the commands that drive a simulator
+    observed = argparse.ArgumentParser(add_help=False)
+    observed.add_argument("--events", action="store_true",
+                          help="attach event counters, a residency histogram and sampled call timing")
+    observed.add_argument("--sample-every", type=positive_int, default=64,
+                          help="with --events, time one simulator call in this many")
+    commands = parser.add_subparsers(dest="command", required=True,
+                                     metavar="{paging,virtual,segmentation,multi,mrc,sweep,trace}")
+
+    paging = commands.add_parser("paging", parents=[common, observed, paged], help="replay a page trace through PagingSimulator")
+    paging.add_argument("trace", help="binary or text page trace")
+    paging.add_argument("--frames", type=positive_int, required=True)
+    paging.add_argument("--policy", default="FIFO", choices=available_policies())
+    paging.set_defaults(run=run_paging)
+
+    virtual = commands.add_parser("virtual", parents=[common, observed, paged], help="replay a page trace through VirtualMemorySimulator")
+    virtual.add_argument("trace", help="binary or text page trace")
+    virtual.add_argument("--frames", type=positive_int, required=True)
+    virtual.add_argument("--levels", type=int, default=1, help="page-table levels (1 = flat)")
+    virtual.add_argument("--tlb-entries", type=int, default=0, help="TLB size (0 = no TLB)")
+    virtual.add_argument("--tlb-associativity", type=int, default=0, help="ways per set (default: fully associative)")
+    virtual.add_argument("--tlb-replacement", default="LRU", choices=TLB_REPLACEMENT)
+    virtual.set_defaults(run=run_virtual)
+
+    segmentation = commands.add_parser("segmentation", parents=[common, observed], help="replay alloc/free operations")
+    segmentation.add_argument("trace", help="lines of 'alloc LABEL SIZE' or 'free LABEL'")
+    segmentation.add_argument("--memory", type=positive_int, required=True, help="total memory size")
+    segmentation.add_argument("--strategy", default="First Fit", choices=FIT_STRATEGIES)
+    segmentation.add_argument("--compact-on-failure", action="store_true",
+                              help="compact and retry when free memory is enough but fragmented")
+    segmentation.set_defaults(run=run_segmentation)
+
+    multi = commands.add_parser("multi", parents=[common], help="interleave several processes over shared frames")
+    multi.add_argument("traces", nargs="+", help="one page trace per process, or one binary trace with pids")
+    multi.add_argument("--frames", type=positive_int, required=True)
+    multi.add_argument("--policy", default="FIFO", choices=available_policies())
+    multi.add_argument("--scope", default="global", choices=REPLACEMENT_SCOPES,
+                       help="evict from any process (global) or only the faulting one (local)")
+    multi.add_argument("--scheduler", default="rr", choices=["rr", "trace"],
+                       help="round-robin with --quantum, or the trace's own pid interleaving")
+    multi.add_argument("--quantum", type=positive_int, default=100, help="references per round-robin turn")
+    multi.add_argument("--quota", type=pid_quota, action="append", default=[], metavar="PID=FRAMES",
+                       help="with --scope local, frames for one process (others split the rest evenly)")
+    multi.add_argument("--thrash-window", type=positive_int, default=256,
+                       help="references per process the thrashing test looks back over")
+    multi.add_argument("--thrash-threshold", type=float, default=0.5,
+                       help="fault rate over the window above which a process is thrashing")
+    multi.set_defaults(run=run_multi)
+
+    mrc = commands.add_parser("mrc", parents=[common], help="LRU faults for every frame count in one pass")
+    mrc.add_argument("trace", help="binary or text page trace")
+    mrc.add_argument("--max-frames", type=int, default=None)
+    mrc.set_defaults(run=run_mrc)
+
+    for name, (module, help_text) in DELEGATED.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+def print_stats(stats, as_json):
+    if as_json:
+        print(json.dumps(stats))
+        return
+    for key, value in stats.items():
+        if isinstance(value, float):
+            value = f"{value:.6g}"
+        elif isinstance(value, list):
+            value = " ".join(map(str, value))
+        print(f"{key}: {value}")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Delegated subcommands parse their own arguments
+    if argv and argv[0] in DELEGATED:
+        import importlib
+        try:
+            return importlib.import_module(DELEGATED[argv[0]][0]).main(argv[1:])
+        except (OSError, ValueError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+    args = build_parser().parse_args(argv)
+    ready = time.perf_counter()
+    try:
+        stats = args.run(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finished = time.perf_counter()
+    print_stats(stats, args.json)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(stats, f, indent=2)
+    if args.timing:
+        print(f"startup: {(ready - _STARTED) * 1000:.1f} ms (after interpreter start), "
+              f"run: {(finished - ready) * 1000:.1f} ms", file=sys.stderr)
+    return 0
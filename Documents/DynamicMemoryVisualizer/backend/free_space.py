@@ -0,0 +1,217 @@
+# File: backend/free_space.py
+
+import random
+
+FIT_STRATEGIES = ["First Fit", "Best Fit", "Worst Fit", "Next Fit"]
+
+# ----------------- Extent Treap -----------------
+# A treap (randomised balanced BST) of free extents. Every node also keeps
+# the largest extent size in its subtree, so "leftmost extent big enough"
+# queries can skip whole subtrees.
+class _Node:
+    __slots__ = ("key", "start", "size", "priority", "left", "right", "max_size")
+
+    def __init__(self, key, start, size, priority):
+        self.key = key
+        self.start = start
+        self.size = size
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_size = size
+
+def _update(node):
+    best = node.size
+    if node.left is not None and node.left.max_size > best:
+        best = node.left.max_size
+    if node.right is not None and node.right.max_size > best:
+        best = node.right.max_size
+    node.max_size = best
+
+def _split(node, key):
+    # Splits into (keys < key, keys >= key)
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        _update(node)
+        return node, right
+    left, right = _split(node.left, key)
+    node.left = right
+    _update(node)
+    return left, node
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+def _remove(node, key):
+    if node is None:
+        return None
+    if key < node.key:
+        node.left = _remove(node.left, key)
+    elif key > node.key:
+        node.right = _remove(node.right, key)
+    else:
+        return _merge(node.left, node.right)
+    _update(node)
+    return node
+
+def _first_fit(node, size, lowest_key):
+    # Leftmost node with key >= lowest_key and size >= size
+    while node is not None and node.max_size >= size:
+        if node.key < lowest_key:
+            node = node.right
+            continue
+        found = _first_fit(node.left, size, lowest_key)
+        if found is not None:
+            return found
+        if node.size >= size:
+            return node
+        node = node.right
+    return None
+
+class _ExtentTreap:
+    def __init__(self, rng):
+        self.root = None
+        self.rng = rng
+
+    def insert(self, key, start, size):
+        left, right = _split(self.root, key)
+        node = _Node(key, start, size, self.rng.random())
+        self.root = _merge(_merge(left, node), right)
+
+    def remove(self, key):
+        self.root = _remove(self.root, key)
+
+    def floor(self, key):
+        node, found = self.root, None
+        while node is not None:
+            if node.key <= key:
+                found = node
+                node = node.right
+            else:
+                node = node.left
+        return found
+
+    def ceiling(self, key):
+        node, found = self.root, None
+        while node is not None:
+            if node.key >= key:
+                found = node
+                node = node.left
+            else:
+                node = node.right
+        return found
+
+    def last(self):
+        node = self.root
+        while node is not None and node.right is not None:
+            node = node.right
+        return node
+
+    def first_fit(self, size, lowest_key=0):
+        return _first_fit(self.root, size, lowest_key)
+
+    def __iter__(self):
+        # In-order walk without recursion
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+# ----------------- Free Extent Index -----------------
+class FreeExtentIndex:
+    # Free space as non-overlapping, non-adjacent (start, size) extents,
+    # indexed twice: by start address (neighbour lookups for coalescing,
+    # first/next fit) and by (size, start) (best/worst fit). All
+    # operations are O(log n) in the number of extents. count, free_total
+    # and largest are kept up to date as extents change, so fragmentation
+    # metrics never need a scan.
+    def __init__(self, total_memory, extents=None):
+        # extents: initial (start, size) free extents; default all of memory
+        self.total_memory = total_memory
+        self.span = total_memory + 1  # packs (size, start) into one int key
+        self.rng = random.Random(0)
+        self.by_start = _ExtentTreap(self.rng)
+        self.by_size = _ExtentTreap(self.rng)
+        self.count = 0
+        self.free_total = 0
+        if extents is None:
+            extents = [(0, total_memory)] if total_memory > 0 else []
+        for start, size in extents:
+            self._insert(start, size)
+
+    def _insert(self, start, size):
+        self.by_start.insert(start, start, size)
+        self.by_size.insert(size * self.span + start, start, size)
+        self.count += 1
+        self.free_total += size
+
+    def _delete(self, start, size):
+        self.by_start.remove(start)
+        self.by_size.remove(size * self.span + start)
+        self.count -= 1
+        self.free_total -= size
+
+    @property
+    def largest(self):
+        root = self.by_start.root
+        return root.max_size if root is not None else 0
+
+    def find(self, size, strategy="First Fit", cursor=0):
+        # Returns the start of the chosen extent, or None if nothing fits
+        if size <= 0 or size > self.largest:
+            return None
+        if strategy == "First Fit":
+            node = self.by_start.first_fit(size)
+        elif strategy == "Best Fit":
+            node = self.by_size.ceiling(size * self.span)
+        elif strategy == "Worst Fit":
+            node = self.by_size.last()
+        elif strategy == "Next Fit":
+            # Resume from the extent containing the cursor, wrapping around
+            node = self.by_start.floor(cursor)
+            if node is None or node.start + node.size <= cursor or node.size < size:
+                node = self.by_start.first_fit(size, cursor)
+            if node is None:
+                node = self.by_start.first_fit(size)
+        else:
+            raise ValueError(f"Unknown fit strategy {strategy!r} (available: {', '.join(FIT_STRATEGIES)})")
+        return None if node is None else node.start
+
+    def allocate(self, start, size):
+        # Carves [start, start + size) out of the extent beginning at start
+        extent = self.by_start.floor(start)
+        self._delete(extent.start, extent.size)
+        if extent.size > size:
+            self._insert(start + size, extent.size - size)
+
+    def release(self, start, size):
+        # Returns [start, start + size) to the free space, merging neighbours
+        before = self.by_start.floor(start - 1)
+        if before is not None and before.start + before.size == start:
+            self._delete(before.start, before.size)
+            start, size = before.start, before.size + size
+        after = self.by_start.ceiling(start + size)
+        if after is not None and after.start == start + size:
+            self._delete(after.start, after.size)
+            size += after.size
+        self._insert(start, size)
+
+    def extents(self):
+        return [(node.start, node.size) for node in self.by_start]
@@ -0,0 +1,122 @@
+# File: backend/history.py
+
+from array import array
+from collections import deque
+from backend.instrumentation import EventSink
+
+EMPTY = -1  # empty frame in checkpoints
+HIT = -1  # "no frame changed" in the per-step frame column
+
+# ----------------- Delta Log -----------------
+# The log is a sequence of chunks. Each chunk starts with a checkpoint, a
+# full copy of the frames, and then holds up to `interval` steps as two
+# columns: the page accessed and the frame it was loaded into (HIT when the
+# access did not change any frame). The state after any step is therefore
+# its chunk's checkpoint plus at most `interval` deltas. The interval is
+# never shorter than the number of frames, so a checkpoint adds at most 8
+# bytes per step: about 20 bytes per step in all, whatever the memory size.
+# The oldest chunks are dropped once more than max_steps steps are held.
+class _Chunk:
+    __slots__ = ("base", "checkpoint", "pages", "frames")
+
+    def __init__(self, base, checkpoint):
+        self.base = base  # step number the checkpoint describes
+        self.checkpoint = checkpoint  # array('q') of pages, EMPTY for free frames
+        self.pages = array("q")
+        self.frames = array("i")
+
+class HistoryRecorder(EventSink):
+    # Records the frame contents of a PagingSimulator or VirtualMemorySimulator
+    # as it runs, so any recent step can be viewed again without replaying
+    # the trace. Step 0 is the state when recording started (or the last
+    # reset); step k is the state after k more accesses. The recorder only
+    # holds frame contents, not policy state: it is for review, not for
+    # resuming the simulation from an earlier step.
+    def __init__(self, simulator, interval=1024, max_steps=1 << 20):
+        if interval <= 0 or max_steps < interval:
+            raise ValueError("interval must be positive and no larger than max_steps")
+        self.simulator = simulator
+        self.frames_attr = "frames" if hasattr(simulator, "frames") else "physical_memory"
+        self.interval = max(interval, len(getattr(simulator, self.frames_attr)))
+        # At least two chunks, so a full interval is still held right after a new one starts
+        self.chunks = deque(maxlen=max(max_steps // self.interval, 2))
+        self._start(0)
+        simulator.add_observer(self)
+
+    def detach(self):
+        self.simulator.remove_observer(self)
+
+    def _start(self, step):
+        frames = getattr(self.simulator, self.frames_attr)
+        checkpoint = array("q", [EMPTY if page is None else page for page in frames])
+        self.current = _Chunk(step, checkpoint)
+        self.chunks.append(self.current)
+
+    def _record(self, page, frame):
+        current = self.current
+        current.pages.append(page)
+        current.frames.append(frame)
+        if len(current.pages) == self.interval:
+            self._start(current.base + self.interval)
+
+    # ----- events -----
+    def on_hit(self, simulator, page, frame):
+        self._record(page, HIT)
+
+    def on_fault(self, simulator, page, frame, victim):
+        self._record(page, frame)
+
+    def on_reset(self, simulator):
+        self.chunks.clear()
+        self._start(0)
+
+    # ----- queries -----
+    @property
+    def first_step(self):
+        # Oldest step still held; earlier ones were dropped
+        return self.chunks[0].base
+
+    @property
+    def last_step(self):
+        return self.current.base + len(self.current.pages)
+
+    def _chunk(self, step):
+        if not self.first_step <= step <= self.last_step:
+            raise IndexError(f"step {step} is outside the recorded range "
+                             f"{self.first_step}..{self.last_step}")
+        # Every chunk but the last holds exactly `interval` steps
+        return self.chunks[(step - self.first_step) // self.interval]
+
+    def frames_at(self, step):
+        # Frame contents after `step` accesses (None = free frame)
+        chunk = self._chunk(step)
+        state = list(chunk.checkpoint)
+        pages = chunk.pages
+        frames = chunk.frames
+        for i in range(step - chunk.base):
+            frame = frames[i]
+            if frame != HIT:
+                state[frame] = pages[i]
+        return [None if page == EMPTY else page for page in state]
+
+    def access_at(self, step):
+        # (page, fault, frame, victim) of the access that produced `step`;
+        # frame is None for a hit, victim None when a free frame was used
+        if step <= self.first_step:
+            raise IndexError(f"no access recorded before step {step}")
+        chunk = self._chunk(step - 1)
+        i = step - 1 - chunk.base
+        page, frame = chunk.pages[i], chunk.frames[i]
+        if frame == HIT:
+            return page, False, None, None
+        victim = chunk.checkpoint[frame]
+        for j in range(i):
+            if chunk.frames[j] == frame:
+                victim = chunk.pages[j]
+        return page, True, frame, None if victim == EMPTY else victim
+
+    def memory_bytes(self):
+        return sum(chunk.checkpoint.itemsize * len(chunk.checkpoint)
+                   + chunk.pages.itemsize * len(chunk.pages)
+                   + chunk.frames.itemsize * len(chunk.frames)
+                   for chunk in self.chunks)
@@ -0,0 +1,235 @@
+# File: backend/instrumentation.py
+
+import time
+from array import array
+
+# ----------------- Event Sinks -----------------
+# A sink receives simulator events; subclass EventSink and override the
+# ones you need. Attach it with simulator.add_observer(sink). Times are in
+# observed calls: simulator.event_clock counts the accesses (or segment
+# operations) made while at least one sink was attached.
+#   on_hit(sim, page, frame)                 resident page referenced
+#   on_fault(sim, page, frame, victim)       page loaded into frame; victim
+#                                            is the evicted page or None
+#   on_evict(sim, page, frame, residency)    page left frame after residency
+#                                            calls (None if it was loaded
+#                                            before observation started)
+#   on_segment_alloc(sim, label, start, size)
+#   on_segment_free(sim, label, start, size)
+#   on_segment_fail(sim, label, size, reason)
+#   on_segment_move(sim, label, old_start, new_start, size)   by compact()
+#   on_timing(sim, operation, ns)            sampled duration of one call
+#   on_reset(sim)                            simulator state was cleared
+class EventSink:
+    sample_every = 0  # > 0: time one call in this many and report on_timing
+
+    def on_hit(self, simulator, page, frame):
+        pass
+
+    def on_fault(self, simulator, page, frame, victim):
+        pass
+
+    def on_evict(self, simulator, page, frame, residency):
+        pass
+
+    def on_segment_alloc(self, simulator, label, start, size):
+        pass
+
+    def on_segment_free(self, simulator, label, start, size):
+        pass
+
+    def on_segment_fail(self, simulator, label, size, reason):
+        pass
+
+    def on_segment_move(self, simulator, label, old_start, new_start, size):
+        pass
+
+    def on_timing(self, simulator, operation, ns):
+        pass
+
+    def on_reset(self, simulator):
+        pass
+
+# ----------------- Observable Simulators -----------------
+# Mixed into every simulator, which calls _init_observers() from __init__.
+# With no sink attached `observers` is an empty tuple and the only cost on
+# the hot paths is one truth test; attaching a sink diverts calls to the
+# simulator's instrumented variants.
+class Observable:
+    __slots__ = ("observers", "event_clock", "sample_every", "timers", "loaded_at")
+
+    def _init_observers(self):
+        self.observers = ()
+        self.event_clock = 0
+        self.sample_every = 0  # smallest sample_every of the attached sinks
+        self.timers = ()
+        self.loaded_at = None  # frame -> event_clock when its page was loaded
+
+    def add_observer(self, sink):
+        if not self.observers:
+            self.loaded_at = {}
+        self.observers = self.observers + (sink,)
+        self._update_sampling()
+
+    def remove_observer(self, sink):
+        self.observers = tuple(s for s in self.observers if s is not sink)
+        if not self.observers:
+            self.loaded_at = None
+        self._update_sampling()
+
+    def _update_sampling(self):
+        self.timers = tuple(s for s in self.observers if s.sample_every > 0)
+        self.sample_every = min((s.sample_every for s in self.timers), default=0)
+
+    def _begin_call(self):
+        # Advances the event clock; returns a start time when this call is
+        # one to sample, else 0
+        self.event_clock += 1
+        if self.sample_every and self.event_clock % self.sample_every == 0:
+            return time.perf_counter_ns()
+        return 0
+
+    def _end_call(self, operation, start):
+        if start:
+            elapsed = time.perf_counter_ns() - start
+            for sink in self.timers:
+                sink.on_timing(self, operation, elapsed)
+
+    def _emit_access(self, page, frame, fault, victim):
+        if not fault:
+            for sink in self.observers:
+                sink.on_hit(self, page, frame)
+            return
+        clock = self.event_clock
+        if victim is not None:
+            loaded = self.loaded_at.get(frame)
+            residency = None if loaded is None else clock - loaded
+            for sink in self.observers:
+                sink.on_evict(self, victim, frame, residency)
+        self.loaded_at[frame] = clock
+        for sink in self.observers:
+            sink.on_fault(self, page, frame, victim)
+
+    def _emit_reset(self):
+        self.event_clock = 0
+        if self.observers:
+            self.loaded_at = {}
+            for sink in self.observers:
+                sink.on_reset(self)
+
+    def _replay_observed(self, refs, record, reference):
+        # Trace replay one call at a time through reference(page), which
+        # returns (fault, victim), so every access reaches the sinks
+        fault_flags = array("B")
+        evicted = array("q")
+        accesses = faults = evictions = 0
+        for page in refs:
+            accesses += 1
+            fault, victim = reference(page)
+            if fault:
+                faults += 1
+                if victim is not None:
+                    evictions += 1
+            if record:
+                fault_flags.append(1 if fault else 0)
+                evicted.append(-1 if victim is None else victim)  # -1: NO_PAGE
+        if not record:
+            fault_flags = evicted = None
+        return accesses, faults, evictions, fault_flags, evicted
+
+# ----------------- Built-in Sinks -----------------
+class EventCounter(EventSink):
+    # Tallies of every event kind, plus failed allocations by reason
+    def __init__(self):
+        self.reset_counts()
+
+    def reset_counts(self):
+        self.hits = self.faults = self.evictions = 0
+        self.allocations = self.frees = 0
+        self.failures = {}
+
+    def on_hit(self, simulator, page, frame):
+        self.hits += 1
+
+    def on_fault(self, simulator, page, frame, victim):
+        self.faults += 1
+
+    def on_evict(self, simulator, page, frame, residency):
+        self.evictions += 1
+
+    def on_segment_alloc(self, simulator, label, start, size):
+        self.allocations += 1
+
+    def on_segment_free(self, simulator, label, start, size):
+        self.frees += 1
+
+    def on_segment_fail(self, simulator, label, size, reason):
+        self.failures[reason] = self.failures.get(reason, 0) + 1
+
+    def summary(self):
+        return {"hits": self.hits, "faults": self.faults, "evictions": self.evictions,
+                "allocations": self.allocations, "frees": self.frees,
+                "failed_allocations": dict(self.failures)}
+
+class ResidencyHistogram(EventSink):
+    # How long evicted pages stayed resident, in power-of-two buckets:
+    # bucket b counts residencies in [2**(b-1), 2**b), bucket 0 counts 0.
+    # A page evicted soon after being loaded is the signature of thrashing.
+    def __init__(self):
+        self.counts = []
+        self.unknown = 0  # evictions of pages loaded before observation
+        self.total = 0
+        self.samples = 0
+
+    def on_evict(self, simulator, page, frame, residency):
+        if residency is None:
+            self.unknown += 1
+            return
+        bucket = residency.bit_length()
+        if bucket >= len(self.counts):
+            self.counts.extend([0] * (bucket + 1 - len(self.counts)))
+        self.counts[bucket] += 1
+        self.total += residency
+        self.samples += 1
+
+    @property
+    def mean(self):
+        return self.total / self.samples if self.samples else 0.0
+
+    def buckets(self):
+        # [(low, high, count)] with high exclusive
+        return [(0 if b == 0 else 1 << (b - 1), 1 << b if b else 1, count)
+                for b, count in enumerate(self.counts)]
+
+    def summary(self):
+        return {"mean_residency": self.mean, "unknown_residency": self.unknown,
+                "residency_buckets": [[low, high, count] for low, high, count in self.buckets() if count]}
+
+class CallTimer(EventSink):
+    # Durations of one simulator call in every `sample_every`, by operation.
+    # Sampling keeps the clock reads off most calls; the sinks' own event
+    # handling is not included in the measured time.
+    def __init__(self, sample_every=64):
+        if sample_every <= 0:
+            raise ValueError("sample_every must be positive")
+        self.sample_every = sample_every
+        self.samples = {}  # operation -> array('q') of ns
+
+    def on_timing(self, simulator, operation, ns):
+        samples = self.samples.get(operation)
+        if samples is None:
+            samples = self.samples[operation] = array("q")
+        samples.append(ns)
+
+    def summary(self):
+        result = {}
+        for operation, samples in self.samples.items():
+            ordered = sorted(samples)
+            result[operation] = {
+                "samples": len(ordered),
+                "mean_ns": sum(ordered) / len(ordered),
+                "p50_ns": ordered[len(ordered) // 2],
+                "p99_ns": ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)],
+                "max_ns": ordered[-1],
+            }
+        return result
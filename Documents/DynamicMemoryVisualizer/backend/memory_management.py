@@ -1,131 +1,980 @@
 # File: backend/memory_management.py
 
-from collections import deque, OrderedDict
+import sys
+from array import array
+from collections import deque
+from backend.free_space import FIT_STRATEGIES, FreeExtentIndex
+from backend.instrumentation import Observable
+from backend.page_tables import PTE_SIZE, UNMAPPED, ArrayPageTable, MultiLevelPageTable
+from backend.policies import CompactLRUPolicy, create_compact_policy, create_policy
+
+NO_PAGE = -1  # marks "no page evicted" in trace replay result arrays
+EMPTY_FRAME = -1  # free frame in the compact simulators' frame arrays
+
+# ----------------- Trace Replay -----------------
+class TraceResult:
+    __slots__ = ("accesses", "page_faults", "hits", "evictions", "fault_flags", "evicted", "details")
+
+    def __init__(self, accesses, page_faults, evictions, fault_flags=None, evicted=None, details=None):
+        self.accesses = accesses
+        self.page_faults = page_faults
+        self.hits = accesses - page_faults
+        self.evictions = evictions
+        self.fault_flags = fault_flags  # array('B'): 1 where the access faulted
+        self.evicted = evicted  # array('q'): victim page per access or NO_PAGE
+        self.details = details or {}  # simulator-specific counters (TLB, page walks)
+
+    @property
+    def fault_rate(self):
+        return self.page_faults / self.accesses if self.accesses else 0.0
+
+    def summary(self):
+        return {
+            "accesses": self.accesses,
+            "page_faults": self.page_faults,
+            "hits": self.hits,
+            "evictions": self.evictions,
+            "fault_rate": self.fault_rate,
+            **self.details,
+        }
+
+def as_references(trace):
+    # Buffers (array, mmap, bytes of packed ints) are iterated through a
+    # memoryview so nothing is copied; anything else is iterated as-is.
+    try:
+        return memoryview(trace)
+    except TypeError:
+        return trace
+
+def take_dirty_bitmap(bitmap):
+    # Indices set in a bytearray bitmap, clearing them as they are taken;
+    # find() skips the clean stretches at C speed
+    dirty = set()
+    i = bitmap.find(1)
+    while i >= 0:
+        dirty.add(i)
+        bitmap[i] = 0
+        i = bitmap.find(1, i + 1)
+    return dirty
+
+def release_references(refs, trace):
+    # Releases a view made by as_references(). Replays call this in a
+    # finally: a traceback keeps the replay's locals alive, and a live view
+    # of a mapped trace would stop the TraceFile from closing.
+    if refs is not trace and isinstance(refs, memoryview):
+        refs.release()
+
+# ----------------- Memory Footprint -----------------
+def _footprint(value, seen):
+    # Bytes held by value and everything it references that was not already
+    # counted in `seen`. Shared objects (None, small ints, the same page int
+    # held by several containers) are counted once; memoryviews count only
+    # themselves, not the buffer they borrow.
+    if value is None or id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, (int, float, str, bytes, bytearray, array, memoryview)):
+        return size
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += _footprint(key, seen) + _footprint(item, seen)
+    elif isinstance(value, (list, tuple, set, deque)):
+        for item in value:
+            size += _footprint(item, seen)
+    else:
+        for name in getattr(type(value), "__slots__", ()):
+            size += _footprint(getattr(value, name, None), seen)
+        size += _footprint(getattr(value, "__dict__", None), seen)
+    return size
+
+def memory_footprint(parts):
+    # {component: bytes, ..., "total": bytes} for a {component: object} map;
+    # objects shared between components are charged to the first one
+    seen = set()
+    footprint = {name: _footprint(value, seen) for name, value in parts.items()}
+    footprint["total"] = sum(footprint.values())
+    return footprint
 
 # ----------------- Paging Simulator -----------------
-class PagingSimulator:
+class PagingSimulator(Observable):
+    __slots__ = ("num_frames", "frames", "page_faults", "replacement_algo", "policy",
+                 "page_to_frame", "free_frames", "dirty_frames")
+
     def __init__(self, num_frames, replacement_algo):
         self.num_frames = num_frames
         self.frames = [None] * num_frames  # list representing physical frames
         self.page_faults = 0
         self.replacement_algo = replacement_algo
-        if replacement_algo == "FIFO":
-            self.queue = deque()
-        elif replacement_algo == "LRU":
-            self.lru_order = OrderedDict()
+        self.policy = create_policy(replacement_algo, num_frames)
+        self.page_to_frame = {}  # resident page -> frame index
+        # Free frames kept as a stack with the lowest index on top
+        self.free_frames = list(range(num_frames - 1, -1, -1))
+        self.dirty_frames = set()  # frames whose page changed since take_dirty_frames()
+        self._init_observers()  # event sinks (backend.instrumentation)
+    
+    def take_dirty_frames(self):
+        # Lets a view redraw only the frames that changed; reset() replaces
+        # the frames list, which views treat as "redraw everything"
+        dirty, self.dirty_frames = self.dirty_frames, set()
+        return dirty
+    
+    def prepare(self, trace):
+        # Policies that look ahead (OPT) need the reference trace up front
+        self.policy.prepare(trace)
     
     def access_page(self, page):
-        if page in self.frames:
-            # Page hit: update usage for LRU
-            if self.replacement_algo == "LRU":
-                self.lru_order.move_to_end(page)
+        if self.observers:
+            return self._observed_access(page)[0]
+        if self.policy.needs_future:
+            self.policy.check(page)  # a page OPT did not expect must change nothing
+        frame = self.page_to_frame.get(page)
+        if frame is not None:
+            self.policy.on_hit(page, frame)
             return False  # No page fault
         else:
-            self.page_faults += 1
             self.load_page(page)
+            self.page_faults += 1
             return True  # Page fault occurred
     
+    def _observed_access(self, page):
+        # access_page with event reporting; returns (fault, victim)
+        if self.policy.needs_future:
+            self.policy.check(page)
+        start = self._begin_call()
+        frame = self.page_to_frame.get(page)
+        fault = frame is None
+        victim = None
+        if fault:
+            victim = self.load_page(page)
+            self.page_faults += 1
+            frame = self.page_to_frame[page]
+        else:
+            self.policy.on_hit(page, frame)
+        self._end_call("access_page", start)
+        self._emit_access(page, frame, fault, victim)
+        return fault, victim
+    
+    def run_trace(self, trace, record=True):
+        # Replays a whole reference trace in one call; the loop body is kept
+        # free of attribute lookups and per-access result objects.
+        refs = as_references(trace)
+        try:
+            return self._replay_references(refs, record)
+        finally:
+            release_references(refs, trace)
+    
+    def _replay_references(self, refs, record):
+        if self.policy.needs_future:
+            if not hasattr(refs, "__getitem__"):
+                refs = list(refs)
+            self.policy.prepare(refs)
+        if self.observers:
+            accesses, faults, evictions, fault_flags, evicted = self._replay_observed(
+                refs, record, self._observed_access)
+            return TraceResult(accesses, faults, evictions, fault_flags, evicted)
+        fault_flags = array("B")
+        evicted = array("q")
+        flag = fault_flags.append
+        evict = evicted.append
+        lookup = self.page_to_frame.get
+        load = self.load_page
+        on_hit = self.policy.on_hit if self.policy.tracks_hits else None
+        accesses = faults = evictions = 0
+        try:
+            for page in refs:
+                frame = lookup(page)
+                if frame is not None:
+                    if on_hit is not None:
+                        on_hit(page, frame)
+                    if record:
+                        flag(0)
+                        evict(NO_PAGE)
+                else:
+                    victim = load(page)
+                    faults += 1
+                    if victim is not None:
+                        evictions += 1
+                    if record:
+                        flag(1)
+                        evict(NO_PAGE if victim is None else victim)
+                accesses += 1
+        finally:
+            # Counters cover the references that completed, even if one raised
+            self.page_faults += faults
+        if not record:
+            return TraceResult(accesses, faults, evictions)
+        return TraceResult(accesses, faults, evictions, fault_flags, evicted)
+    
     def load_page(self, page):
-        if None in self.frames:
-            index = self.frames.index(None)
-            self.frames[index] = page
-            if self.replacement_algo == "FIFO":
-                self.queue.append(index)
-            elif self.replacement_algo == "LRU":
-                self.lru_order[page] = index
+        # Returns the evicted page, or None if a free frame was used
+        if self.free_frames:
+            index = self.free_frames.pop()
+            victim = None
         else:
-            # When memory is full, replace a page based on the algorithm
-            if self.replacement_algo == "FIFO":
-                index = self.queue.popleft()
-                self.frames[index] = page
-                self.queue.append(index)
-            elif self.replacement_algo == "LRU":
-                # Remove least recently used
-                oldest_page, index = self.lru_order.popitem(last=False)
-                self.frames[index] = page
-                self.lru_order[page] = index
+            # When memory is full, the policy picks the frame to replace
+            index = self.policy.evict(page)
+            victim = self.frames[index]
+            del self.page_to_frame[victim]
+        self.frames[index] = page
+        self.page_to_frame[page] = index
+        self.policy.on_load(page, index)
+        self.dirty_frames.add(index)
+        return victim
     
     def reset(self):
         self.frames = [None] * self.num_frames
         self.page_faults = 0
-        if self.replacement_algo == "FIFO":
-            self.queue.clear()
-        elif self.replacement_algo == "LRU":
-            self.lru_order.clear()
+        self.page_to_frame.clear()
+        self.free_frames = list(range(self.num_frames - 1, -1, -1))
+        self.dirty_frames = set()
+        self.policy.reset()
+        self._emit_reset()
+    
+    def memory_footprint(self):
+        return memory_footprint({"frames": self.frames, "page_table": self.page_to_frame,
+                                 "free_frames": self.free_frames, "policy": self.policy,
+                                 "dirty_frames": self.dirty_frames})
+
+# ----------------- Compact Paging Simulator -----------------
+# Same behaviour as PagingSimulator with state in typed arrays: frames is an
+# array('q') holding EMPTY_FRAME for free frames, free frames are a counter
+# (frames only become free again on reset, lowest index first, exactly as
+# the free stack hands them out), with num_pages the page -> frame map is
+# an ArrayPageTable instead of a dict, and dirty frames are a bytearray
+# bitmap rather than a set of boxed ints. FIFO, LRU and Clock use compact
+# policies; the others fall back to the regular ones. Pages must be
+# non-negative, and below num_pages when it is given. Reading typed arrays
+# boxes every value, so LRU replay takes about twice as long as the
+# OrderedDict version even with its list updates inlined.
+class CompactPagingSimulator(PagingSimulator):
+    __slots__ = ("num_pages", "next_free")
+
+    def __init__(self, num_frames, replacement_algo, num_pages=None):
+        self.num_frames = num_frames
+        self.num_pages = num_pages
+        self.frames = array("q", [EMPTY_FRAME]) * num_frames
+        self.page_faults = 0
+        self.replacement_algo = replacement_algo
+        self.policy = create_compact_policy(replacement_algo, num_frames)
+        self.page_to_frame = ArrayPageTable(num_pages, num_frames) if num_pages else {}
+        self.free_frames = None
+        self.next_free = 0
+        self.dirty_frames = bytearray(num_frames)  # 1 where the page changed since take_dirty_frames()
+        self._init_observers()
+    
+    def _check_page(self, page):
+        # Before any state changes: a rejected page must leave no trace
+        if page < 0:
+            raise ValueError(f"Page numbers must be non-negative, not {page}")
+        if self.num_pages and page >= self.num_pages:
+            raise ValueError(f"Page {page} is outside the {self.num_pages}-page address space")
+    
+    def load_page(self, page):
+        self._check_page(page)
+        if self.next_free < self.num_frames:
+            index = self.next_free
+            self.next_free += 1
+            victim = None
+        else:
+            index = self.policy.evict(page)
+            victim = self.frames[index]
+            del self.page_to_frame[victim]
+        self.page_to_frame[page] = index
+        self.frames[index] = page
+        self.policy.on_load(page, index)
+        self.dirty_frames[index] = 1
+        return victim
+
+    def _replay_references(self, refs, record):
+        # With an ArrayPageTable the lookup and the load are inlined against
+        # the table's array; a method call per reference would cost more
+        # than the dict lookup it replaces
+        table = self.page_to_frame
+        if self.observers or self.policy.needs_future or not isinstance(table, ArrayPageTable):
+            return super()._replay_references(refs, record)
+        fault_flags = array("B")
+        evicted = array("q")
+        flag = fault_flags.append
+        evict = evicted.append
+        entries = table.entries
+        num_pages = self.num_pages
+        frames = self.frames
+        num_frames = self.num_frames
+        policy = self.policy
+        on_hit = policy.on_hit if policy.tracks_hits else None
+        # LRU's list updates are inlined too, on hits and on faults
+        lru = isinstance(policy, CompactLRUPolicy)
+        lru_prev, lru_next, head = (policy.prev, policy.next, num_frames) if lru else (None, None, 0)
+        choose_victim = policy.evict
+        on_load = policy.on_load
+        dirty = self.dirty_frames
+        next_free = self.next_free
+        accesses = faults = evictions = 0
+        try:
+            for page in refs:
+                if not 0 <= page < num_pages:
+                    raise ValueError(f"Page {page} is outside the {num_pages}-page address space")
+                accesses += 1
+                frame = entries[page]
+                if frame >= 0:
+                    if lru:
+                        last = lru_prev[head]
+                        if last != frame:
+                            before, after = lru_prev[frame], lru_next[frame]
+                            lru_next[before] = after
+                            lru_prev[after] = before
+                            lru_next[last] = frame
+                            lru_prev[frame] = last
+                            lru_next[frame] = head
+                            lru_prev[head] = frame
+                    elif on_hit is not None:
+                        on_hit(page, frame)
+                    if record:
+                        flag(0)
+                        evict(NO_PAGE)
+                    continue
+                faults += 1
+                if next_free < num_frames:
+                    frame = next_free
+                    next_free += 1
+                    victim = NO_PAGE
+                else:
+                    if lru:
+                        # Unlink the least recent frame
+                        frame = lru_next[head]
+                        after = lru_next[frame]
+                        lru_next[head] = after
+                        lru_prev[after] = head
+                    else:
+                        frame = choose_victim(page)
+                    victim = frames[frame]
+                    entries[victim] = UNMAPPED
+                    evictions += 1
+                entries[page] = frame
+                frames[frame] = page
+                if lru:
+                    # Append it as the most recent
+                    last = lru_prev[head]
+                    lru_next[last] = frame
+                    lru_prev[frame] = last
+                    lru_next[frame] = head
+                    lru_prev[head] = frame
+                else:
+                    on_load(page, frame)
+                dirty[frame] = 1
+                if record:
+                    flag(1)
+                    evict(victim)
+        finally:
+            self.next_free = next_free
+            table.mapped += faults - evictions
+            self.page_faults += faults
+        if not record:
+            return TraceResult(accesses, faults, evictions)
+        return TraceResult(accesses, faults, evictions, fault_flags, evicted)
+
+    def reset(self):
+        self.frames = array("q", [EMPTY_FRAME]) * self.num_frames
+        self.page_faults = 0
+        self.page_to_frame.clear()
+        self.next_free = 0
+        self.dirty_frames = bytearray(self.num_frames)
+        self.policy.reset()
+        self._emit_reset()
+    
+    def take_dirty_frames(self):
+        return take_dirty_bitmap(self.dirty_frames)
+    
+    def memory_footprint(self):
+        return memory_footprint({"frames": self.frames, "page_table": self.page_to_frame, "policy": self.policy,
+                                 "dirty_frames": self.dirty_frames})
+
+# ------------- Miss-Ratio Curve -------------
+def miss_ratio_curve(trace, algo="LRU", max_frames=None):
+    # Returns a list where curve[k - 1] is the number of faults the trace
+    # takes with k frames, for k = 1..max_frames (default: distinct pages).
+    # LRU is a stack algorithm, so one pass over the trace computing each
+    # reference's stack distance gives every frame count at once. The
+    # distance is the number of distinct pages touched since the previous
+    # reference to the same page, counted with a Fenwick tree that marks
+    # the latest position of every page: O(n log n) overall.
+    if algo != "LRU":
+        raise ValueError(f"Miss-ratio curve is only available for LRU, not {algo!r}")
+    refs = as_references(trace)
+    try:
+        n, distinct, distance_counts = _stack_distances(refs)
+    finally:
+        release_references(refs, trace)
+    if max_frames is None:
+        max_frames = distinct
+    curve = []
+    faults = n
+    for frames in range(1, max_frames + 1):
+        # A reference with stack distance d hits once there are d frames
+        faults -= distance_counts.get(frames, 0)
+        curve.append(faults)
+    return curve
+
+def _stack_distances(refs):
+    # (references, distinct pages, {stack distance: references})
+    if not hasattr(refs, "__len__"):
+        refs = list(refs)
+    n = len(refs)
+    tree = array("q", bytes(8 * (n + 1)))  # Fenwick tree over positions 1..n
+    last_seen = {}
+    distance_counts = {}
+    for t, page in enumerate(refs, 1):
+        prev = last_seen.get(page)
+        if prev is not None:
+            # Marks in [prev, t - 1] = distinct pages since the last use
+            distance = 0
+            i = t - 1
+            while i > 0:
+                distance += tree[i]
+                i &= i - 1
+            i = prev - 1
+            while i > 0:
+                distance -= tree[i]
+                i &= i - 1
+            distance_counts[distance] = distance_counts.get(distance, 0) + 1
+            i = prev
+            while i <= n:
+                tree[i] -= 1
+                i += i & -i
+        last_seen[page] = t
+        i = t
+        while i <= n:
+            tree[i] += 1
+            i += i & -i
+    return n, len(last_seen), distance_counts
 
 # ------------- Segmentation Simulator -------------
-class SegmentationSimulator:
-    def __init__(self, total_memory):
+class SegmentationSimulator(Observable):
+    __slots__ = ("total_memory", "strategy", "segment_by_label", "free_space", "free_memory",
+                 "next_fit_cursor", "dirty_segments")
+
+    def __init__(self, total_memory, strategy="First Fit"):
+        if strategy not in FIT_STRATEGIES:
+            raise ValueError(f"Unknown fit strategy {strategy!r} (available: {', '.join(FIT_STRATEGIES)})")
         self.total_memory = total_memory
-        self.segments = []  # List of tuples: (start, size, label)
+        self.strategy = strategy
+        self.segment_by_label = {}  # label -> (start, size, label)
+        self.free_space = FreeExtentIndex(total_memory)
         self.free_memory = total_memory
+        self.next_fit_cursor = 0  # where Next Fit resumes searching
+        self.dirty_segments = set()  # labels allocated or freed since take_dirty_segments()
+        self._init_observers()  # event sinks (backend.instrumentation)
+    
+    def take_dirty_segments(self):
+        dirty, self.dirty_segments = self.dirty_segments, set()
+        return dirty
+    
+    @property
+    def segments(self):
+        # List of tuples: (start, size, label)
+        return list(self.segment_by_label.values())
     
     def allocate_segment(self, size, label):
-        # Check if enough free memory exists
-        if size > self.free_memory:
+        if self.observers:
+            return self._observed_allocate(size, label)
+        return self._allocate_segment(size, label)
+    
+    def _allocate_segment(self, size, label):
+        # Check if enough free memory exists and the label is not in use
+        if size > self.free_memory or label in self.segment_by_label:
             return False
-        start = 0
-        if self.segments:
-            # Sort segments by starting address and find a gap
-            self.segments.sort(key=lambda x: x[0])
-            for seg in self.segments:
-                if seg[0] - start >= size:
-                    break
-                start = seg[0] + seg[1]
-            if self.total_memory - start < size:
-                return False
-        self.segments.append((start, size, label))
+        start = self.free_space.find(size, self.strategy, self.next_fit_cursor)
+        if start is None:
+            return False
+        self.free_space.allocate(start, size)
+        self.segment_by_label[label] = (start, size, label)
+        self.dirty_segments.add(label)
         self.free_memory -= size
+        self.next_fit_cursor = start + size
         return True
     
     def free_segment(self, label):
-        for seg in self.segments:
-            if seg[2] == label:
-                self.segments.remove(seg)
-                self.free_memory += seg[1]
-                return True
-        return False
+        if self.observers:
+            return self._observed_free(label)
+        return self._free_segment(label)
+    
+    def _free_segment(self, label):
+        seg = self.segment_by_label.pop(label, None)
+        if seg is None:
+            return False
+        self.free_space.release(seg[0], seg[1])
+        self.dirty_segments.add(label)
+        self.free_memory += seg[1]
+        return True
+    
+    def failure_reason(self, size, label):
+        # Why allocate_segment(size, label) would fail, or None. "no free
+        # block large enough" means enough memory is free but fragmented:
+        # compact() would let the allocation succeed.
+        if label in self.segment_by_label:
+            return "duplicate label"
+        if size <= 0:
+            return "invalid size"
+        if size > self.free_memory:
+            return "insufficient free memory"
+        if size > self.free_space.largest:
+            return "no free block large enough"
+        return None
+    
+    # ----- fragmentation metrics, all O(1) -----
+    @property
+    def largest_free_block(self):
+        return self.free_space.largest
+    
+    @property
+    def hole_count(self):
+        return self.free_space.count
+    
+    @property
+    def external_fragmentation(self):
+        # Share of the free memory outside the largest free block: 0 when
+        # the free memory is one block (or there is none), towards 1 as it
+        # is scattered in small holes
+        if not self.free_memory:
+            return 0.0
+        return 1 - self.free_space.largest / self.free_memory
+    
+    def fragmentation_stats(self):
+        return {
+            "free_memory": self.free_memory,
+            "largest_free_block": self.largest_free_block,
+            "holes": self.hole_count,
+            "external_fragmentation": self.external_fragmentation,
+        }
+    
+    def compact(self):
+        # Relocates segments so the free memory becomes one block. Segments
+        # keep their address order: those below the split point slide down
+        # to address 0 and those above slide up to the end of memory, so
+        # the free block lands between them. The split moving the fewest
+        # bytes is chosen; segments already in place are not moved. Moved
+        # segments are marked dirty. Returns the number of bytes moved.
+        ordered = sorted(self.segment_by_label.values())
+        n = len(ordered)
+        # down[k]: bytes moved sliding ordered[:k] down; packed while no gap
+        down = [0] * (n + 1)
+        end = 0
+        for i, (start, size, _) in enumerate(ordered):
+            down[i + 1] = down[i] + (size if start != end else 0)
+            end += size
+        # up[k]: bytes moved sliding ordered[k:] up against the end of memory
+        up = [0] * (n + 1)
+        end = self.total_memory
+        for i in range(n - 1, -1, -1):
+            start, size, _ = ordered[i]
+            end -= size
+            up[i] = up[i + 1] + (size if start != end else 0)
+        split = min(range(n + 1), key=lambda k: down[k] + up[k])
+        moves = []
+        address = 0
+        for start, size, label in ordered[:split]:
+            if start != address:
+                moves.append((label, start, address, size))
+            address += size
+        low_end = address
+        address = self.total_memory
+        for start, size, label in reversed(ordered[split:]):
+            address -= size
+            if start != address:
+                moves.append((label, start, address, size))
+        for label, _, new_start, size in moves:
+            self.segment_by_label[label] = (new_start, size, label)
+            self.dirty_segments.add(label)
+        extents = [(low_end, self.free_memory)] if self.free_memory else []
+        self.free_space = FreeExtentIndex(self.total_memory, extents)
+        self.next_fit_cursor = low_end
+        if self.observers:
+            for label, old_start, new_start, size in moves:
+                for sink in self.observers:
+                    sink.on_segment_move(self, label, old_start, new_start, size)
+        return sum(size for _, _, _, size in moves)
+    
+    def _observed_allocate(self, size, label):
+        start = self._begin_call()
+        ok = self._allocate_segment(size, label)
+        self._end_call("allocate_segment", start)
+        if ok:
+            seg_start = self.segment_by_label[label][0]
+            for sink in self.observers:
+                sink.on_segment_alloc(self, label, seg_start, size)
+        else:
+            reason = self.failure_reason(size, label)
+            for sink in self.observers:
+                sink.on_segment_fail(self, label, size, reason)
+        return ok
+    
+    def _observed_free(self, label):
+        seg = self.segment_by_label.get(label)
+        start = self._begin_call()
+        ok = self._free_segment(label)
+        self._end_call("free_segment", start)
+        if ok:
+            for sink in self.observers:
+                sink.on_segment_free(self, label, seg[0], seg[1])
+        return ok
     
     def reset(self):
-        self.segments = []
+        # Every live segment disappears, so views must drop all of them
+        self.dirty_segments.update(self.segment_by_label)
+        self.segment_by_label = {}
+        self.free_space = FreeExtentIndex(self.total_memory)
         self.free_memory = self.total_memory
+        self.next_fit_cursor = 0
+        self._emit_reset()
 
 # ---------- Virtual Memory Simulator -----------
-class VirtualMemorySimulator:
-    def __init__(self, num_frames):
+class VirtualMemorySimulator(Observable):
+    __slots__ = ("num_frames", "physical_memory", "page_table_levels", "va_bits", "page_size",
+                 "page_table", "free_frames", "dirty_frames", "page_faults", "fifo_queue", "tlb",
+                 "accesses", "page_walks")
+
+    def __init__(self, num_frames, page_table_levels=1, va_bits=48, page_size=4096, tlb=None):
         self.num_frames = num_frames
+        # physical_memory doubles as the inverted page table: frame -> vpage
         self.physical_memory = [None] * num_frames
-        self.page_table = {}  # maps virtual page to physical frame index
+        self.page_table_levels = page_table_levels
+        self.va_bits = va_bits
+        self.page_size = page_size
+        self.page_table = self._new_page_table()  # maps virtual page to physical frame index
+        self.free_frames = list(range(num_frames - 1, -1, -1))
+        self.dirty_frames = set()  # frames whose page changed since take_dirty_frames()
         self.page_faults = 0
         self.fifo_queue = deque()
+        self.tlb = tlb  # optional TLB consulted before the page table
+        self.accesses = 0
+        self.page_walks = 0  # page-table lookups, i.e. TLB misses
+        self._init_observers()  # event sinks (backend.instrumentation)
+    
+    def _new_page_table(self):
+        if self.page_table_levels == 1:
+            return {}
+        offset_bits = self.page_size.bit_length() - 1
+        if self.page_size != 1 << offset_bits:
+            raise ValueError("Page size must be a power of two")
+        return MultiLevelPageTable(self.page_table_levels, self.va_bits - offset_bits)
+    
+    def take_dirty_frames(self):
+        dirty, self.dirty_frames = self.dirty_frames, set()
+        return dirty
+    
+    def page_table_overhead(self):
+        # Bytes of page-table entries a real MMU would need: one entry per
+        # virtual page for a flat (linear) table, whatever is mapped, and
+        # every slot of every allocated table page in multi-level mode
+        if self.page_table_levels == 1:
+            offset_bits = self.page_size.bit_length() - 1
+            return (1 << (self.va_bits - offset_bits)) * PTE_SIZE
+        return self.page_table.overhead_bytes()
+    
+    def _check_page(self, vpage):
+        # Before any counter or the TLB changes: a rejected page must leave
+        # no trace. Flat tables are dicts and take any page.
+        if self.page_table_levels > 1 and not 0 <= vpage <= self.page_table.max_vpage:
+            raise ValueError(f"Virtual page {vpage} is outside the "
+                             f"{self.page_table.vpn_bits}-bit page number space")
     
     def access_virtual_page(self, vpage):
-        if vpage in self.page_table:
+        if self.observers:
+            return self._observed_access(vpage)[0]
+        self._check_page(vpage)
+        self.accesses += 1
+        tlb = self.tlb
+        if tlb is not None and tlb.lookup(vpage) is not None:
+            return False  # TLB hit, no page walk needed
+        self.page_walks += 1
+        frame = self.page_table.get(vpage)
+        if frame is not None:
+            if tlb is not None:
+                tlb.insert(vpage, frame)
             return False  # Page hit
         else:
-            self.page_faults += 1
             self.load_virtual_page(vpage)
+            self.page_faults += 1
+            if tlb is not None:
+                tlb.insert(vpage, self.page_table[vpage])
             return True  # Page fault occurred
     
+    def _observed_access(self, vpage):
+        # access_virtual_page with event reporting; returns (fault, victim)
+        self._check_page(vpage)
+        start = self._begin_call()
+        self.accesses += 1
+        tlb = self.tlb
+        frame = tlb.lookup(vpage) if tlb is not None else None
+        fault = False
+        victim = None
+        if frame is None:
+            self.page_walks += 1
+            frame = self.page_table.get(vpage)
+            if frame is None:
+                fault = True
+                victim = self.load_virtual_page(vpage)
+                self.page_faults += 1
+                frame = self.page_table[vpage]
+            if tlb is not None:
+                tlb.insert(vpage, frame)
+        self._end_call("access_virtual_page", start)
+        self._emit_access(vpage, frame, fault, victim)
+        return fault, victim
+    
+    def run_trace(self, trace, record=True):
+        refs = as_references(trace)
+        try:
+            return self._replay_references(refs, record)
+        finally:
+            release_references(refs, trace)
+    
+    def _replay_references(self, refs, record):
+        if self.observers:
+            walks = self.page_walks
+            tlb_hits = self.tlb.hits if self.tlb is not None else 0
+            accesses, faults, evictions, fault_flags, evicted = self._replay_observed(
+                refs, record, self._observed_access)
+            details = {"page_walks": self.page_walks - walks}
+            if self.tlb is not None:
+                hits = self.tlb.hits - tlb_hits
+                details["tlb_hits"] = hits
+                details["tlb_hit_rate"] = hits / accesses if accesses else 0.0
+            return TraceResult(accesses, faults, evictions, fault_flags, evicted, details)
+        fault_flags = array("B")
+        evicted = array("q")
+        flag = fault_flags.append
+        evict = evicted.append
+        page_table = self.page_table
+        walk = page_table.get
+        load = self.load_virtual_page
+        tlb = self.tlb
+        # The TLB probe and the fill after a miss are inlined here, exactly
+        # as TLB.lookup() and TLB.insert() do them: a method call per
+        # reference would cost more than the rest of the loop body. A missed
+        # vpage is never in its set.
+        tlb_sets = tlb.sets if tlb is not None else None
+        tlb_lru = tlb is not None and tlb.lru
+        tlb_keys = tlb.set_keys if tlb is not None else None
+        random = tlb.rng.random if tlb is not None else None
+        num_sets = tlb.num_sets if tlb is not None else 1
+        ways = tlb.associativity if tlb is not None else 0
+        accesses = faults = evictions = walks = 0
+        try:
+            for vpage in refs:
+                if tlb_sets is not None:
+                    set_index = vpage % num_sets
+                    entries = tlb_sets[set_index]
+                    frame = entries.pop(vpage, None) if tlb_lru else entries.get(vpage)
+                    if frame is not None:
+                        entries[vpage] = frame  # LRU: back in as the most recent
+                        if record:
+                            flag(0)
+                            evict(NO_PAGE)
+                        accesses += 1
+                        continue
+                frame = walk(vpage)
+                if frame is not None:
+                    if record:
+                        flag(0)
+                        evict(NO_PAGE)
+                else:
+                    victim = load(vpage)
+                    faults += 1
+                    frame = page_table[vpage]
+                    if victim is not None:
+                        evictions += 1
+                    if record:
+                        flag(1)
+                        evict(NO_PAGE if victim is None else victim)
+                if tlb_sets is not None:
+                    if len(entries) >= ways:
+                        if tlb_lru:
+                            for oldest in entries:  # the least recent
+                                break
+                            del entries[oldest]
+                        else:
+                            keys = tlb_keys[set_index]
+                            position = int(random() * ways)
+                            del entries[keys[position]]
+                            keys[position] = vpage
+                    elif not tlb_lru:
+                        tlb_keys[set_index].append(vpage)
+                    entries[vpage] = frame
+                accesses += 1
+                walks += 1
+        finally:
+            # Counters cover the references that completed, even if one raised
+            self.page_faults += faults
+            self.accesses += accesses
+            self.page_walks += walks
+            if tlb is not None:
+                tlb.hits += accesses - walks
+                tlb.misses += walks
+        details = {"page_walks": walks}
+        if tlb is not None:
+            hits = accesses - walks
+            details["tlb_hits"] = hits
+            details["tlb_hit_rate"] = hits / accesses if accesses else 0.0
+        if not record:
+            return TraceResult(accesses, faults, evictions, details=details)
+        return TraceResult(accesses, faults, evictions, fault_flags, evicted, details)
+    
+    def context_switch(self):
+        if self.tlb is not None:
+            self.tlb.context_switch()
+    
+    def effective_access_time(self, memory_ns=100.0, fault_ns=0.0):
+        # Average ns per reference: TLB probe, one memory reference per
+        # page-table level on a walk, the data reference itself and,
+        # optionally, the page-fault service time
+        if not self.accesses:
+            return 0.0
+        total = self.accesses * memory_ns
+        total += self.page_walks * self.page_table_levels * memory_ns
+        total += self.page_faults * fault_ns
+        if self.tlb is not None:
+            total += self.accesses * self.tlb.hit_time_ns
+        return total / self.accesses
+    
+    def stats(self):
+        stats = {
+            "accesses": self.accesses,
+            "page_faults": self.page_faults,
+            "page_walks": self.page_walks,
+            "effective_access_time_ns": self.effective_access_time(),
+        }
+        if self.tlb is not None:
+            stats["tlb_hit_rate"] = self.tlb.hit_rate
+        return stats
+    
     def load_virtual_page(self, vpage):
-        if None in self.physical_memory:
-            index = self.physical_memory.index(None)
-            self.physical_memory[index] = vpage
-            self.page_table[vpage] = index
-            self.fifo_queue.append(index)
+        # Returns the evicted virtual page, or None if a free frame was used
+        self._check_page(vpage)
+        if self.free_frames:
+            index = self.free_frames.pop()
+            victim = None
         else:
             index = self.fifo_queue.popleft()
-            # Remove the virtual page that was in this frame
-            for key, value in list(self.page_table.items()):
-                if value == index:
-                    del self.page_table[key]
-                    break
-            self.physical_memory[index] = vpage
-            self.page_table[vpage] = index
-            self.fifo_queue.append(index)
+            # Unmap the virtual page that was in this frame
+            victim = self.physical_memory[index]
+            del self.page_table[victim]
+            tlb = self.tlb
+            if tlb is not None and victim in tlb.sets[victim % tlb.num_sets]:
+                # A stale translation would keep hitting the reused frame
+                tlb.invalidate(victim)
+        self.physical_memory[index] = vpage
+        self.page_table[vpage] = index
+        self.fifo_queue.append(index)
+        self.dirty_frames.add(index)
+        return victim
     
     def reset(self):
         self.physical_memory = [None] * self.num_frames
-        self.page_table = {}
+        self.page_table = self._new_page_table()
+        self.free_frames = list(range(self.num_frames - 1, -1, -1))
+        self.dirty_frames = set()
         self.page_faults = 0
         self.fifo_queue.clear()
+        self.accesses = 0
+        self.page_walks = 0
+        if self.tlb is not None:
+            self.tlb.reset()
+        self._emit_reset()
+    
+    def memory_footprint(self):
+        return memory_footprint({"physical_memory": self.physical_memory, "page_table": self.page_table,
+                                 "free_frames": self.free_frames, "fifo_queue": self.fifo_queue,
+                                 "tlb": self.tlb, "dirty_frames": self.dirty_frames})
+
+# ----------- Compact Virtual Memory Simulator -----------
+# VirtualMemorySimulator with physical_memory as an array('q') (EMPTY_FRAME
+# for free frames), leaf page tables as typed arrays, and a FIFO hand in
+# place of the frame queue: frames are filled in index order and each
+# refill goes back to the end of the queue, so FIFO visits them cyclically.
+# With num_pages a flat table is an ArrayPageTable over 0..num_pages-1.
+# Dirty frames are a bytearray bitmap, as in CompactPagingSimulator.
+class CompactVirtualMemorySimulator(VirtualMemorySimulator):
+    __slots__ = ("num_pages", "next_free", "hand")
+
+    def __init__(self, num_frames, page_table_levels=1, va_bits=48, page_size=4096, tlb=None, num_pages=None):
+        self.num_frames = num_frames
+        self.num_pages = num_pages
+        self.physical_memory = array("q", [EMPTY_FRAME]) * num_frames
+        self.page_table_levels = page_table_levels
+        self.va_bits = va_bits
+        self.page_size = page_size
+        self.page_table = self._new_page_table()
+        self.free_frames = None
+        self.fifo_queue = None
+        self.next_free = 0
+        self.hand = 0
+        self.dirty_frames = bytearray(num_frames)  # 1 where the page changed since take_dirty_frames()
+        self.page_faults = 0
+        self.tlb = tlb
+        self.accesses = 0
+        self.page_walks = 0
+        self._init_observers()
+    
+    def _new_page_table(self):
+        if self.page_table_levels == 1:
+            return ArrayPageTable(self.num_pages, self.num_frames) if self.num_pages else {}
+        offset_bits = self.page_size.bit_length() - 1
+        if self.page_size != 1 << offset_bits:
+            raise ValueError("Page size must be a power of two")
+        return MultiLevelPageTable(self.page_table_levels, self.va_bits - offset_bits, compact=True)
+    
+    def _check_page(self, vpage):
+        # Frames and flat tables are typed arrays, so pages must also be
+        # non-negative, and below num_pages when it is given
+        if vpage < 0:
+            raise ValueError(f"Page numbers must be non-negative, not {vpage}")
+        if self.num_pages and self.page_table_levels == 1 and vpage >= self.num_pages:
+            raise ValueError(f"Page {vpage} is outside the {self.num_pages}-page address space")
+        super()._check_page(vpage)
+    
+    def page_table_overhead(self):
+        # With num_pages the flat table spans just those pages
+        if self.page_table_levels == 1 and self.num_pages:
+            return self.num_pages * PTE_SIZE
+        return super().page_table_overhead()
+    
+    def load_virtual_page(self, vpage):
+        self._check_page(vpage)
+        if self.next_free < self.num_frames:
+            index = self.next_free
+            self.next_free += 1
+            victim = None
+        else:
+            index = self.hand
+            self.hand = index + 1 if index + 1 < self.num_frames else 0
+            victim = self.physical_memory[index]
+            del self.page_table[victim]
+            tlb = self.tlb
+            if tlb is not None and victim in tlb.sets[victim % tlb.num_sets]:
+                tlb.invalidate(victim)
+        self.page_table[vpage] = index
+        self.physical_memory[index] = vpage
+        self.dirty_frames[index] = 1
+        return victim
+    
+    def reset(self):
+        self.physical_memory = array("q", [EMPTY_FRAME]) * self.num_frames
+        self.page_table = self._new_page_table()
+        self.next_free = 0
+        self.hand = 0
+        self.dirty_frames = bytearray(self.num_frames)
+        self.page_faults = 0
+        self.accesses = 0
+        self.page_walks = 0
+        if self.tlb is not None:
+            self.tlb.reset()
+        self._emit_reset()
+    
+    def take_dirty_frames(self):
+        return take_dirty_bitmap(self.dirty_frames)
+    
+    def memory_footprint(self):
+        return memory_footprint({"physical_memory": self.physical_memory, "page_table": self.page_table,
+                                 "tlb": self.tlb, "dirty_frames": self.dirty_frames})
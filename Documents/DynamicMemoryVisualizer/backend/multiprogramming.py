@@ -0,0 +1,298 @@
+# File: backend/multiprogramming.py
+
+from array import array
+from collections import deque
+from backend.memory_management import NO_PAGE, TraceResult, as_references
+from backend.page_tables import MultiLevelPageTable
+from backend.policies import create_policy
+
+REPLACEMENT_SCOPES = ["global", "local"]
+VPAGE_BITS = 48  # global policies key pages by process index << VPAGE_BITS | vpage
+VPAGE_MASK = (1 << VPAGE_BITS) - 1
+NO_PID = -(1 << 63)  # marks "no victim" in evicted_pids; -1 may be a real pid
+
+# ----------------- Processes -----------------
+class Process:
+    __slots__ = ("pid", "index", "page_table", "quota", "policy", "slots", "accesses", "faults",
+                 "stolen", "recent", "recent_pos", "recent_faults", "thrashing", "thrash_episodes")
+
+    def __init__(self, pid, index, page_table, quota, policy, window):
+        self.pid = pid
+        self.index = index  # dense number in creation order; pids can be any size
+        self.page_table = page_table  # vpage -> frame
+        self.quota = quota  # frames it may hold (local replacement only)
+        self.policy = policy  # its own policy over slots 0..quota-1 (local only)
+        self.slots = []  # slot -> frame (local only)
+        self.accesses = 0
+        self.faults = 0
+        self.stolen = 0  # its pages evicted by other processes' faults
+        # Fault flags of its last `window` references, as a ring with a running sum
+        self.recent = bytearray(window)
+        self.recent_pos = 0
+        self.recent_faults = 0
+        self.thrashing = False
+        self.thrash_episodes = 0
+
+    @property
+    def resident(self):
+        return len(self.page_table)
+
+    def stats(self):
+        return {
+            "accesses": self.accesses,
+            "faults": self.faults,
+            "fault_rate": self.faults / self.accesses if self.accesses else 0.0,
+            "resident": self.resident,
+            "quota": self.quota,
+            "stolen": self.stolen,
+            "thrashing": self.thrashing,
+            "thrash_episodes": self.thrash_episodes,
+        }
+
+# ----------------- Multiprogrammed Simulator -----------------
+# Several processes, each with its own page table, share one pool of
+# physical frames. Under global replacement a single policy ranks every
+# resident page (keyed by process index and page) and a fault may evict any
+# process's page. Under local replacement each process owns a quota of
+# frames and its own policy instance, and a fault only evicts the faulting
+# process's pages. Every reference costs a dict lookup for the process,
+# one page-table lookup and the policy calls, whatever the process count.
+#
+# A process is flagged as thrashing while at least thrash_threshold of its
+# last thrash_window references faulted; the same test over all references
+# flags the whole system.
+class MultiprogrammedSimulator:
+    __slots__ = ("num_frames", "replacement_algo", "scope", "quotas", "default_quota", "page_table_levels",
+                 "vpn_bits", "max_vpage", "thrash_window", "thrash_threshold", "processes", "by_index",
+                 "frame_owner", "frame_page", "frame_slot", "free_frames", "policy", "assigned", "page_faults",
+                 "accesses", "context_switches", "current_pid", "recent", "recent_pos", "recent_faults",
+                 "system_thrashing")
+
+    def __init__(self, num_frames, replacement_algo="FIFO", scope="global", quotas=None, default_quota=None,
+                 page_table_levels=1, vpn_bits=36, thrash_window=256, thrash_threshold=0.5):
+        if scope not in REPLACEMENT_SCOPES:
+            raise ValueError(f"Unknown replacement scope {scope!r} (available: {', '.join(REPLACEMENT_SCOPES)})")
+        if vpn_bits > VPAGE_BITS:
+            raise ValueError(f"Virtual page numbers are limited to {VPAGE_BITS} bits")
+        self.num_frames = num_frames
+        self.replacement_algo = replacement_algo
+        self.scope = scope
+        self.quotas = dict(quotas or {})  # pid -> frames, local replacement
+        self.default_quota = default_quota  # for pids not in quotas
+        self.page_table_levels = page_table_levels
+        self.vpn_bits = vpn_bits
+        # Highest vpage a process's page table can hold
+        self.max_vpage = (1 << vpn_bits) - 1 if page_table_levels > 1 else VPAGE_MASK
+        self.thrash_window = thrash_window
+        self.thrash_threshold = thrash_threshold
+        policy = create_policy(replacement_algo, num_frames)
+        if policy.needs_future:
+            raise ValueError(f"{replacement_algo} needs the future trace, which interleaving makes unknown")
+        self.policy = policy if scope == "global" else None
+        self.reset()
+
+    def reset(self):
+        self.processes = {}  # pid -> Process
+        self.by_index = []  # Process.index -> Process
+        self.frame_owner = array("q", [-1]) * self.num_frames  # frame -> owner's Process.index
+        self.frame_page = array("q", [NO_PAGE]) * self.num_frames  # frame -> vpage
+        self.frame_slot = array("q", [0]) * self.num_frames  # frame -> slot in its owner (local)
+        self.free_frames = list(range(self.num_frames - 1, -1, -1))
+        if self.policy is not None:
+            self.policy.reset()
+        self.assigned = 0  # frames promised to processes' quotas (local)
+        self.page_faults = 0
+        self.accesses = 0
+        self.context_switches = 0
+        self.current_pid = None
+        self.recent = bytearray(self.thrash_window)
+        self.recent_pos = 0
+        self.recent_faults = 0
+        self.system_thrashing = False
+
+    def add_process(self, pid, quota=None):
+        # Processes are also created on their first reference
+        if pid in self.processes:
+            raise ValueError(f"Process {pid} already exists")
+        if self.page_table_levels == 1:
+            page_table = {}
+        else:
+            page_table = MultiLevelPageTable(self.page_table_levels, self.vpn_bits)
+        policy = None
+        if self.scope == "local":
+            quota = quota or self.quotas.get(pid, self.default_quota)
+            if not quota:
+                raise ValueError(f"Local replacement needs a frame quota for process {pid}")
+            if self.assigned + quota > self.num_frames:
+                raise ValueError(f"Quota of {quota} frames for process {pid} exceeds the "
+                                 f"{self.num_frames - self.assigned} unassigned frames")
+            self.assigned += quota
+            policy = create_policy(self.replacement_algo, quota)
+        process = Process(pid, len(self.by_index), page_table, quota, policy, self.thrash_window)
+        self.processes[pid] = process
+        self.by_index.append(process)
+        return process
+
+    def access(self, pid, vpage):
+        # Returns (fault, victim), victim being the evicted (pid, vpage) or
+        # None. Everything that can be rejected is checked before any state
+        # changes.
+        if not 0 <= vpage <= self.max_vpage:
+            raise ValueError(f"Virtual page {vpage} does not fit in {self.max_vpage.bit_length()} bits")
+        process = self.processes.get(pid)
+        if process is None:
+            process = self.add_process(pid)
+        if pid != self.current_pid:
+            self.context_switches += 1
+            self.current_pid = pid
+        self.accesses += 1
+        process.accesses += 1
+        frame = process.page_table.get(vpage)
+        victim = None
+        if frame is not None:
+            fault = False
+            if process.policy is not None:
+                process.policy.on_hit(vpage, self.frame_slot[frame])
+            else:
+                self.policy.on_hit(process.index << VPAGE_BITS | vpage, frame)
+        else:
+            fault = True
+            self.page_faults += 1
+            process.faults += 1
+            victim = self._load(process, vpage)
+        self._track(process, fault)
+        return fault, victim
+
+    def _load(self, process, vpage):
+        victim = None
+        if process.policy is not None:
+            # Local: a free frame while under quota, else one of its own
+            if len(process.slots) < process.quota:
+                frame = self.free_frames.pop()
+                slot = len(process.slots)
+                process.slots.append(frame)
+                self.frame_slot[frame] = slot
+            else:
+                slot = process.policy.evict(vpage)
+                frame = process.slots[slot]
+                victim_page = self.frame_page[frame]
+                del process.page_table[victim_page]
+                victim = (process.pid, victim_page)
+            process.policy.on_load(vpage, slot)
+        else:
+            key = process.index << VPAGE_BITS | vpage
+            if self.free_frames:
+                frame = self.free_frames.pop()
+            else:
+                frame = self.policy.evict(key)
+                owner = self.by_index[self.frame_owner[frame]]
+                victim_page = self.frame_page[frame]
+                del owner.page_table[victim_page]
+                victim = (owner.pid, victim_page)
+                if owner is not process:
+                    owner.stolen += 1
+            self.policy.on_load(key, frame)
+        self.frame_owner[frame] = process.index
+        self.frame_page[frame] = vpage
+        process.page_table[vpage] = frame
+        return victim
+
+    def _track(self, process, fault):
+        # Windowed fault counts for the process and the system, O(1) each
+        window = self.thrash_window
+        limit = self.thrash_threshold * window
+        pos = process.recent_pos
+        process.recent_faults += fault - process.recent[pos]
+        process.recent[pos] = fault
+        process.recent_pos = pos + 1 if pos + 1 < window else 0
+        thrashing = process.accesses >= window and process.recent_faults >= limit
+        if thrashing and not process.thrashing:
+            process.thrash_episodes += 1
+        process.thrashing = thrashing
+        pos = self.recent_pos
+        self.recent_faults += fault - self.recent[pos]
+        self.recent[pos] = fault
+        self.recent_pos = pos + 1 if pos + 1 < window else 0
+        self.system_thrashing = self.accesses >= window and self.recent_faults >= limit
+
+    def run(self, schedule, record=False):
+        # Replays an iterable of (pid, vpage) references, e.g. from
+        # round_robin() or trace_schedule(). With record, evicted holds the
+        # victims' vpages and details["evicted_pids"] their owners, NO_PAGE
+        # and NO_PID where nothing was evicted.
+        fault_flags = array("B")
+        evicted = array("q")
+        evicted_pids = array("q")
+        access = self.access
+        accesses = faults = evictions = 0
+        for pid, vpage in schedule:
+            accesses += 1
+            fault, victim = access(pid, vpage)
+            if fault:
+                faults += 1
+                if victim is not None:
+                    evictions += 1
+            if record:
+                fault_flags.append(fault)
+                if victim is None:
+                    evicted.append(NO_PAGE)
+                    evicted_pids.append(NO_PID)
+                else:
+                    evicted_pids.append(victim[0])
+                    evicted.append(victim[1])
+        details = {"context_switches": self.context_switches, "system_thrashing": self.system_thrashing,
+                   "thrashing_processes": self.thrashing_processes()}
+        if not record:
+            return TraceResult(accesses, faults, evictions, details=details)
+        details["evicted_pids"] = evicted_pids
+        return TraceResult(accesses, faults, evictions, fault_flags, evicted, details)
+
+    def thrashing_processes(self):
+        return [pid for pid, process in self.processes.items() if process.thrashing]
+
+    def process_stats(self):
+        return {pid: process.stats() for pid, process in self.processes.items()}
+
+# ----------------- Schedulers -----------------
+# A schedule is an iterable of (pid, vpage) references.
+def round_robin(traces, quantum=100):
+    # traces: {pid: page sequence}. Each process runs `quantum` references
+    # in turn; finished processes leave the rotation.
+    if quantum <= 0:
+        raise ValueError("Quantum must be positive")
+    ready = deque((pid, iter(as_references(pages))) for pid, pages in traces.items())
+    while ready:
+        pid, pages = ready[0]
+        ran = 0
+        for vpage in pages:
+            yield pid, vpage
+            ran += 1
+            if ran == quantum:
+                break
+        if ran == quantum:
+            ready.rotate(-1)
+        else:
+            ready.popleft()
+
+def trace_schedule(pages, pids):
+    # The interleaving recorded in a trace's pid column. A generator, so the
+    # views it takes of the columns are dropped once it is exhausted.
+    yield from zip(as_references(pids), as_references(pages))
+
+def split_by_pid(pages, pids):
+    # {pid: array('q') of its pages} from a trace with a pid column
+    traces = {}
+    for pid, page in zip(as_references(pids), as_references(pages)):
+        column = traces.get(pid)
+        if column is None:
+            column = traces[pid] = array("q")
+        column.append(page)
+    return traces
+
+def equal_quotas(num_frames, pids):
+    # Splits the frames as evenly as possible, earlier pids getting the remainder
+    pids = list(pids)
+    if len(pids) > num_frames:
+        raise ValueError(f"{len(pids)} processes cannot each get a frame out of {num_frames}")
+    share, extra = divmod(num_frames, len(pids))
+    return {pid: share + (1 if i < extra else 0) for i, pid in enumerate(pids)}
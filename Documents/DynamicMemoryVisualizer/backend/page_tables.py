@@ -0,0 +1,150 @@
+# File: backend/page_tables.py
+
+from array import array
+
+PTE_SIZE = 8  # bytes per page-table entry, as on x86-64
+UNMAPPED = -1  # empty entry in array-backed tables
+
+# ----------------- Multi-Level Page Table -----------------
+# A radix tree over virtual page numbers. The VPN bits are split across the
+# levels (any remainder goes to the top level) and table pages below the
+# root are only allocated when a page inside their range is first mapped,
+# so a sparse 48-bit address space costs a handful of table pages instead
+# of one entry per possible page. Supports the dict operations the
+# simulator uses: in, get, [], []=, del, len. With compact=True the leaf
+# tables are array('q') with UNMAPPED entries instead of lists.
+class MultiLevelPageTable:
+    def __init__(self, levels, vpn_bits, compact=False):
+        if levels < 2:
+            raise ValueError("A multi-level page table needs at least 2 levels")
+        if vpn_bits < levels:
+            raise ValueError("Not enough virtual page number bits for that many levels")
+        self.levels = levels
+        self.vpn_bits = vpn_bits
+        self.max_vpage = (1 << vpn_bits) - 1
+        low_bits = vpn_bits // levels
+        bits = [vpn_bits - low_bits * (levels - 1)] + [low_bits] * (levels - 1)
+        # (shift, mask) of the index into each level, top level first
+        self.walk = []
+        shift = vpn_bits
+        for level_bits in bits:
+            shift -= level_bits
+            self.walk.append((shift, (1 << level_bits) - 1))
+        self.leaf_mask = self.walk[-1][1]
+        self.compact = compact
+        self.empty = UNMAPPED if compact else None
+        # Inner levels: (shift, mask, entries in the table each slot points
+        # to, whether that table is a leaf)
+        self.inner_walk = [(shift, mask, self.walk[i + 1][1] + 1, i == levels - 2)
+                           for i, (shift, mask) in enumerate(self.walk[:-1])]
+        self.root = [None] * (self.walk[0][1] + 1)
+        self.table_pages = 1
+        self.table_entries = len(self.root)
+        self.mapped = 0
+
+    def _leaf(self, vpage, create):
+        if not 0 <= vpage <= self.max_vpage:
+            raise ValueError(f"Virtual page {vpage} is outside the {self.vpn_bits}-bit page number space")
+        node = self.root
+        for shift, mask, child_entries, leaf in self.inner_walk:
+            index = (vpage >> shift) & mask
+            child = node[index]
+            if child is None:
+                if not create:
+                    return None
+                # Allocate the next-level table page on first use
+                if leaf and self.compact:
+                    child = array("q", [UNMAPPED]) * child_entries
+                else:
+                    child = [None] * child_entries
+                node[index] = child
+                self.table_pages += 1
+                self.table_entries += len(child)
+            node = child
+        return node
+
+    def get(self, vpage, default=None):
+        leaf = self._leaf(vpage, False)
+        if leaf is None:
+            return default
+        frame = leaf[vpage & self.leaf_mask]
+        return default if frame is None or frame < 0 else frame
+
+    def __contains__(self, vpage):
+        return self.get(vpage) is not None
+
+    def __getitem__(self, vpage):
+        frame = self.get(vpage)
+        if frame is None:
+            raise KeyError(vpage)
+        return frame
+
+    def __setitem__(self, vpage, frame):
+        leaf = self._leaf(vpage, True)
+        offset = vpage & self.leaf_mask
+        if leaf[offset] == self.empty:
+            self.mapped += 1
+        leaf[offset] = frame
+
+    def __delitem__(self, vpage):
+        leaf = self._leaf(vpage, False)
+        offset = vpage & self.leaf_mask
+        if leaf is None or leaf[offset] == self.empty:
+            raise KeyError(vpage)
+        leaf[offset] = self.empty
+        self.mapped -= 1
+
+    def __len__(self):
+        return self.mapped
+
+    def overhead_bytes(self):
+        return self.table_entries * PTE_SIZE
+
+# ----------------- Array Page Table -----------------
+# A linear page table over pages 0..num_pages-1 held in one typed array
+# (4 bytes per page while frame numbers fit in 32 bits), for simulations
+# whose page numbers are dense. Same dict-like interface as above.
+class ArrayPageTable:
+    __slots__ = ("entries", "num_pages", "mapped")
+
+    def __init__(self, num_pages, num_frames):
+        typecode = "i" if num_frames < 1 << 31 else "q"
+        self.entries = array(typecode, [UNMAPPED]) * num_pages
+        self.num_pages = num_pages
+        self.mapped = 0
+
+    def get(self, page, default=None):
+        if 0 <= page < self.num_pages:
+            frame = self.entries[page]
+            if frame >= 0:
+                return frame
+        return default
+
+    def __contains__(self, page):
+        return self.get(page) is not None
+
+    def __getitem__(self, page):
+        frame = self.get(page)
+        if frame is None:
+            raise KeyError(page)
+        return frame
+
+    def __setitem__(self, page, frame):
+        if not 0 <= page < self.num_pages:
+            raise ValueError(f"Page {page} is outside the {self.num_pages}-page address space")
+        if self.entries[page] < 0:
+            self.mapped += 1
+        self.entries[page] = frame
+
+    def __delitem__(self, page):
+        if self.get(page) is None:
+            raise KeyError(page)
+        self.entries[page] = UNMAPPED
+        self.mapped -= 1
+
+    def __len__(self):
+        return self.mapped
+
+    def clear(self):
+        self.entries = array(self.entries.typecode, [UNMAPPED]) * self.num_pages
+        self.mapped = 0
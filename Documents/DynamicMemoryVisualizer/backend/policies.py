@@ -0,0 +1,426 @@
+# File: backend/policies.py
+
+import heapq
+from array import array
+from collections import deque, OrderedDict
+
+# ----------------- Policy Interface -----------------
+# A replacement policy only tracks ordering; the simulator owns the frames
+# and the page -> frame map. The simulator calls:
+#   check(page)           (needs_future policies only) before an access
+#                         changes any state; raises if page cannot be next
+#   on_hit(page, frame)   when a resident page is referenced
+#   evict(page) -> frame  when memory is full and `page` must be brought in;
+#                         the policy forgets the victim and returns its frame
+#   on_load(page, frame)  after `page` has been placed into `frame`
+class ReplacementPolicy:
+    __slots__ = ("num_frames",)
+    name = None
+    needs_future = False  # True if prepare(trace) must be called before use
+    tracks_hits = True  # False if on_hit is a no-op and may be skipped
+
+    def __init__(self, num_frames):
+        self.num_frames = num_frames
+
+    def prepare(self, trace):
+        pass
+
+    def check(self, page):
+        pass
+
+    def on_hit(self, page, frame):
+        pass
+
+    def on_load(self, page, frame):
+        raise NotImplementedError
+
+    def evict(self, page):
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+REPLACEMENT_POLICIES = {}
+
+def register_policy(cls):
+    REPLACEMENT_POLICIES[cls.name] = cls
+    return cls
+
+def available_policies():
+    return list(REPLACEMENT_POLICIES)
+
+def create_policy(name, num_frames):
+    try:
+        cls = REPLACEMENT_POLICIES[name]
+    except KeyError:
+        choices = ", ".join(REPLACEMENT_POLICIES)
+        raise ValueError(f"Unknown replacement algorithm {name!r} (available: {choices})") from None
+    return cls(num_frames)
+
+# Compact variants keep their state in typed arrays indexed by frame rather
+# than in dicts keyed by page, for the compact simulators. Policies without
+# one fall back to the regular implementation.
+COMPACT_POLICIES = {}
+
+def register_compact_policy(cls):
+    COMPACT_POLICIES[cls.name] = cls
+    return cls
+
+def create_compact_policy(name, num_frames):
+    cls = COMPACT_POLICIES.get(name)
+    return cls(num_frames) if cls is not None else create_policy(name, num_frames)
+
+# ----------------- FIFO -----------------
+@register_policy
+class FIFOPolicy(ReplacementPolicy):
+    name = "FIFO"
+    tracks_hits = False
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.queue = deque()  # frame indices in load order
+
+    def on_load(self, page, frame):
+        self.queue.append(frame)
+
+    def evict(self, page):
+        return self.queue.popleft()
+
+    def reset(self):
+        self.queue.clear()
+
+@register_compact_policy
+class CompactFIFOPolicy(ReplacementPolicy):
+    # Load order in a ring buffer of frame indices: 4 bytes per frame
+    __slots__ = ("ring", "head", "size")
+    name = "FIFO"
+    tracks_hits = False
+
+    def __init__(self, num_frames):
+        self.num_frames = num_frames
+        self.ring = array("i", bytes(4 * num_frames))
+        self.head = 0
+        self.size = 0
+
+    def on_load(self, page, frame):
+        tail = self.head + self.size
+        self.ring[tail - self.num_frames if tail >= self.num_frames else tail] = frame
+        self.size += 1
+
+    def evict(self, page):
+        frame = self.ring[self.head]
+        self.head = self.head + 1 if self.head + 1 < self.num_frames else 0
+        self.size -= 1
+        return frame
+
+    def reset(self):
+        self.head = self.size = 0
+
+# ----------------- LRU -----------------
+@register_policy
+class LRUPolicy(ReplacementPolicy):
+    name = "LRU"
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.lru_order = OrderedDict()  # page -> frame, least recent first
+
+    def on_hit(self, page, frame):
+        self.lru_order.move_to_end(page)
+
+    def on_load(self, page, frame):
+        self.lru_order[page] = frame
+
+    def evict(self, page):
+        return self.lru_order.popitem(last=False)[1]
+
+    def reset(self):
+        self.lru_order.clear()
+
+@register_compact_policy
+class CompactLRUPolicy(ReplacementPolicy):
+    # Recency as a doubly linked list of frames held in two arrays; index
+    # num_frames is the list head sentinel (next = least recent, prev = most
+    # recent). 8 bytes per frame instead of an OrderedDict entry per page.
+    __slots__ = ("prev", "next")
+    name = "LRU"
+
+    def __init__(self, num_frames):
+        self.num_frames = num_frames
+        self.reset()
+
+    def _unlink(self, frame):
+        prev, next_ = self.prev, self.next
+        before, after = prev[frame], next_[frame]
+        next_[before] = after
+        prev[after] = before
+
+    def _append(self, frame):
+        prev, next_ = self.prev, self.next
+        head = self.num_frames
+        last = prev[head]
+        next_[last] = frame
+        prev[frame] = last
+        next_[frame] = head
+        prev[head] = frame
+
+    def on_hit(self, page, frame):
+        # _unlink and _append inlined: this runs on every hit
+        prev, next_ = self.prev, self.next
+        head = self.num_frames
+        last = prev[head]
+        if last == frame:
+            return  # already the most recent
+        before, after = prev[frame], next_[frame]
+        next_[before] = after
+        prev[after] = before
+        next_[last] = frame
+        prev[frame] = last
+        next_[frame] = head
+        prev[head] = frame
+
+    def on_load(self, page, frame):
+        self._append(frame)
+
+    def evict(self, page):
+        frame = self.next[self.num_frames]
+        self._unlink(frame)
+        return frame
+
+    def reset(self):
+        head = self.num_frames
+        self.prev = array("i", [head]) * (head + 1)
+        self.next = array("i", [head]) * (head + 1)
+
+# ----------------- Belady OPT -----------------
+@register_policy
+class OPTPolicy(ReplacementPolicy):
+    # Evicts the resident page whose next use is furthest away. prepare()
+    # precomputes, for every trace position, the position of the next
+    # reference to the same page, so each access only pushes that value
+    # onto a max-heap. Stale heap entries are skipped lazily and the heap
+    # is rebuilt once it holds twice as many entries as there are frames,
+    # which keeps eviction at O(log frames) amortized.
+    name = "OPT"
+    needs_future = True
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.trace = None
+        self.next_use = None
+        self.position = 0
+        self.next_of = {}  # resident page -> position of its next use
+        self.frame_of = {}  # resident page -> frame
+        self.heap = []  # (-next use, page), may contain stale entries
+
+    def prepare(self, trace):
+        # A private copy: the caller's trace may be a view of a memory-mapped
+        # file that is closed once the replay is over
+        try:
+            self.trace = array("q", trace)
+        except (OverflowError, TypeError):
+            self.trace = list(trace)
+        trace = self.trace
+        never = len(trace)
+        self.next_use = array("q", bytes(8 * never))
+        upcoming = {}
+        for i in range(never - 1, -1, -1):
+            page = trace[i]
+            self.next_use[i] = upcoming.get(page, never)
+            upcoming[page] = i
+        self.position = 0
+        # Pages already resident keep their frames; re-key them on the new trace
+        self.next_of = {page: upcoming.get(page, never) for page in self.frame_of}
+        self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        self.heap = [(-next_use, page) for page, next_use in self.next_of.items()]
+        heapq.heapify(self.heap)
+
+    def check(self, page):
+        if self.trace is None:
+            raise RuntimeError("OPT needs the reference trace; call prepare(trace) first")
+        if self.position >= len(self.trace):
+            raise ValueError("Access beyond the end of the prepared trace")
+        if self.trace[self.position] != page:
+            raise ValueError(f"Page {page} does not match the prepared trace "
+                             f"(expected {self.trace[self.position]} at step {self.position})")
+
+    def _advance(self, page, frame):
+        self.check(page)
+        next_use = self.next_use[self.position]
+        self.position += 1
+        self.next_of[page] = next_use
+        self.frame_of[page] = frame
+        heapq.heappush(self.heap, (-next_use, page))
+        if len(self.heap) > 2 * self.num_frames + 16:
+            self._rebuild_heap()
+
+    def on_hit(self, page, frame):
+        self._advance(page, frame)
+
+    def on_load(self, page, frame):
+        self._advance(page, frame)
+
+    def evict(self, page):
+        self.check(page)
+        heap = self.heap
+        next_of = self.next_of
+        while True:
+            neg_next, victim = heapq.heappop(heap)
+            if next_of.get(victim) == -neg_next:
+                del next_of[victim]
+                return self.frame_of.pop(victim)
+
+    def reset(self):
+        self.position = 0
+        self.next_of.clear()
+        self.frame_of.clear()
+        self.heap = []
+
+# ----------------- Clock (Second Chance) -----------------
+@register_policy
+class ClockPolicy(ReplacementPolicy):
+    name = "Clock"
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.referenced = bytearray(num_frames)  # reference bit per frame
+        self.hand = 0
+
+    def on_hit(self, page, frame):
+        self.referenced[frame] = 1
+
+    def on_load(self, page, frame):
+        self.referenced[frame] = 1
+
+    def evict(self, page):
+        # Sweep the hand, clearing reference bits, until an unreferenced frame
+        referenced = self.referenced
+        hand = self.hand
+        while referenced[hand]:
+            referenced[hand] = 0
+            hand += 1
+            if hand == self.num_frames:
+                hand = 0
+        victim = hand
+        self.hand = hand + 1 if hand + 1 < self.num_frames else 0
+        return victim
+
+    def reset(self):
+        self.referenced = bytearray(self.num_frames)
+        self.hand = 0
+
+# Clock's reference bits are already a bytearray indexed by frame
+COMPACT_POLICIES["Clock"] = ClockPolicy
+
+# ----------------- LFU -----------------
+@register_policy
+class LFUPolicy(ReplacementPolicy):
+    # O(1) LFU: pages are bucketed by reference count, and each bucket keeps
+    # its pages in LRU order to break ties.
+    name = "LFU"
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.count = {}  # resident page -> reference count
+        self.buckets = {}  # reference count -> OrderedDict(page -> frame)
+        self.min_count = 0
+
+    def on_hit(self, page, frame):
+        count = self.count[page]
+        bucket = self.buckets[count]
+        del bucket[page]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = count + 1
+        self.count[page] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[page] = frame
+
+    def on_load(self, page, frame):
+        self.count[page] = 1
+        self.buckets.setdefault(1, OrderedDict())[page] = frame
+        self.min_count = 1
+
+    def evict(self, page):
+        bucket = self.buckets[self.min_count]
+        victim, frame = bucket.popitem(last=False)
+        if not bucket:
+            del self.buckets[self.min_count]
+        del self.count[victim]
+        return frame
+
+    def reset(self):
+        self.count.clear()
+        self.buckets.clear()
+        self.min_count = 0
+
+# ----------------- ARC -----------------
+@register_policy
+class ARCPolicy(ReplacementPolicy):
+    # Adaptive Replacement Cache (Megiddo & Modha). T1/T2 hold resident pages
+    # seen once/more than once, B1/B2 are ghost lists of pages recently
+    # evicted from them, and p is the adaptive target size of T1.
+    name = "ARC"
+
+    def __init__(self, num_frames):
+        super().__init__(num_frames)
+        self.t1 = OrderedDict()  # page -> frame, LRU first
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()  # ghost pages -> None
+        self.b2 = OrderedDict()
+        self.p = 0.0
+
+    def on_hit(self, page, frame):
+        if page in self.t1:
+            del self.t1[page]
+            self.t2[page] = frame
+        else:
+            self.t2.move_to_end(page)
+
+    def on_load(self, page, frame):
+        if page in self.b1:
+            del self.b1[page]
+            self.t2[page] = frame
+        elif page in self.b2:
+            del self.b2[page]
+            self.t2[page] = frame
+        else:
+            self.t1[page] = frame
+
+    def _replace(self, page):
+        t1 = self.t1
+        if t1 and (len(t1) > self.p or (page in self.b2 and len(t1) == self.p) or not self.t2):
+            victim, frame = t1.popitem(last=False)
+            self.b1[victim] = None
+        else:
+            victim, frame = self.t2.popitem(last=False)
+            self.b2[victim] = None
+        return frame
+
+    def evict(self, page):
+        c = self.num_frames
+        b1, b2 = self.b1, self.b2
+        if page in b1:
+            self.p = min(c, self.p + max(len(b2) / len(b1), 1))
+            return self._replace(page)
+        if page in b2:
+            self.p = max(0, self.p - max(len(b1) / len(b2), 1))
+            return self._replace(page)
+        if len(self.t1) + len(b1) == c:
+            if len(self.t1) < c:
+                b1.popitem(last=False)
+                return self._replace(page)
+            # T1 fills the cache: drop its LRU page without remembering it
+            return self.t1.popitem(last=False)[1]
+        if len(self.t1) + len(self.t2) + len(b1) + len(b2) >= 2 * c:
+            b2.popitem(last=False)
+        return self._replace(page)
+
+    def reset(self):
+        self.t1.clear()
+        self.t2.clear()
+        self.b1.clear()
+        self.b2.clear()
+        self.p = 0.0
@@ -0,0 +1,192 @@
+# File: backend/sweep.py
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+from backend.memory_management import PagingSimulator, VirtualMemorySimulator
+from backend.policies import available_policies
+from backend.trace_io import open_trace
+
+SWEEP_FIELDS = ["simulator", "frames", "policy", "accesses", "page_faults", "hits",
+                "evictions", "fault_rate", "seconds"]
+SIMULATOR_KINDS = ["paging", "virtual"]
+
+# ----------------- Shared Trace -----------------
+# The trace is copied once into a shared-memory block as packed int64s.
+# Each worker process attaches to it when it starts, so tasks only carry
+# (simulator, frames, policy) and the trace is never pickled.
+_worker_trace = None
+_worker_block = None
+
+def share_trace(trace):
+    # 64-bit buffers (array('q'), the page column of an 8-byte binary
+    # trace) are copied byte-for-byte; anything else is widened first
+    try:
+        view = memoryview(trace)
+    except TypeError:
+        view = None
+    if view is None or view.format not in ("q", "Q"):
+        view = memoryview(array("q", trace))
+    nbytes = len(view) * 8
+    block = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    block.buf[:nbytes] = view.cast("B")
+    return block, len(view)
+
+def _attach_trace(name, length):
+    global _worker_trace, _worker_block
+    _worker_block = shared_memory.SharedMemory(name=name)
+    _worker_trace = _worker_block.buf[:length * 8].cast("q")
+
+def _run_task(kind, frames, policy):
+    start = time.perf_counter()
+    if kind == "paging":
+        simulator = PagingSimulator(frames, policy)
+    else:
+        simulator = VirtualMemorySimulator(frames)
+    result = simulator.run_trace(_worker_trace, record=False)
+    row = {"simulator": kind, "frames": frames, "policy": policy}
+    row.update(result.summary())
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+# ----------------- Sweep -----------------
+def sweep_tasks(frame_counts, policies, simulators=SIMULATOR_KINDS):
+    tasks = []
+    for kind in simulators:
+        if kind not in SIMULATOR_KINDS:
+            raise ValueError(f"Unknown simulator {kind!r} (available: {', '.join(SIMULATOR_KINDS)})")
+        # The VM simulator always replaces FIFO, so it runs once per frame count
+        kind_policies = policies if kind == "paging" else ["FIFO"]
+        for policy in kind_policies:
+            for frames in frame_counts:
+                tasks.append((kind, frames, policy))
+    return tasks
+
+def check_policies(policies):
+    for policy in policies:
+        if policy not in available_policies():
+            raise ValueError(f"Unknown replacement algorithm {policy!r} (available: {', '.join(available_policies())})")
+
+def run_sweep(trace, frame_counts, policies=("FIFO", "LRU"), simulators=SIMULATOR_KINDS, workers=None):
+    # Yields one result row per (simulator, frames, policy) as soon as it
+    # finishes; rows therefore arrive out of grid order.
+    check_policies(policies)
+    tasks = sweep_tasks(frame_counts, list(policies), simulators)
+    block, length = share_trace(trace)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_trace,
+                                 initargs=(block.name, length)) as pool:
+            futures = [pool.submit(_run_task, *task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        block.close()
+        block.unlink()
+
+class SweepWriter:
+    # Streams rows to CSV or JSON (chosen by file extension) as they arrive,
+    # so partial results survive an interrupted sweep.
+    def __init__(self, f, fmt):
+        self.f = f
+        self.fmt = fmt
+        self.rows = 0
+        if fmt == "csv":
+            self.writer = csv.DictWriter(f, fieldnames=SWEEP_FIELDS, extrasaction="ignore")
+            self.writer.writeheader()
+        elif fmt == "json":
+            f.write("[\n")
+        else:
+            raise ValueError(f"Unknown output format {fmt!r}")
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self.writer.writerow(row)
+        else:
+            self.f.write((",\n" if self.rows else "") + json.dumps(row))
+        self.rows += 1
+        self.f.flush()
+
+    def close(self):
+        if self.fmt == "json":
+            self.f.write("\n]\n")
+        self.f.flush()
+
+def parse_frame_counts(spec):
+    # "8", "4,8,16", "1-64" or "8-256:8" (range with step)
+    counts = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            bounds, _, step = part.partition(":")
+            low, high = (int(x) for x in bounds.split("-", 1))
+            counts.extend(range(low, high + 1, int(step) if step else 1))
+        else:
+            counts.append(int(part))
+    if not counts or min(counts) <= 0:
+        raise ValueError(f"Frame counts must be positive: {spec!r}")
+    return counts
+
+# ----------------- Command Line -----------------
+def build_parser(parser=None):
+    parser = parser or argparse.ArgumentParser(
+        prog="python -m backend.sweep",
+        description="Replay a trace across a grid of frame counts and policies in parallel.")
+    parser.add_argument("trace", help="binary trace, or text file of page numbers separated by whitespace or commas")
+    parser.add_argument("--frames", required=True, help="frame counts, e.g. 4,8,16 or 1-64 or 8-256:8")
+    parser.add_argument("--policies", default="FIFO,LRU",
+                        help=f"comma-separated paging policies ({', '.join(available_policies())})")
+    parser.add_argument("--simulators", default="paging",
+                        help="comma-separated simulators to run (paging, virtual)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", "-o", default=None,
+                        help="write results to this .csv or .json file (default: CSV on stdout)")
+    return parser
+
+def main(args=None):
+    args = build_parser().parse_args(args)
+    try:
+        return run(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+def run(args):
+    frame_counts = parse_frame_counts(args.frames)
+    policies = [p.strip() for p in args.policies.split(",") if p.strip()]
+    simulators = [s.strip() for s in args.simulators.split(",") if s.strip()]
+    # Everything that can be rejected is, before the output is truncated
+    check_policies(policies)
+    sweep_tasks(frame_counts, policies, simulators)
+    trace, trace_file = open_trace(args.trace)
+    try:
+        if args.output:
+            fmt = "json" if args.output.endswith(".json") else "csv"
+            out = open(args.output, "w", newline="")
+        else:
+            fmt, out = "csv", sys.stdout
+        writer = SweepWriter(out, fmt)
+        start = time.perf_counter()
+        try:
+            for row in run_sweep(trace, frame_counts, policies, simulators, args.workers):
+                writer.write(row)
+        finally:
+            writer.close()
+            if out is not sys.stdout:
+                out.close()
+        references = len(trace)
+    finally:
+        if trace_file is not None:
+            trace_file.close()
+    print(f"{writer.rows} runs over {references} references with {args.workers or os.cpu_count()} "
+          f"workers in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# File: backend/tlb.py
+
+import random
+
+TLB_REPLACEMENT = ["LRU", "Random"]
+
+# ----------------- Translation Lookaside Buffer -----------------
+# A set-associative cache of vpage -> frame translations. The set is chosen
+# by vpage % num_sets; associativity == size gives a fully associative TLB.
+# Each set is a dict in recency order (LRU evicts its first key); Random
+# sets also keep a key list so a victim is picked in O(1). Invalidation
+# searches that list, which is short and rarely needed.
+class TLB:
+    def __init__(self, size=64, associativity=4, replacement="LRU",
+                 flush_on_context_switch=True, hit_time_ns=1.0, seed=0):
+        if size <= 0 or associativity <= 0 or size % associativity:
+            raise ValueError("TLB size must be a positive multiple of its associativity")
+        if replacement not in TLB_REPLACEMENT:
+            raise ValueError(f"Unknown TLB replacement {replacement!r} (available: {', '.join(TLB_REPLACEMENT)})")
+        self.size = size
+        self.associativity = associativity
+        self.num_sets = size // associativity
+        self.replacement = replacement
+        self.flush_on_context_switch = flush_on_context_switch
+        self.hit_time_ns = hit_time_ns
+        self.rng = random.Random(seed)
+        self.sets = [{} for _ in range(self.num_sets)]
+        self.set_keys = [[] for _ in range(self.num_sets)]  # Random only
+        self.lru = replacement == "LRU"
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+
+    def lookup(self, vpage):
+        entries = self.sets[vpage % self.num_sets]
+        frame = entries.pop(vpage, None) if self.lru else entries.get(vpage)
+        if frame is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entries[vpage] = frame  # LRU: re-inserted at the most recent end
+        return frame
+
+    def insert(self, vpage, frame):
+        set_index = vpage % self.num_sets
+        entries = self.sets[set_index]
+        if vpage in entries:
+            entries[vpage] = frame
+            return
+        full = len(entries) >= self.associativity
+        if self.lru:
+            if full:
+                for oldest in entries:
+                    break
+                del entries[oldest]
+        else:
+            keys = self.set_keys[set_index]
+            if full:
+                # The newcomer takes a random victim's place; random() is a
+                # C call where randrange() costs several Python frames
+                position = int(self.rng.random() * len(keys))
+                del entries[keys[position]]
+                keys[position] = vpage
+            else:
+                keys.append(vpage)
+        entries[vpage] = frame
+
+    def _remove_key(self, keys, vpage):
+        # Swap-remove vpage from a Random set
+        position = keys.index(vpage)
+        last = keys.pop()
+        if last != vpage:
+            keys[position] = last
+        del self.sets[vpage % self.num_sets][vpage]
+
+    def invalidate(self, vpage):
+        set_index = vpage % self.num_sets
+        if vpage in self.sets[set_index]:
+            if self.lru:
+                del self.sets[set_index][vpage]
+            else:
+                self._remove_key(self.set_keys[set_index], vpage)
+
+    def flush(self):
+        for entries in self.sets:
+            entries.clear()
+        for keys in self.set_keys:
+            keys.clear()
+        self.flushes += 1
+
+    def context_switch(self):
+        if self.flush_on_context_switch:
+            self.flush()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset(self):
+        self.flush()
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
@@ -0,0 +1,335 @@
+# File: backend/trace_io.py
+
+import csv
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# ----------------- Binary Trace Format -----------------
+# A 32-byte little-endian header followed by column blocks:
+#   magic    8s   b"DMVTRACE"
+#   version  u16  1
+#   flags    u16  FLAG_PID | FLAG_RW
+#   width    u8   bytes per page number: 4 (uint32) or 8 (uint64)
+#   (3 pad bytes)
+#   pagesize u32  page size the addresses were shifted by (1 = raw pages)
+#   count    u64  number of references
+#   (4 reserved bytes)
+# then count page numbers, then count uint32 pids if FLAG_PID, then count
+# uint8 access kinds (0 = read, 1 = write) if FLAG_RW. Keeping each column
+# contiguous lets a reader hand the page column to a simulator as a
+# memoryview over the mapped file, without copying.
+TRACE_MAGIC = b"DMVTRACE"
+TRACE_VERSION = 1
+FLAG_PID = 1
+FLAG_RW = 2
+HEADER = struct.Struct("<8sHHB3xIQ4x")
+PAGE_TYPECODES = {4: "I", 8: "Q"}
+READ, WRITE = 0, 1
+RW_CODES = {"r": READ, "read": READ, "0": READ, "w": WRITE, "write": WRITE, "1": WRITE}
+
+def _page_shift(page_size):
+    shift = page_size.bit_length() - 1
+    if page_size <= 0 or page_size != 1 << shift:
+        raise ValueError(f"Page size must be a power of two, not {page_size}")
+    return shift
+
+def _column(view, offset, count, typecode, itemsize):
+    column = view[offset:offset + count * itemsize]
+    if sys.byteorder == "little" or itemsize == 1:
+        return column.cast(typecode)
+    # Big-endian hosts cannot reinterpret the bytes in place
+    values = array(typecode, column)
+    values.byteswap()
+    return memoryview(values)
+
+class TraceFile:
+    # Memory-maps a binary trace. pages (and pids / rw when present) are
+    # memoryviews over the mapping; pass them straight to run_trace().
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        if size < HEADER.size:
+            self.file.close()
+            raise ValueError(f"{path} is too short to be a binary trace")
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, width, page_size, count = HEADER.unpack_from(self.mmap)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION or width not in PAGE_TYPECODES:
+            self.close()
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} binary trace")
+        expected = HEADER.size + count * (width + (4 if flags & FLAG_PID else 0) + (1 if flags & FLAG_RW else 0))
+        if size < expected:
+            self.close()
+            raise ValueError(f"{path} is truncated ({size} of {expected} bytes)")
+        self.page_width = width
+        self.page_size = page_size
+        self.count = count
+        self.view = memoryview(self.mmap)
+        offset = HEADER.size
+        self.pages = _column(self.view, offset, count, PAGE_TYPECODES[width], width)
+        offset += count * width
+        self.pids = self.rw = None
+        if flags & FLAG_PID:
+            self.pids = _column(self.view, offset, count, "I", 4)
+            offset += count * 4
+        if flags & FLAG_RW:
+            self.rw = _column(self.view, offset, count, "B", 1)
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        # Views handed out by this object are released first. The mapping
+        # cannot be closed while any other view of it is still alive (one
+        # held by a traceback, say); it is then only dropped, and unmapped
+        # once the last view goes away.
+        for name in ("pages", "pids", "rw", "view"):
+            column = getattr(self, name, None)
+            if column is not None:
+                try:
+                    column.release()
+                except BufferError:
+                    pass
+                setattr(self, name, None)
+        if getattr(self, "mmap", None) is not None:
+            try:
+                self.mmap.close()
+            except BufferError:
+                pass
+            self.mmap = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class TraceWriter:
+    # Writes a binary trace incrementally. The page column goes straight to
+    # the output file; pid and access-kind columns are spooled to temporary
+    # files and appended on close(), when the header is finalised. Leaving a
+    # with block by an exception calls abort() instead, so a failed write
+    # never leaves a valid-looking partial trace behind.
+    def __init__(self, path, page_width=8, page_size=1, with_pid=False, with_rw=False):
+        if page_width not in PAGE_TYPECODES:
+            raise ValueError("Page width must be 4 or 8 bytes")
+        _page_shift(page_size)
+        self.path = path
+        self.page_width = page_width
+        self.page_size = page_size
+        self.flags = (FLAG_PID if with_pid else 0) | (FLAG_RW if with_rw else 0)
+        self.count = 0
+        import tempfile  # only writers need it; keeps reader imports light
+        self.file = open(path, "wb")
+        self.file.write(bytes(HEADER.size))
+        self.pid_spool = tempfile.TemporaryFile() if with_pid else None
+        self.rw_spool = tempfile.TemporaryFile() if with_rw else None
+
+    def write(self, pages, pids=None, rw=None):
+        try:
+            pages = array(PAGE_TYPECODES[self.page_width], pages)
+        except OverflowError:
+            raise ValueError(f"Page numbers must be non-negative and fit in {self.page_width} bytes") from None
+        columns = [(self.file, pages)]
+        if self.pid_spool is not None:
+            try:
+                pids = array("I", pids)
+            except OverflowError:
+                raise ValueError("Pids must be non-negative and fit in 4 bytes") from None
+            if len(pids) != len(pages):
+                raise ValueError("pid column length does not match the page column")
+            columns.append((self.pid_spool, pids))
+        if self.rw_spool is not None:
+            rw = array("B", rw)
+            if len(rw) != len(pages):
+                raise ValueError("access-kind column length does not match the page column")
+            columns.append((self.rw_spool, rw))
+        for f, column in columns:
+            if sys.byteorder != "little":
+                column.byteswap()
+            column.tofile(f)
+        self.count += len(pages)
+
+    def close(self):
+        for spool in (self.pid_spool, self.rw_spool):
+            if spool is not None:
+                spool.seek(0)
+                while True:
+                    chunk = spool.read(1 << 20)
+                    if not chunk:
+                        break
+                    self.file.write(chunk)
+                spool.close()
+        self.file.seek(0)
+        self.file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, self.flags, self.page_width,
+                                    self.page_size, self.count))
+        self.file.close()
+
+    def abort(self):
+        # Discards the partial trace
+        for spool in (self.pid_spool, self.rw_spool):
+            if spool is not None:
+                spool.close()
+        self.file.close()
+        os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def write_trace(path, pages, pids=None, rw=None, page_width=8, page_size=1):
+    with TraceWriter(path, page_width, page_size, pids is not None, rw is not None) as writer:
+        writer.write(pages, pids, rw)
+
+def is_binary_trace(path):
+    with open(path, "rb") as f:
+        return f.read(len(TRACE_MAGIC)) == TRACE_MAGIC
+
+# ----------------- Segment Operation Traces -----------------
+# Lines of "alloc LABEL SIZE" or "free LABEL"; '#' starts a comment.
+def iter_segment_ops(path):
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            op = fields[0].lower()
+            if op == "alloc" and len(fields) == 3:
+                yield op, fields[1], int(fields[2], 0)
+            elif op == "free" and len(fields) == 2:
+                yield op, fields[1], 0
+            else:
+                raise ValueError(f"{path}:{number}: expected 'alloc LABEL SIZE' or 'free LABEL'")
+
+# ----------------- Text Traces -----------------
+# One or more page numbers per line, separated by whitespace or commas.
+# Everything after a '#' is a comment.
+def iter_text_trace(path):
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].replace(",", " ")
+            for token in line.split():
+                yield int(token, 0)
+
+def read_text_trace(path):
+    # Packs the pages into an array('q') as they are read, so the whole
+    # trace is never held as a list of Python ints
+    pages = array("q")
+    pages.extend(iter_text_trace(path))
+    return pages
+
+def open_trace(path):
+    # Page sequence for a trace file of either kind: the mapped page column
+    # of a binary trace (keep the TraceFile open while using it) or the
+    # packed pages of a text trace. Returns (pages, trace_file_or_None).
+    if is_binary_trace(path):
+        trace_file = TraceFile(path)
+        return trace_file.pages, trace_file
+    return read_text_trace(path), None
+
+# ----------------- Address Log Conversion -----------------
+def iter_address_log(path, address_column=0, pid_column=None, rw_column=None, delimiter=None):
+    # Yields (address, pid, rw) per record of a text or CSV address log.
+    # Addresses may be decimal or 0x-prefixed hex; rows whose address does
+    # not parse (e.g. a CSV header) are skipped. A record with a bad pid or
+    # access kind is an error naming its line.
+    with open(path, newline="") as f:
+        rows = csv.reader(f, delimiter=delimiter) if delimiter else (line.split() for line in f)
+        for number, row in enumerate(rows, 1):
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                address = int(row[address_column], 0)
+            except (ValueError, IndexError):
+                continue
+            pid = 0
+            if pid_column is not None:
+                try:
+                    pid = int(row[pid_column], 0)
+                except (ValueError, IndexError):
+                    raise ValueError(f"{path}:{number}: missing or invalid pid in column {pid_column}") from None
+            rw = READ
+            if rw_column is not None:
+                code = row[rw_column].strip().lower() if rw_column < len(row) else ""
+                rw = RW_CODES.get(code)
+                if rw is None:
+                    raise ValueError(f"{path}:{number}: unknown access kind {code!r} "
+                                     f"(expected r/w, read/write or 0/1)")
+            yield address, pid, rw
+
+def convert_address_log(src, dst, page_size=4096, address_column=0, pid_column=None,
+                        rw_column=None, delimiter=None, page_width=8, chunk_size=1 << 16):
+    # Streams an address log into a binary trace of page numbers, holding
+    # at most chunk_size records in memory. Returns the reference count.
+    shift = _page_shift(page_size)
+    pages = array(PAGE_TYPECODES[page_width])
+    pids = array("I") if pid_column is not None else None
+    rw = array("B") if rw_column is not None else None
+    with TraceWriter(dst, page_width, page_size, pids is not None, rw is not None) as writer:
+        for address, pid, kind in iter_address_log(src, address_column, pid_column, rw_column, delimiter):
+            try:
+                pages.append(address >> shift)
+                if pids is not None:
+                    pids.append(pid)
+            except OverflowError:
+                raise ValueError(f"{src}: page {address >> shift} or pid {pid} is negative or does not fit "
+                                 f"(pages take {page_width} bytes, pids 4)") from None
+            if rw is not None:
+                rw.append(kind)
+            if len(pages) >= chunk_size:
+                writer.write(pages, pids, rw)
+                del pages[:]
+                if pids is not None:
+                    del pids[:]
+                if rw is not None:
+                    del rw[:]
+        if pages:
+            writer.write(pages, pids, rw)
+        return writer.count
+
+# ----------------- Command Line -----------------
+def build_parser(parser=None):
+    import argparse
+    parser = parser or argparse.ArgumentParser(prog="python -m backend.trace_io",
+                                               description="Convert and inspect memory traces.")
+    commands = parser.add_subparsers(dest="trace_command", required=True)
+    convert = commands.add_parser("convert", help="convert a text/CSV address log to a binary trace")
+    convert.add_argument("source")
+    convert.add_argument("destination")
+    convert.add_argument("--page-size", type=int, default=4096,
+                         help="shift addresses by this power of two (1 = values are already pages)")
+    convert.add_argument("--column", type=int, default=0, help="address column (0-based)")
+    convert.add_argument("--pid-column", type=int, default=None)
+    convert.add_argument("--rw-column", type=int, default=None)
+    convert.add_argument("--delimiter", default=None, help="CSV delimiter (default: whitespace)")
+    convert.add_argument("--page-width", type=int, choices=[4, 8], default=8)
+    info = commands.add_parser("info", help="print the header of a binary trace")
+    info.add_argument("trace")
+    return parser
+
+def main(args=None):
+    args = build_parser().parse_args(args)
+    if args.trace_command == "convert":
+        count = convert_address_log(args.source, args.destination, args.page_size, args.column,
+                                    args.pid_column, args.rw_column, args.delimiter, args.page_width)
+        print(f"Wrote {count} references to {args.destination}")
+    else:
+        with TraceFile(args.trace) as trace:
+            print(f"references: {trace.count}")
+            print(f"page width: {trace.page_width} bytes")
+            print(f"page size:  {trace.page_size}")
+            print(f"pid column: {'yes' if trace.pids is not None else 'no'}")
+            print(f"r/w column: {'yes' if trace.rw is not None else 'no'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# File: backend/working_set.py
+
+import csv
+from collections import deque
+from backend.instrumentation import EventSink
+
+SAMPLE_FIELDS = ["time", "working_set", "peak_working_set", "mean_working_set", "faults", "fault_rate"]
+
+# ----------------- Working-Set Analyzer -----------------
+# Denning's working set W(t, tau) is the number of distinct pages among the
+# last tau references. The window is a deque of the last tau pages plus a
+# count per page inside it, so each reference costs O(1): one append, at
+# most one pop, two dict updates. Every `interval` references a sample
+#   (time, working_set, peak_working_set, mean_working_set, faults, fault_rate)
+# is emitted: W at the end of the interval, its peak and mean over the
+# interval, and the page-fault frequency (faults / references) in it.
+# Attach it to a PagingSimulator or VirtualMemorySimulator as an event sink,
+# or feed() it a trace and the fault flags run_trace() recorded.
+class WorkingSetAnalyzer(EventSink):
+    def __init__(self, tau, interval=100, max_samples=1 << 16):
+        if tau <= 0 or interval <= 0:
+            raise ValueError("tau and interval must be positive")
+        self.tau = tau
+        self.interval = interval
+        self.series = deque(maxlen=max_samples)  # most recent samples
+        # Samples not yet handed out by take_samples(); bounded the same way,
+        # since headless runs never take them
+        self.pending = deque(maxlen=max_samples)
+        self.reset_window()
+
+    def reset_window(self):
+        self.window = deque()
+        self.in_window = {}  # page -> references to it inside the window
+        self.time = 0
+        self.interval_refs = 0
+        self.interval_faults = 0
+        self.interval_peak = 0
+        self.interval_total = 0
+        self.total_faults = 0
+        self.peak = 0
+        self.ws_total = 0  # sum of W(t) over all references, for the mean
+
+    @property
+    def working_set(self):
+        return len(self.in_window)
+
+    def reference(self, page, fault):
+        window = self.window
+        in_window = self.in_window
+        window.append(page)
+        in_window[page] = in_window.get(page, 0) + 1
+        if len(window) > self.tau:
+            old = window.popleft()
+            count = in_window[old] - 1
+            if count:
+                in_window[old] = count
+            else:
+                del in_window[old]
+        size = len(in_window)
+        self.time += 1
+        self.ws_total += size
+        if size > self.peak:
+            self.peak = size
+        if size > self.interval_peak:
+            self.interval_peak = size
+        self.interval_total += size
+        self.interval_refs += 1
+        if fault:
+            self.interval_faults += 1
+            self.total_faults += 1
+        if self.interval_refs == self.interval:
+            self.flush()
+
+    def feed(self, pages, fault_flags):
+        reference = self.reference
+        for page, fault in zip(pages, fault_flags):
+            reference(page, fault)
+
+    def flush(self):
+        # Emits the current (possibly partial) interval as a sample
+        refs = self.interval_refs
+        if not refs:
+            return
+        sample = (self.time, len(self.in_window), self.interval_peak, self.interval_total / refs,
+                  self.interval_faults, self.interval_faults / refs)
+        self.series.append(sample)
+        self.pending.append(sample)
+        self.interval_refs = self.interval_faults = 0
+        self.interval_peak = self.interval_total = 0
+
+    def take_samples(self):
+        # Samples emitted since the last call (at most max_samples of the
+        # most recent), for a live view
+        samples = list(self.pending)
+        self.pending.clear()
+        return samples
+
+    def summary(self):
+        return {
+            "tau": self.tau,
+            "interval": self.interval,
+            "working_set": self.working_set,
+            "peak_working_set": self.peak,
+            "mean_working_set": self.ws_total / self.time if self.time else 0.0,
+            "fault_rate": self.total_faults / self.time if self.time else 0.0,
+            "samples": len(self.series),
+        }
+
+    def write_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(SAMPLE_FIELDS)
+            writer.writerows(self.series)
+
+    # ----- events -----
+    def on_hit(self, simulator, page, frame):
+        self.reference(page, False)
+
+    def on_fault(self, simulator, page, frame, victim):
+        self.reference(page, True)
+
+    def on_reset(self, simulator):
+        self.series.clear()
+        self.pending.clear()
+        self.reset_window()
@@ -0,0 +1,238 @@
+# File: benchmarks/bench.py
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from backend.memory_management import (CompactPagingSimulator, CompactVirtualMemorySimulator, PagingSimulator,
+                                       SegmentationSimulator, VirtualMemorySimulator)
+from backend.free_space import FIT_STRATEGIES
+from backend.instrumentation import EventCounter
+from backend.multiprogramming import MultiprogrammedSimulator, equal_quotas, round_robin
+from backend.policies import available_policies
+from backend.tlb import TLB
+from benchmarks.workloads import PAGE_WORKLOADS, segment_churn
+
+# ----------------- Benchmark Cases -----------------
+# Each case is (name, ops, make, run): make() builds fresh state outside
+# the timed region and run(state) does `ops` operations. A case is timed as
+# the best of several repeats (ns per operation) and run once more under
+# tracemalloc for its peak allocation. Baselines are only comparable on
+# the machine and Python version that recorded them.
+def paging_cases(length, sizes):
+    cases = []
+    for workload, generate in PAGE_WORKLOADS.items():
+        for frames, pages in sizes:
+            trace = generate(length, pages, 1)
+            for policy in available_policies():
+                name = f"paging/{policy}/{workload}/frames={frames}/run_trace"
+                cases.append((name, length, lambda f=frames, p=policy: PagingSimulator(f, p),
+                              lambda sim, t=trace: sim.run_trace(t, record=False)))
+            if workload == "zipfian":
+                # The per-call path the UI uses
+                for policy in ("FIFO", "LRU"):
+                    name = f"paging/{policy}/{workload}/frames={frames}/access_page"
+                    cases.append((name, length, lambda f=frames, p=policy: PagingSimulator(f, p),
+                                  lambda sim, t=trace: [sim.access_page(page) for page in t]))
+                for policy in ("FIFO", "LRU", "Clock"):
+                    name = f"paging-compact/{policy}/{workload}/frames={frames}/run_trace"
+                    cases.append((name, length, lambda f=frames, p=policy, n=pages: CompactPagingSimulator(f, p, n),
+                                  lambda sim, t=trace: sim.run_trace(t, record=False)))
+                # Replay with an event sink attached
+                name = f"paging/LRU/{workload}/frames={frames}/run_trace+events"
+                cases.append((name, length, lambda f=frames: observed(PagingSimulator(f, "LRU")),
+                              lambda sim, t=trace: sim.run_trace(t, record=False)))
+    return cases
+
+def observed(simulator):
+    simulator.add_observer(EventCounter())
+    return simulator
+
+def virtual_cases(length, sizes):
+    configs = {
+        "flat": lambda f: VirtualMemorySimulator(f),
+        "3-level": lambda f: VirtualMemorySimulator(f, page_table_levels=3),
+        "flat+tlb64": lambda f: VirtualMemorySimulator(f, tlb=TLB(64, 4)),
+        "flat+tlb64-full": lambda f: VirtualMemorySimulator(f, tlb=TLB(64, 64)),
+        "flat+tlb64-random": lambda f: VirtualMemorySimulator(f, tlb=TLB(64, 4, "Random")),
+        "compact-3-level": lambda f: CompactVirtualMemorySimulator(f, page_table_levels=3),
+    }
+    cases = []
+    for workload in ("zipfian", "phases", "looping"):
+        for frames, pages in sizes:
+            trace = PAGE_WORKLOADS[workload](length, pages, 2)
+            for config, build in configs.items():
+                name = f"virtual/{config}/{workload}/frames={frames}/run_trace"
+                cases.append((name, length, lambda b=build, f=frames: b(f),
+                              lambda sim, t=trace: sim.run_trace(t, record=False)))
+            name = f"virtual/flat/{workload}/frames={frames}/access_virtual_page"
+            cases.append((name, length, lambda f=frames: VirtualMemorySimulator(f),
+                          lambda sim, t=trace: [sim.access_virtual_page(page) for page in t]))
+    return cases
+
+def multiprogramming_cases(length, process_counts):
+    # The same total length split across more processes should cost the
+    # same per reference
+    cases = []
+    for count in process_counts:
+        traces = {pid: PAGE_WORKLOADS["zipfian"](length // count, 256, pid) for pid in range(count)}
+        frames = 16 * count
+        quotas = equal_quotas(frames, traces)
+        for scope in ("global", "local"):
+            name = f"multi/LRU/{scope}/processes={count}/round-robin"
+            cases.append((name, length // count * count,
+                          lambda f=frames, s=scope, q=quotas: MultiprogrammedSimulator(f, "LRU", s, q),
+                          lambda sim, t=traces: sim.run(round_robin(t, 100))))
+    return cases
+
+def segmentation_cases(operations, memories):
+    cases = []
+    for memory in memories:
+        ops = segment_churn(operations, max(memory // 200, 2), seed=3)
+        for strategy in FIT_STRATEGIES:
+            name = f"segmentation/{strategy.replace(' ', '-')}/churn/memory={memory}"
+            cases.append((name, operations, lambda m=memory, s=strategy: SegmentationSimulator(m, s),
+                          lambda sim, o=ops: replay_segment_ops(sim, o)))
+    return cases
+
+def replay_segment_ops(simulator, ops):
+    allocate = simulator.allocate_segment
+    free = simulator.free_segment
+    for op, label, size in ops:
+        if op == "alloc":
+            allocate(size, label)
+        else:
+            free(label)
+
+def measure(make, run, ops, repeats):
+    best = None
+    for _ in range(repeats):
+        state = make()
+        start = time.perf_counter_ns()
+        run(state)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    state = make()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ns_per_op": best / ops, "peak_bytes": peak, "ops": ops}
+
+def measure_cli_startup(repeats):
+    # Wall time of a whole headless CLI run on a tiny trace, interpreter
+    # start included
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("1 2 3 1\n")
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        command = [sys.executable, "-m", "backend", "paging", f.name, "--frames", "2"]
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            subprocess.run(command, cwd=root, check=True, stdout=subprocess.DEVNULL)
+            elapsed = time.perf_counter_ns() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        os.unlink(f.name)
+    return {"ns_per_op": best, "peak_bytes": 0, "ops": 1}
+
+def tlb_ratios(results):
+    # ns/op of each virtual/flat+tlb* replay over the same replay without a
+    # TLB; the TLB should not dominate the cost of a reference
+    ratios = {}
+    for name, result in results.items():
+        config, _, rest = name.partition("/")[2].partition("/")
+        if name.startswith("virtual/") and config.startswith("flat+tlb"):
+            plain = results.get(f"virtual/flat/{rest}")
+            if plain is not None:
+                ratios[name] = result["ns_per_op"] / plain["ns_per_op"]
+    return ratios
+
+# ----------------- Baselines -----------------
+def compare(results, baseline, tolerance, memory_tolerance):
+    regressions = []
+    print(f"{'case':<64} {'base ns/op':>11} {'now ns/op':>11} {'change':>8}")
+    for name, now in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<64} {'-':>11} {now['ns_per_op']:>11.1f}      new")
+            continue
+        change = now["ns_per_op"] / base["ns_per_op"] - 1 if base["ns_per_op"] else 0.0
+        flag = ""
+        if change > tolerance:
+            flag = "  SLOWER"
+            regressions.append(name)
+        if base["peak_bytes"] and now["peak_bytes"] > base["peak_bytes"] * (1 + memory_tolerance):
+            flag += "  MEMORY"
+            regressions.append(name)
+        print(f"{name:<64} {base['ns_per_op']:>11.1f} {now['ns_per_op']:>11.1f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench",
+        description="Benchmark the simulator hot paths and compare against a saved baseline.")
+    parser.add_argument("--quick", action="store_true", help="smaller traces and memories")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="compare against a JSON baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed ns/op slowdown (0.25 = 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="allowed peak-memory growth")
+    parser.add_argument("--max-tlb-ratio", type=float, default=3.0,
+                        help="exit 1 if a TLB replay costs more than this many times the same replay without one")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        length, sizes, seg_ops, memories = 20_000, [(64, 256), (1024, 4096)], 5_000, [10_000]
+        process_counts = [4, 64]
+    else:
+        length, sizes, seg_ops, memories = 100_000, [(64, 256), (4096, 16_384)], 20_000, [10_000, 1_000_000]
+        process_counts = [4, 256]
+    cases = (paging_cases(length, sizes) + virtual_cases(length, sizes)
+             + multiprogramming_cases(length, process_counts) + segmentation_cases(seg_ops, memories))
+    results = {}
+    for name, ops, make, run in cases:
+        if args.filter in name:
+            results[name] = measure(make, run, ops, args.repeats)
+            print(f"{name:<64} {results[name]['ns_per_op']:>9.1f} ns/op {results[name]['peak_bytes']:>12} B peak",
+                  file=sys.stderr)
+    if not args.filter or args.filter in ("cli", "startup", "cli/startup"):
+        results["cli/startup"] = measure_cli_startup(max(args.repeats, 5))
+        print(f"{'cli/startup':<64} {results['cli/startup']['ns_per_op'] / 1e6:>9.1f} ms", file=sys.stderr)
+
+    slow_tlb = []
+    for name, ratio in tlb_ratios(results).items():
+        flag = ""
+        if ratio > args.max_tlb_ratio:
+            flag = "  TLB-BOUND"
+            slow_tlb.append(name)
+        print(f"{name:<64} {ratio:>9.2f}x without TLB{flag}", file=sys.stderr)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.platform(),
+                       "quick": args.quick, "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("quick") != args.quick:
+            print("warning: baseline was recorded with a different --quick setting", file=sys.stderr)
+        regressions = compare(results, baseline["results"], args.tolerance, args.memory_tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s)", file=sys.stderr)
+            return 1
+    if slow_tlb:
+        print(f"{len(slow_tlb)} TLB case(s) over {args.max_tlb_ratio}x", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
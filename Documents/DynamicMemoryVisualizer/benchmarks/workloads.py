@@ -0,0 +1,71 @@
+# File: benchmarks/workloads.py
+
+import bisect
+import itertools
+import random
+from array import array
+
+# ----------------- Page Trace Generators -----------------
+# Every generator is deterministic for a given seed and returns the trace
+# packed in an array('q'), ready for run_trace().
+def sequential(length, pages):
+    # 0, 1, ..., pages - 1, 0, 1, ... (a streaming scan)
+    return array("q", (i % pages for i in range(length)))
+
+def looping(length, loop_pages, seed=0):
+    # A loop slightly larger than memory is LRU/FIFO's worst case; a random
+    # offset per run keeps page numbers from being tiny cached ints
+    base = random.Random(seed).randrange(1 << 20)
+    return array("q", (base + i % loop_pages for i in range(length)))
+
+def zipfian(length, pages, skew=1.0, seed=0):
+    # Page k (1-based rank) is referenced with probability ~ 1 / k^skew;
+    # ranks are shuffled onto page numbers so hot pages are not adjacent
+    rng = random.Random(seed)
+    weights = [1.0 / (rank ** skew) for rank in range(1, pages + 1)]
+    cdf = list(itertools.accumulate(weights))
+    total = cdf[-1]
+    page_of_rank = list(range(pages))
+    rng.shuffle(page_of_rank)
+    pick = bisect.bisect_left
+    draw = rng.random
+    return array("q", (page_of_rank[pick(cdf, draw() * total)] for _ in range(length)))
+
+def phase_shifting(length, pages, working_set, phase_length, locality=0.9, seed=0):
+    # Each phase draws a fresh working set; a `locality` fraction of the
+    # references stay inside it and the rest are uniform over all pages
+    rng = random.Random(seed)
+    trace = array("q")
+    for start in range(0, length, phase_length):
+        current = rng.sample(range(pages), min(working_set, pages))
+        for _ in range(min(phase_length, length - start)):
+            if rng.random() < locality:
+                trace.append(current[rng.randrange(len(current))])
+            else:
+                trace.append(rng.randrange(pages))
+    return trace
+
+# ----------------- Segmentation Workloads -----------------
+def segment_churn(operations, max_size, free_ratio=0.45, seed=0):
+    # A list of ("alloc", label, size) / ("free", label, 0) operations that
+    # frees a random live segment with probability free_ratio
+    rng = random.Random(seed)
+    live = []
+    ops = []
+    for i in range(operations):
+        if live and rng.random() < free_ratio:
+            label = live.pop(rng.randrange(len(live)))
+            ops.append(("free", label, 0))
+        else:
+            label = f"s{i}"
+            live.append(label)
+            ops.append(("alloc", label, rng.randint(1, max_size)))
+    return ops
+
+PAGE_WORKLOADS = {
+    "sequential": lambda length, pages, seed: sequential(length, pages),
+    "looping": lambda length, pages, seed: looping(length, pages, seed),
+    "zipfian": lambda length, pages, seed: zipfian(length, pages, 1.0, seed),
+    "phases": lambda length, pages, seed: phase_shifting(length, pages, max(pages // 8, 1),
+                                                         max(length // 10, 1), seed=seed),
+}
@@ -0,0 +1,160 @@
+# File: frontend/frame_strip.py
+
+import tkinter as tk
+
+# ----------------- Frame Strip -----------------
+# A horizontally scrollable, zoomable row of frame cells. Only the cells in
+# the visible part of the canvas have canvas items; those items persist
+# between updates and are recycled as the view scrolls, so an update costs
+# one itemconfig per changed visible cell instead of a full redraw.
+class FrameStrip(tk.Frame):
+    MIN_CELL_WIDTH = 36
+    MAX_ZOOM = 8.0
+    MIN_ZOOM = 0.25
+
+    def __init__(self, master, width=400, height=100, fill="lightblue", font=("Arial", 14)):
+        super().__init__(master)
+        self.view_width = width
+        self.view_height = height
+        self.fill = fill
+        self.font = font
+        self.zoom = 1.0
+        self.frames = None
+        self.count = 0
+        self.cell_width = width
+        self.cells = {}  # frame index -> (rect id, text id) of drawn cells
+        self.shown = {}  # frame index -> text currently displayed
+        self.spare = []  # recycled (rect id, text id) pairs
+
+        self.canvas = tk.Canvas(self, width=width, height=height, bg="white",
+                                xscrollincrement=1)
+        self.canvas.grid(row=0, column=0, columnspan=3)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self._on_scroll)
+        self.scrollbar.grid(row=1, column=0, sticky="ew")
+        self.canvas.config(xscrollcommand=self.scrollbar.set)
+        tk.Button(self, text="-", width=2, command=lambda: self.set_zoom(self.zoom / 2)).grid(row=1, column=1)
+        tk.Button(self, text="+", width=2, command=lambda: self.set_zoom(self.zoom * 2)).grid(row=1, column=2)
+        self.columnconfigure(0, weight=1)
+        self.canvas.bind("<Control-MouseWheel>", self._on_wheel_zoom)
+        self.canvas.bind("<Control-Button-4>", lambda e: self.set_zoom(self.zoom * 2))
+        self.canvas.bind("<Control-Button-5>", lambda e: self.set_zoom(self.zoom / 2))
+        self.canvas.bind("<Configure>", lambda e: self._sync_view())
+
+    # ----- public API -----
+    def show(self, frames, dirty=None):
+        # frames: sequence of page numbers with None (or a negative
+        # sentinel) for empty frames. dirty: indices that changed since the
+        # last call, or None to refresh every visible cell.
+        if frames is not self.frames or len(frames) != self.count:
+            if len(frames) != self.count:
+                self.zoom = 1.0  # a new memory size starts at the fitted zoom
+            self.frames = frames
+            self._layout()
+            return
+        if dirty is None:
+            self._refresh(self.cells)
+        else:
+            self._refresh([i for i in dirty if i in self.cells])
+
+    def clear(self):
+        self.frames = None
+        self.count = 0
+        self.canvas.delete("all")
+        self.cells.clear()
+        self.shown.clear()
+        self.spare.clear()
+
+    def set_zoom(self, zoom):
+        zoom = min(max(zoom, self.MIN_ZOOM), self.MAX_ZOOM)
+        if zoom == self.zoom or self.frames is None:
+            self.zoom = zoom
+            return
+        # Keep the cell at the left edge in place while zooming
+        first = self.canvas.canvasx(0) / self.cell_width
+        self.zoom = zoom
+        self._layout(first)
+
+    # ----- layout -----
+    def _layout(self, first_cell=0.0):
+        count = len(self.frames)
+        self.count = count
+        fit_width = (self.view_width - 10) / max(count, 1)
+        self.cell_width = max(fit_width, self.MIN_CELL_WIDTH) * self.zoom
+        total = max(count * self.cell_width + 10, self.view_width)
+        self.canvas.config(scrollregion=(0, 0, total, self.view_height))
+        self.canvas.xview_moveto(first_cell * self.cell_width / total if total else 0)
+        # Every cell is re-placed, so recycle all drawn items
+        for index in list(self.cells):
+            self._recycle(index)
+        self._sync_view()
+
+    def _visible_range(self):
+        left = self.canvas.canvasx(0)
+        right = left + self.canvas.winfo_width()
+        if right <= left:
+            right = left + self.view_width
+        first = max(int((left - 5) // self.cell_width), 0)
+        last = min(int((right - 5) // self.cell_width) + 1, self.count)
+        return first, last
+
+    def _sync_view(self):
+        if self.frames is None:
+            return
+        first, last = self._visible_range()
+        for index in [i for i in self.cells if not first <= i < last]:
+            self._recycle(index)
+        for index in range(first, last):
+            if index not in self.cells:
+                self._place(index)
+
+    def _recycle(self, index):
+        # Hide the cell's items and keep them for reuse instead of deleting
+        rect, text = self.cells.pop(index)
+        self.shown.pop(index, None)
+        self.canvas.itemconfig(rect, state="hidden")
+        self.canvas.itemconfig(text, state="hidden")
+        self.spare.append((rect, text))
+
+    def _place(self, index):
+        cw = self.cell_width
+        x0 = 5 + index * cw + min(5, cw * 0.1)
+        x1 = 5 + (index + 1) * cw - min(5, cw * 0.1)
+        y0, y1 = 20, self.view_height - 20
+        label = self._label(index)
+        if self.spare:
+            rect, text = self.spare.pop()
+            self.canvas.coords(rect, x0, y0, x1, y1)
+            self.canvas.coords(text, (x0 + x1) / 2, (y0 + y1) / 2)
+            self.canvas.itemconfig(rect, state="normal")
+            self.canvas.itemconfig(text, text=label, state="normal")
+        else:
+            rect = self.canvas.create_rectangle(x0, y0, x1, y1, fill=self.fill, outline="black")
+            text = self.canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2, text=label, font=self.font)
+        self.cells[index] = (rect, text)
+        self.shown[index] = label
+
+    def _label(self, index):
+        page = self.frames[index]
+        return "" if page is None or page < 0 else str(page)
+
+    def _refresh(self, indices):
+        for index in indices:
+            label = self._label(index)
+            if self.shown.get(index) != label:
+                self.canvas.itemconfig(self.cells[index][1], text=label)
+                self.shown[index] = label
+
+    # ----- events -----
+    def _on_scroll(self, *args):
+        self.canvas.xview(*args)
+        self._sync_view()
+
+    def _on_wheel_zoom(self, event):
+        self.set_zoom(self.zoom * (2 if event.delta > 0 else 0.5))
+
+def format_frames(frames, limit=32):
+    # Text form of a frame list for status labels, truncated for big memories
+    shown = ["None" if page is None or page < 0 else str(page) for page in frames[:limit]]
+    if len(frames) > limit:
+        shown.append(f"... ({len(frames)} frames)")
+    return "[" + ", ".join(shown) + "]"
@@ -1,8 +1,17 @@
 # File: frontend/main_ui.py
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-from backend.memory_management import PagingSimulator, SegmentationSimulator, VirtualMemorySimulator
+from tkinter import ttk, messagebox, filedialog
+from backend.memory_management import PagingSimulator, SegmentationSimulator, VirtualMemorySimulator, miss_ratio_curve
+from backend.free_space import FIT_STRATEGIES
+from backend.history import HistoryRecorder
+from backend.policies import available_policies
+from backend.tlb import TLB
+from backend.working_set import WorkingSetAnalyzer
+from backend.trace_io import open_trace
+from frontend.frame_strip import FrameStrip, format_frames
+from frontend.playback import TracePlayer, UNLIMITED
+from frontend.series_chart import SeriesChart
 
 class DynamicMemoryVisualizerApp:
     def __init__(self, master):
@@ -16,7 +25,7 @@ class DynamicMemoryVisualizerApp:
         
         tk.Label(frame_top, text="Select Simulation Type: ").pack(side=tk.LEFT)
         self.sim_type_combo = ttk.Combobox(frame_top, textvariable=self.simulation_type, 
-                                           values=["Paging", "Segmentation"], state="readonly")
+                                           values=["Paging", "Segmentation", "Virtual Memory"], state="readonly")
         self.sim_type_combo.pack(side=tk.LEFT)
         self.sim_type_combo.bind("<<ComboboxSelected>>", self.on_simulation_change)
         
@@ -53,8 +62,12 @@ class DynamicMemoryVisualizerApp:
         self.paging_frame = tk.Frame(self.main_frame)
         # Input: Number of Frames
         # In frontend/main_ui.py inside create_paging_frame()
-        self.canvas = tk.Canvas(self.paging_frame, width=400, height=100, bg="white")
-        self.canvas.grid(row=7, column=0, columnspan=2, pady=5)
+        self.frame_strip = FrameStrip(self.paging_frame, width=400, height=100, fill="lightblue", font=("Arial", 14))
+        self.frame_strip.grid(row=7, column=0, columnspan=2, pady=5)
+        self.canvas = self.frame_strip.canvas
+        # Live working-set size and fault frequency beside the frames
+        self.ws_chart = SeriesChart(self.paging_frame)
+        self.ws_chart.grid(row=7, column=2, padx=5, pady=5)
 
         tk.Label(self.paging_frame, text="Number of Frames:").grid(row=0, column=0, padx=5, pady=5, sticky="e")
         self.frames_entry = tk.Entry(self.paging_frame)
@@ -65,7 +78,7 @@ class DynamicMemoryVisualizerApp:
         tk.Label(self.paging_frame, text="Replacement Algorithm:").grid(row=1, column=0, padx=5, pady=5, sticky="e")
         self.algo_var = tk.StringVar(value="FIFO")
         self.algo_combo = ttk.Combobox(self.paging_frame, textvariable=self.algo_var, 
-                                       values=["FIFO", "LRU"], state="readonly")
+                                       values=available_policies(), state="readonly")
         self.algo_combo.grid(row=1, column=1, padx=5, pady=5)
         
         # Input: Page to Access
@@ -89,32 +102,375 @@ class DynamicMemoryVisualizerApp:
         self.frames_display = tk.Label(self.paging_frame, text="Frames: []")
         self.frames_display.grid(row=6, column=0, columnspan=2, pady=5)
         
+        # Input: Reference string used for whole-trace analysis
+        tk.Label(self.paging_frame, text="Reference String:").grid(row=8, column=0, padx=5, pady=5, sticky="e")
+        self.reference_entry = tk.Entry(self.paging_frame, width=40)
+        self.reference_entry.grid(row=8, column=1, padx=5, pady=5)
+        
+        # Button to plot the LRU miss-ratio curve of the reference string
+        self.mrc_button = tk.Button(self.paging_frame, text="Plot Miss-Ratio Curve", command=self.plot_miss_ratio_curve)
+        self.mrc_button.grid(row=9, column=0, columnspan=2, pady=5)
+        
+        # Trace playback: load a trace file (or use the reference string) and
+        # replay it on a worker thread
+        playback_controls = tk.Frame(self.paging_frame)
+        playback_controls.grid(row=10, column=0, columnspan=2, pady=5)
+        self.load_trace_button = tk.Button(playback_controls, text="Load Trace...", command=self.load_trace)
+        self.load_trace_button.pack(side=tk.LEFT, padx=2)
+        self.play_button = tk.Button(playback_controls, text="Play Trace", command=self.play_trace)
+        self.play_button.pack(side=tk.LEFT, padx=2)
+        self.pause_button = tk.Button(playback_controls, text="Pause", command=self.toggle_pause, state=tk.DISABLED)
+        self.pause_button.pack(side=tk.LEFT, padx=2)
+        self.step_button = tk.Button(playback_controls, text="Step", command=self.step_trace, state=tk.DISABLED)
+        self.step_button.pack(side=tk.LEFT, padx=2)
+        self.stop_button = tk.Button(playback_controls, text="Stop", command=self.stop_trace, state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT, padx=2)
+        
+        # Speed slider: 10^value references per second, rightmost = unlimited
+        self.speed_var = tk.DoubleVar(value=2)
+        self.speed_scale = tk.Scale(self.paging_frame, from_=0, to=7, resolution=0.5, orient=tk.HORIZONTAL,
+                                    variable=self.speed_var, showvalue=False, length=200,
+                                    command=self.on_speed_change)
+        self.speed_scale.grid(row=11, column=1, padx=5, pady=5)
+        self.speed_label = tk.Label(self.paging_frame, text="Speed: 100 refs/s")
+        self.speed_label.grid(row=11, column=0, padx=5, pady=5, sticky="e")
+        
+        self.trace_label = tk.Label(self.paging_frame, text="Trace: reference string")
+        self.trace_label.grid(row=12, column=0, columnspan=2, pady=5)
+        
+        # History scrubber: drag back through recorded steps, Live returns
+        # to the simulator's current state
+        tk.Label(self.paging_frame, text="History:").grid(row=13, column=0, padx=5, pady=5, sticky="e")
+        history_controls = tk.Frame(self.paging_frame)
+        history_controls.grid(row=13, column=1, padx=5, pady=5)
+        self.history_scale = tk.Scale(history_controls, from_=0, to=0, orient=tk.HORIZONTAL, length=200,
+                                      command=self.on_history_scrub, state=tk.DISABLED)
+        self.history_scale.pack(side=tk.LEFT)
+        self.live_button = tk.Button(history_controls, text="Live", command=self.show_live, state=tk.DISABLED)
+        self.live_button.pack(side=tk.LEFT, padx=2)
+        # Recording and the working set are opt-in: with either attached,
+        # playback replays access by access instead of through run_trace
+        self.history_var = tk.BooleanVar(value=False)
+        self.history_check = tk.Checkbutton(history_controls, text="Record", variable=self.history_var,
+                                            command=self.on_analysis_toggle)
+        self.history_check.pack(side=tk.LEFT, padx=2)
+        self.history = None  # HistoryRecorder attached to paging_simulator
+        
+        # Working-set window for the chart, in references
+        tk.Label(self.paging_frame, text="Working-Set Window (τ):").grid(row=14, column=0, padx=5, pady=5, sticky="e")
+        self.tau_entry = tk.Entry(self.paging_frame)
+        self.tau_entry.grid(row=14, column=1, padx=5, pady=5)
+        self.tau_entry.insert(0, "10")
+        self.ws_var = tk.BooleanVar(value=False)
+        self.ws_check = tk.Checkbutton(self.paging_frame, text="Track", variable=self.ws_var,
+                                       command=self.on_analysis_toggle)
+        self.ws_check.grid(row=14, column=2, padx=5, pady=5, sticky="w")
+        self.ws_analyzer = None  # WorkingSetAnalyzer attached to paging_simulator
+        self.review_frames = None  # frames shown while reviewing history
+        
+        self.loaded_trace = None  # pages of a trace loaded from file
+        self.loaded_trace_file = None  # open TraceFile backing a binary trace
+        self.player = None
+        self.playback_frames = None  # UI-side copy of the frames during playback
         self.paging_simulator = None
     
+    def new_paging_simulator(self, num_frames, algo):
+        analyzer = self.new_working_set_analyzer() if self.ws_var.get() else None
+        self.paging_simulator = PagingSimulator(num_frames, algo)
+        self.history = HistoryRecorder(self.paging_simulator) if self.history_var.get() else None
+        self.ws_analyzer = analyzer
+        if analyzer is not None:
+            self.paging_simulator.add_observer(analyzer)
+        self.ws_chart.clear()
+        self.update_history_scale()
+    
+    def on_analysis_toggle(self):
+        # Attaches or detaches the recorder and the analyzer to match the checkboxes
+        if self.paging_simulator is None:
+            return
+        self.show_live()
+        if self.history_var.get() and self.history is None:
+            self.history = HistoryRecorder(self.paging_simulator)
+        elif not self.history_var.get() and self.history is not None:
+            self.history.detach()
+            self.history = None
+        if self.ws_var.get() and self.ws_analyzer is None:
+            try:
+                self.ws_analyzer = self.new_working_set_analyzer()
+            except ValueError as e:
+                self.ws_var.set(False)
+                messagebox.showerror("Error", str(e))
+            else:
+                self.paging_simulator.add_observer(self.ws_analyzer)
+        elif not self.ws_var.get() and self.ws_analyzer is not None:
+            self.paging_simulator.remove_observer(self.ws_analyzer)
+            self.ws_analyzer = None
+            self.ws_chart.clear()
+        self.update_history_scale()
+    
+    def new_working_set_analyzer(self):
+        # One chart sample per tau/10 references: every access for small
+        # windows, fewer points for the large windows used on long traces
+        tau = int(self.tau_entry.get())
+        return WorkingSetAnalyzer(tau, max(tau // 10, 1))
+    
     def access_page(self):
         try:
             num_frames = int(self.frames_entry.get())
             algo = self.algo_var.get()
+            self.show_live()
             # Initialize simulator on first use or when settings change
             if self.paging_simulator is None:
-                self.paging_simulator = PagingSimulator(num_frames, algo)
+                self.new_paging_simulator(num_frames, algo)
+                if self.paging_simulator.policy.needs_future:
+                    # OPT replays the reference string, so accesses must follow it
+                    trace = self.parse_reference_string()
+                    if not trace:
+                        self.paging_simulator = self.history = self.ws_analyzer = None
+                        messagebox.showerror("Error", f"{algo} needs the reference string to look ahead.")
+                        return
+                    self.paging_simulator.prepare(trace)
             page = int(self.page_entry.get())
             fault = self.paging_simulator.access_page(page)
             status = f"Accessed page {page}. "
             status += "Page fault occurred. " if fault else "Page hit. "
             status += f"Total faults: {self.paging_simulator.page_faults}."
             self.paging_status.config(text="Status: " + status)
-            self.frames_display.config(text="Frames: " + str(self.paging_simulator.frames))
+            self.frames_display.config(text="Frames: " + format_frames(self.paging_simulator.frames))
             self.update_canvas()
+            self.update_history_scale()
+            if self.ws_analyzer is not None:
+                self.ws_chart.extend(self.ws_analyzer.take_samples())
         except Exception as e:
             messagebox.showerror("Error", str(e))
     
     def reset_paging(self):
         if self.paging_simulator:
+            self.show_live()
             self.paging_simulator.reset()
+            if self.ws_analyzer is not None:
+                try:
+                    analyzer = self.new_working_set_analyzer()  # picks up a changed window
+                    self.paging_simulator.remove_observer(self.ws_analyzer)
+                    self.paging_simulator.add_observer(analyzer)
+                    self.ws_analyzer = analyzer
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e))
+            self.ws_chart.clear()
             self.paging_status.config(text="Status: Reset done.")
-            self.frames_display.config(text="Frames: " + str(self.paging_simulator.frames))
+            self.frames_display.config(text="Frames: " + format_frames(self.paging_simulator.frames))
             self.update_canvas()
+            self.update_history_scale()
+    
+    # ----------------- History Review -----------------
+    def update_history_scale(self):
+        # Range of the scrubber = steps the recorder still holds
+        if self.history is None:
+            self.history_scale.config(state=tk.DISABLED, from_=0, to=0)
+            return
+        self.history_scale.config(state=tk.NORMAL, from_=self.history.first_step, to=self.history.last_step)
+        if self.review_frames is None:
+            self.history_scale.set(self.history.last_step)
+    
+    def on_history_scrub(self, value):
+        step = int(value)
+        if self.history is None or self.player is not None:
+            return
+        if self.review_frames is None:
+            if step == self.history.last_step:
+                return  # the scale following the live state
+            # Entering review: draw from a list the simulator does not own
+            self.review_frames = self.history.frames_at(step)
+            self.frame_strip.show(self.review_frames)
+            self.live_button.config(state=tk.NORMAL)
+        else:
+            frames = self.history.frames_at(step)
+            changed = {i for i, page in enumerate(frames) if page != self.review_frames[i]}
+            for i in changed:
+                self.review_frames[i] = frames[i]
+            self.frame_strip.show(self.review_frames, changed)
+        text = f"Reviewing step {step}/{self.history.last_step}."
+        if step > self.history.first_step:
+            page, fault, frame, victim = self.history.access_at(step)
+            if not fault:
+                text = f"Accessed page {page}. Page hit. " + text
+            elif victim is None:
+                text = f"Accessed page {page}. Page fault into frame {frame}. " + text
+            else:
+                text = f"Accessed page {page}. Page fault, evicted page {victim} from frame {frame}. " + text
+        self.paging_status.config(text="Status: " + text)
+        self.frames_display.config(text="Frames: " + format_frames(self.review_frames))
+    
+    def show_live(self):
+        if self.review_frames is None:
+            return
+        self.review_frames = None
+        self.live_button.config(state=tk.DISABLED)
+        self.frames_display.config(text="Frames: " + format_frames(self.paging_simulator.frames))
+        self.paging_simulator.take_dirty_frames()
+        self.frame_strip.show(self.paging_simulator.frames)
+        self.update_history_scale()
+    
+    # ----------------- Trace Playback -----------------
+    def load_trace(self):
+        path = filedialog.askopenfilename(title="Load Trace")
+        if not path:
+            return
+        try:
+            self.close_loaded_trace()
+            self.loaded_trace, self.loaded_trace_file = open_trace(path)
+            self.trace_label.config(text=f"Trace: {path} ({len(self.loaded_trace)} references)")
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+    
+    def close_loaded_trace(self):
+        self.loaded_trace = None
+        if self.loaded_trace_file is not None:
+            self.loaded_trace_file.close()
+            self.loaded_trace_file = None
+    
+    def speed(self):
+        value = self.speed_var.get()
+        return UNLIMITED if value >= 7 else int(10 ** value)
+    
+    def on_speed_change(self, value):
+        speed = self.speed()
+        self.speed_label.config(text="Speed: unlimited" if speed == UNLIMITED else f"Speed: {speed} refs/s")
+        if self.player is not None:
+            self.player.set_speed(speed)
+    
+    def play_trace(self):
+        try:
+            trace = self.loaded_trace if self.loaded_trace is not None else self.parse_reference_string()
+            if not len(trace):
+                messagebox.showerror("Error", "Load a trace or enter a reference string first.")
+                return
+            if self.paging_simulator is None:
+                self.new_paging_simulator(int(self.frames_entry.get()), self.algo_var.get())
+            if self.paging_simulator.policy.needs_future:
+                self.paging_simulator.prepare(trace)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        # The worker owns the simulator from here on; the UI draws from a copy
+        self.show_live()
+        self.playback_frames = list(self.paging_simulator.frames)
+        self.paging_simulator.take_dirty_frames()
+        self.frame_strip.show(self.playback_frames)
+        collectors = {}
+        if self.ws_analyzer is not None:
+            collectors["working_set"] = self.ws_analyzer.take_samples
+        self.player = TracePlayer(self.master, self.paging_simulator, "frames", trace,
+                                  self.on_playback_update, self.on_playback_finish, collectors=collectors)
+        self.player.set_speed(self.speed())
+        self.set_playback_controls(playing=True)
+        self.player.start()
+    
+    def on_playback_update(self, changes, status):
+        for frame, page in changes.items():
+            self.playback_frames[frame] = page
+        self.frame_strip.show(self.playback_frames, changes)
+        if "working_set" in status:
+            self.ws_chart.extend(status["working_set"])
+        text = f"Step {status['position']}/{status['total']}. Total faults: {status['faults']}."
+        if status["last"] is not None:
+            page, fault = status["last"]
+            text = f"Accessed page {page}. " + ("Page fault occurred. " if fault else "Page hit. ") + text
+        self.paging_status.config(text="Status: " + text)
+        self.frames_display.config(text="Frames: " + format_frames(self.playback_frames))
+    
+    def on_playback_finish(self, status):
+        self.player = None
+        self.playback_frames = None
+        self.set_playback_controls(playing=False)
+        self.update_canvas()
+        self.update_history_scale()
+        if status["error"]:
+            messagebox.showerror("Error", f"Playback stopped: {status['error']}")
+    
+    def toggle_pause(self):
+        if self.player is None:
+            return
+        if self.player.paused.is_set():
+            self.player.resume()
+            self.pause_button.config(text="Pause")
+            self.step_button.config(state=tk.DISABLED)
+        else:
+            self.player.pause()
+            self.pause_button.config(text="Resume")
+            self.step_button.config(state=tk.NORMAL)
+    
+    def step_trace(self):
+        if self.player is not None:
+            self.player.step()
+    
+    def stop_trace(self):
+        if self.player is not None:
+            self.player.stop()
+    
+    def set_playback_controls(self, playing):
+        # Manual accesses and resets would race the worker thread, and
+        # loading a trace would close the one the worker is reading
+        busy = tk.DISABLED if playing else tk.NORMAL
+        for button in (self.access_button, self.reset_paging_button, self.play_button, self.mrc_button,
+                       self.load_trace_button):
+            button.config(state=busy)
+        idle = tk.NORMAL if playing else tk.DISABLED
+        self.pause_button.config(state=idle, text="Pause")
+        self.stop_button.config(state=idle)
+        self.step_button.config(state=tk.DISABLED)
+        # The worker appends to the history while it runs, and attaching
+        # or detaching sinks mid-replay would race it
+        self.history_scale.config(state=busy if self.history is not None else tk.DISABLED)
+        self.history_check.config(state=busy)
+        self.ws_check.config(state=busy)
+    
+    def parse_reference_string(self):
+        text = self.reference_entry.get().replace(",", " ")
+        return [int(token) for token in text.split()]
+    
+    def plot_miss_ratio_curve(self):
+        try:
+            trace = self.parse_reference_string()
+            if not trace:
+                messagebox.showerror("Error", "Enter a reference string first.")
+                return
+            curve = miss_ratio_curve(trace, "LRU")
+            self.draw_miss_ratio_curve(trace, curve)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+    
+    def draw_miss_ratio_curve(self, trace, curve):
+        window = tk.Toplevel(self.master)
+        window.title("LRU Miss-Ratio Curve")
+        width, height, margin = 480, 300, 40
+        mrc_canvas = tk.Canvas(window, width=width, height=height, bg="white")
+        mrc_canvas.pack(padx=10, pady=10)
+        
+        # Axes: frames on x, faults on y (0..length of the trace)
+        x_min, x_max = margin, width - margin // 2
+        y_min, y_max = height - margin, margin // 2
+        mrc_canvas.create_line(x_min, y_min, x_max, y_min, arrow=tk.LAST)
+        mrc_canvas.create_line(x_min, y_min, x_min, y_max, arrow=tk.LAST)
+        mrc_canvas.create_text((x_min + x_max) / 2, height - 12, text="Frames")
+        mrc_canvas.create_text(14, (y_min + y_max) / 2, text="Faults", angle=90)
+        
+        total = len(trace)
+        x_step = (x_max - x_min - 10) / max(len(curve), 1)
+        points = []
+        for frames, faults in enumerate(curve, 1):
+            x = x_min + frames * x_step
+            y = y_min - (faults / total) * (y_min - y_max - 10)
+            points.extend((x, y))
+            mrc_canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill="blue", outline="blue")
+        if len(points) >= 4:
+            mrc_canvas.create_line(*points, fill="blue", width=2)
+        
+        # Label both ends of the curve
+        mrc_canvas.create_text(x_min + x_step, y_min + 12, text="1")
+        mrc_canvas.create_text(x_min + len(curve) * x_step, y_min + 12, text=str(len(curve)))
+        mrc_canvas.create_text(x_min - 6, y_max + 10, text=str(total), anchor="e")
+        mrc_canvas.create_text(x_min - 6, y_min, text="0", anchor="e")
     
     # ----------------- Segmentation Frame -----------------
     def create_segmentation_frame(self):
@@ -125,71 +481,115 @@ class DynamicMemoryVisualizerApp:
         self.total_memory_entry.grid(row=0, column=1, padx=5, pady=5)
         self.total_memory_entry.insert(0, "100")
         
+        # Input: Fit Strategy
+        tk.Label(self.segmentation_frame, text="Fit Strategy:").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        self.fit_strategy_var = tk.StringVar(value="First Fit")
+        self.fit_strategy_combo = ttk.Combobox(self.segmentation_frame, textvariable=self.fit_strategy_var,
+                                               values=FIT_STRATEGIES, state="readonly")
+        self.fit_strategy_combo.grid(row=1, column=1, padx=5, pady=5)
+        self.fit_strategy_combo.bind("<<ComboboxSelected>>", self.on_fit_strategy_change)
+        
         # Input: Segment Size
-        tk.Label(self.segmentation_frame, text="Segment Size:").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        tk.Label(self.segmentation_frame, text="Segment Size:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
         self.segment_size_entry = tk.Entry(self.segmentation_frame)
-        self.segment_size_entry.grid(row=1, column=1, padx=5, pady=5)
+        self.segment_size_entry.grid(row=2, column=1, padx=5, pady=5)
         
         # Input: Segment Label
-        tk.Label(self.segmentation_frame, text="Segment Label:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
+        tk.Label(self.segmentation_frame, text="Segment Label:").grid(row=3, column=0, padx=5, pady=5, sticky="e")
         self.segment_label_entry = tk.Entry(self.segmentation_frame)
-        self.segment_label_entry.grid(row=2, column=1, padx=5, pady=5)
+        self.segment_label_entry.grid(row=3, column=1, padx=5, pady=5)
         
         # Buttons for allocation and freeing
         self.allocate_segment_button = tk.Button(self.segmentation_frame, text="Allocate Segment", command=self.allocate_segment)
-        self.allocate_segment_button.grid(row=3, column=0, columnspan=2, pady=5)
+        self.allocate_segment_button.grid(row=4, column=0, columnspan=2, pady=5)
         self.free_segment_button = tk.Button(self.segmentation_frame, text="Free Segment", command=self.free_segment)
-        self.free_segment_button.grid(row=4, column=0, columnspan=2, pady=5)
+        self.free_segment_button.grid(row=5, column=0, columnspan=2, pady=5)
         
         # Status display
         self.segmentation_status = tk.Label(self.segmentation_frame, text="Status: ")
-        self.segmentation_status.grid(row=5, column=0, columnspan=2, pady=5)
+        self.segmentation_status.grid(row=6, column=0, columnspan=2, pady=5)
         
         # Display allocated segments
         self.segments_display = tk.Label(self.segmentation_frame, text="Segments: []")
-        self.segments_display.grid(row=6, column=0, columnspan=2, pady=5)
+        self.segments_display.grid(row=7, column=0, columnspan=2, pady=5)
         
         # Add Canvas for graphical visualization of segmentation
         self.seg_canvas = tk.Canvas(self.segmentation_frame, width=400, height=100, bg="white")
-        self.seg_canvas.grid(row=7, column=0, columnspan=2, pady=10)
+        self.seg_canvas.grid(row=8, column=0, columnspan=2, pady=10)
+        # Background rectangle representing the total memory
+        self.seg_canvas.create_rectangle(5, 20, 395, 80, outline="black", fill="lightgrey")
+        self.segment_items = {}  # label -> (rect id, text id) on seg_canvas
         self.segmentation_simulator = None
+        
+        # Fragmentation metrics and compaction
+        self.segmentation_metrics = tk.Label(self.segmentation_frame, text="Free: -  Largest hole: -  Holes: -  Fragmentation: -")
+        self.segmentation_metrics.grid(row=9, column=0, columnspan=2, pady=5)
+        self.compact_button = tk.Button(self.segmentation_frame, text="Compact Memory", command=self.compact_memory)
+        self.compact_button.grid(row=10, column=0, columnspan=2, pady=5)
     
-    def update_segmentation_canvas(self):
-    # Clear the canvas
-        self.seg_canvas.delete("all")
+    def on_fit_strategy_change(self, event):
+        # The strategy only affects future allocations, so it can change at any time
+        if self.segmentation_simulator is not None:
+            self.segmentation_simulator.strategy = self.fit_strategy_var.get()
     
+    def update_segmentation_canvas(self):
+        # Only segments allocated or freed since the last update are touched
         if self.segmentation_simulator is None:
             return
 
         total_memory = self.segmentation_simulator.total_memory
         canvas_width = 400
         canvas_height = 100
+        segment_by_label = self.segmentation_simulator.segment_by_label
 
-    # Draw a background rectangle representing the total memory
-        self.seg_canvas.create_rectangle(5, 20, canvas_width-5, canvas_height-20, outline="black", fill="lightgrey")
-    
-    # Sort segments by their start address to draw in order
-        segments = sorted(self.segmentation_simulator.segments, key=lambda x: x[0])
-    
-        for seg in segments:
+        for label in self.segmentation_simulator.take_dirty_segments():
+            items = self.segment_items.pop(label, None)
+            seg = segment_by_label.get(label)
+            if seg is None:
+                # Segment was freed: remove its rectangle and label
+                if items:
+                    self.seg_canvas.delete(*items)
+                continue
             start, size, label = seg
-        # Calculate x coordinates relative to the total memory
+            # Calculate x coordinates relative to the total memory
             x0 = 5 + (start / total_memory) * (canvas_width - 10)
             x1 = 5 + ((start + size) / total_memory) * (canvas_width - 10)
-        # Draw the segment as a rectangle with a distinct color
-            self.seg_canvas.create_rectangle(x0, 20, x1, canvas_height-20, fill="lightblue", outline="black")
-        # Place the segment's label in the middle of the rectangle
-            self.seg_canvas.create_text((x0+x1)/2, canvas_height/2, text=label, font=("Arial", 12, "bold"))
+            if items:
+                rect, text = items
+                self.seg_canvas.coords(rect, x0, 20, x1, canvas_height-20)
+                self.seg_canvas.coords(text, (x0+x1)/2, canvas_height/2)
+            else:
+                # Draw the segment as a rectangle with its label in the middle
+                rect = self.seg_canvas.create_rectangle(x0, 20, x1, canvas_height-20, fill="lightblue", outline="black")
+                text = self.seg_canvas.create_text((x0+x1)/2, canvas_height/2, text=label, font=("Arial", 12, "bold"))
+            self.segment_items[label] = (rect, text)
+        self.update_segmentation_metrics()
+
+    def update_segmentation_metrics(self):
+        # Read from counters the simulator keeps up to date, no rescan
+        stats = self.segmentation_simulator.fragmentation_stats()
+        self.segmentation_metrics.config(
+            text=f"Free: {stats['free_memory']}  Largest hole: {stats['largest_free_block']}  "
+                 f"Holes: {stats['holes']}  Fragmentation: {stats['external_fragmentation']:.0%}")
 
     def allocate_segment(self):
         try:
             total_memory = int(self.total_memory_entry.get())
             if self.segmentation_simulator is None:
-                self.segmentation_simulator = SegmentationSimulator(total_memory)
+                self.segmentation_simulator = SegmentationSimulator(total_memory, self.fit_strategy_var.get())
             size = int(self.segment_size_entry.get())
             label = self.segment_label_entry.get()
+            if label in self.segmentation_simulator.segment_by_label:
+                self.segmentation_status.config(text=f"Status: Label '{label}' is already in use.")
+                return
             success = self.segmentation_simulator.allocate_segment(size, label)
-            status = f"Segment '{label}' allocated." if success else "Allocation failed. Not enough memory."
+            if success:
+                status = f"Segment '{label}' allocated."
+            else:
+                reason = self.segmentation_simulator.failure_reason(size, label)
+                status = f"Allocation failed: {reason}."
+                if reason == "no free block large enough":
+                    status += " Compacting memory would make room."
             self.segmentation_status.config(text="Status: " + status)
             self.segments_display.config(text="Segments: " + str(self.segmentation_simulator.segments))
             self.update_segmentation_canvas()
@@ -210,51 +610,26 @@ class DynamicMemoryVisualizerApp:
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    def compact_memory(self):
+        if self.segmentation_simulator is None:
+            messagebox.showerror("Error", "No segments allocated yet.")
+            return
+        moved = self.segmentation_simulator.compact()
+        self.segmentation_status.config(text=f"Status: Memory compacted, {moved} bytes moved.")
+        self.segments_display.config(text="Segments: " + str(self.segmentation_simulator.segments))
+        self.update_segmentation_canvas()
+
     def update_vm_canvas(self):
-    # Clear the canvas
-        self.vm_canvas.delete("all")
         if not self.virtual_simulator:
+            self.vm_strip.clear()
             return
-
-    # Retrieve the physical memory state
-        frames = self.virtual_simulator.physical_memory
-        num_frames = len(frames)
-        canvas_width = 400
-        rect_width = canvas_width // num_frames
-
-    # Draw each frame as a colored rectangle
-        for i, vpage in enumerate(frames):
-            x0 = i * rect_width + 5
-            y0 = 20
-            x1 = (i + 1) * rect_width - 5
-            y1 = 100
-            self.vm_canvas.create_rectangle(x0, y0, x1, y1, fill="lightgreen", outline="black")
-        
-        # Show the virtual page number if available
-            display_text = str(vpage) if vpage is not None else ""
-            self.vm_canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2, text=display_text, font=("Arial", 14, "bold"))
+        self.vm_strip.show(self.virtual_simulator.physical_memory, self.virtual_simulator.take_dirty_frames())
 
     def update_canvas(self):
-    # Clear the canvas
-        self.canvas.delete("all")
         if not self.paging_simulator:
+            self.frame_strip.clear()
             return
-
-        frames = self.paging_simulator.frames
-        num_frames = len(frames)
-        canvas_width = 400
-        rect_width = canvas_width // num_frames
-
-        for i, page in enumerate(frames):
-            x0 = i * rect_width + 5
-            y0 = 20
-            x1 = (i + 1) * rect_width - 5
-            y1 = 80
-        # Draw rectangle for each frame
-            self.canvas.create_rectangle(x0, y0, x1, y1, fill="lightblue", outline="black")
-        # Draw text (page number) inside the rectangle
-            display_text = str(page) if page is not None else ""
-            self.canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2, text=display_text, font=("Arial", 14))
+        self.frame_strip.show(self.paging_simulator.frames, self.paging_simulator.take_dirty_frames())
 
     # --------------- Virtual Memory Frame ---------------
     # def create_virtual_memory_frame(self):
@@ -291,26 +666,49 @@ class DynamicMemoryVisualizerApp:
         self.vm_frames_entry.grid(row=0, column=1, padx=5, pady=5)
         self.vm_frames_entry.insert(0, "4")
 
+        # Input: Page-table levels (1 = flat table, 2/3 = lazily allocated radix tree)
+        tk.Label(self.virtual_frame, text="Page Table Levels:").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        self.pt_levels_var = tk.StringVar(value="1")
+        self.pt_levels_combo = ttk.Combobox(self.virtual_frame, textvariable=self.pt_levels_var,
+                                            values=["1", "2", "3"], state="readonly")
+        self.pt_levels_combo.grid(row=1, column=1, padx=5, pady=5)
+
         # Input: Virtual Page to Access
-        tk.Label(self.virtual_frame, text="Virtual Page to Access:").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        tk.Label(self.virtual_frame, text="Virtual Page to Access:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
         self.virtual_page_entry = tk.Entry(self.virtual_frame)
-        self.virtual_page_entry.grid(row=1, column=1, padx=5, pady=5)
+        self.virtual_page_entry.grid(row=2, column=1, padx=5, pady=5)
 
         # Button to access virtual page
         self.vm_access_button = tk.Button(self.virtual_frame, text="Access Virtual Page", command=self.access_virtual_page)
-        self.vm_access_button.grid(row=2, column=0, columnspan=2, pady=5)
+        self.vm_access_button.grid(row=3, column=0, columnspan=2, pady=5)
 
         # Status display
         self.virtual_status = tk.Label(self.virtual_frame, text="Status: ")
-        self.virtual_status.grid(row=3, column=0, columnspan=2, pady=5)
+        self.virtual_status.grid(row=4, column=0, columnspan=2, pady=5)
 
         # Physical memory display (textual)
         self.virtual_display = tk.Label(self.virtual_frame, text="Physical Memory: []")
-        self.virtual_display.grid(row=4, column=0, columnspan=2, pady=5)
+        self.virtual_display.grid(row=5, column=0, columnspan=2, pady=5)
 
         # **New Canvas for Graphical Visualization**
-        self.vm_canvas = tk.Canvas(self.virtual_frame, width=400, height=120, bg="white")
-        self.vm_canvas.grid(row=5, column=0, columnspan=2, pady=10)
+        self.vm_strip = FrameStrip(self.virtual_frame, width=400, height=120, fill="lightgreen", font=("Arial", 14, "bold"))
+        self.vm_strip.grid(row=6, column=0, columnspan=2, pady=10)
+        self.vm_canvas = self.vm_strip.canvas
+
+        # Page-table memory overhead of the current run
+        self.page_table_overhead_label = tk.Label(self.virtual_frame, text="Page Table Overhead: 0 bytes")
+        self.page_table_overhead_label.grid(row=7, column=0, columnspan=2, pady=5)
+
+        # Input: TLB entries (0 disables the TLB); 4-way set associative LRU,
+        # or fully associative when the size is not a multiple of 4
+        tk.Label(self.virtual_frame, text="TLB Entries (0 = none):").grid(row=8, column=0, padx=5, pady=5, sticky="e")
+        self.tlb_entries_entry = tk.Entry(self.virtual_frame)
+        self.tlb_entries_entry.grid(row=8, column=1, padx=5, pady=5)
+        self.tlb_entries_entry.insert(0, "0")
+
+        # TLB hit rate, page walks and effective access time
+        self.tlb_stats_label = tk.Label(self.virtual_frame, text="TLB: off")
+        self.tlb_stats_label.grid(row=9, column=0, columnspan=2, pady=5)
 
         self.virtual_simulator = None
 
@@ -318,14 +716,23 @@ class DynamicMemoryVisualizerApp:
         try:
             num_frames = int(self.vm_frames_entry.get())
             if self.virtual_simulator is None:
-                self.virtual_simulator = VirtualMemorySimulator(num_frames)
+                tlb_entries = int(self.tlb_entries_entry.get())
+                associativity = 4 if tlb_entries % 4 == 0 else tlb_entries
+                tlb = TLB(tlb_entries, associativity) if tlb_entries > 0 else None
+                self.virtual_simulator = VirtualMemorySimulator(num_frames, int(self.pt_levels_var.get()), tlb=tlb)
             vpage = int(self.virtual_page_entry.get())
             fault = self.virtual_simulator.access_virtual_page(vpage)
             status = f"Accessed virtual page {vpage}. "
             status += "Page fault occurred. " if fault else "Page hit. "
             status += f"Total faults: {self.virtual_simulator.page_faults}."
             self.virtual_status.config(text="Status: " + status)
-            self.virtual_display.config(text="Physical Memory: " + str(self.virtual_simulator.physical_memory))
+            self.virtual_display.config(text="Physical Memory: " + format_frames(self.virtual_simulator.physical_memory))
+            overhead = self.virtual_simulator.page_table_overhead()
+            self.page_table_overhead_label.config(text=f"Page Table Overhead: {overhead:,} bytes")
+            stats = self.virtual_simulator.stats()
+            tlb_text = f"TLB hit rate: {stats['tlb_hit_rate']:.1%}, " if "tlb_hit_rate" in stats else "TLB: off, "
+            tlb_text += f"page walks: {stats['page_walks']}, EAT: {stats['effective_access_time_ns']:.1f} ns"
+            self.tlb_stats_label.config(text=tlb_text)
             self.update_vm_canvas()
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -0,0 +1,164 @@
+# File: frontend/playback.py
+
+import queue
+import threading
+import time
+
+UNLIMITED = 0  # speed value meaning "as fast as possible"
+
+# ----------------- Trace Player -----------------
+# Replays a trace through a simulator on a worker thread. The worker never
+# touches Tk: it posts updates holding the frames that changed (frame ->
+# page) to a queue at most `fps` times a second. The UI side drains the
+# queue with master.after at the same capped rate, merges everything that
+# arrived into one redraw and never reads simulator state while the
+# worker is running. `collectors` maps a status key to a callable run on
+# the worker at every post that returns a list (e.g. analyzer samples);
+# the lists from merged posts are concatenated under that key. The last
+# update always has done=True, and error set to the message if the replay
+# raised.
+class TracePlayer:
+    CHUNK = 4096  # references per batch when running unthrottled
+
+    def __init__(self, master, simulator, frames_attr, trace, on_update, on_finish=None, fps=30,
+                 collectors=None):
+        self.master = master
+        self.simulator = simulator
+        self.frames_attr = frames_attr  # "frames" or "physical_memory"
+        self.trace = trace
+        self.on_update = on_update  # on_update(changes, status) on the Tk thread
+        self.on_finish = on_finish
+        self.collectors = collectors or {}
+        self.interval = 1.0 / fps
+        self.updates = queue.Queue()
+        self.speed = UNLIMITED  # references per second
+        self.step_requests = 0
+        self.lock = threading.Lock()
+        self.paused = threading.Event()
+        self.stopped = threading.Event()
+        self.wake = threading.Event()
+        self.finished = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    # ----- controls (Tk thread) -----
+    def start(self):
+        self.thread.start()
+        self.master.after(int(self.interval * 1000), self._drain)
+
+    def set_speed(self, references_per_second):
+        self.speed = references_per_second
+
+    def pause(self):
+        self.paused.set()
+
+    def resume(self):
+        self.paused.clear()
+        self.wake.set()
+
+    def step(self):
+        # Runs exactly one reference; only meaningful while paused
+        with self.lock:
+            self.step_requests += 1
+        self.wake.set()
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+
+    # ----- worker thread -----
+    def _run(self):
+        # Whatever happens, post a final update so the UI stops waiting
+        self.progress = (0, 0, None)  # (position, total, last) after the latest batch
+        error = None
+        try:
+            self._replay()
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        try:
+            self._post(*self.progress, done=True, error=error)
+        except Exception as e:
+            position, total, last = self.progress
+            status = {"position": position, "total": total, "faults": 0, "last": last,
+                      "done": True, "error": error or str(e)}
+            status.update((key, []) for key in self.collectors)
+            self.updates.put(({}, status))
+
+    def _replay(self):
+        simulator = self.simulator
+        trace = self.trace
+        total = len(trace)
+        chunked = hasattr(simulator, "run_trace") and not getattr(
+            getattr(simulator, "policy", None), "needs_future", False)
+        access = getattr(simulator, "access_page", None) or simulator.access_virtual_page
+        position = 0
+        credit = 0.0
+        last_tick = last_post = time.monotonic()
+        last = None  # (page, fault) of the most recent single-stepped reference
+        while position < total and not self.stopped.is_set():
+            if self.paused.is_set():
+                with self.lock:
+                    budget = 1 if self.step_requests else 0
+                    self.step_requests -= budget
+                if not budget:
+                    self.wake.wait(0.05)
+                    self.wake.clear()
+                    last_tick = time.monotonic()
+                    continue
+            elif self.speed == UNLIMITED:
+                budget = self.CHUNK
+            else:
+                # Pace to the requested rate, accumulating fractional credit
+                now = time.monotonic()
+                credit = min(credit + (now - last_tick) * self.speed, self.CHUNK)
+                last_tick = now
+                budget = int(credit)
+                if not budget:
+                    time.sleep(min((1 - credit) / self.speed, self.interval))
+                    continue
+                credit -= budget
+            budget = min(budget, total - position)
+            if chunked and budget > 1:
+                simulator.run_trace(trace[position:position + budget], record=False)
+                last = None
+            else:
+                for page in trace[position:position + budget]:
+                    last = (page, access(page))
+            position += budget
+            self.progress = (position, total, last)
+            now = time.monotonic()
+            if now - last_post >= self.interval or self.paused.is_set() or position == total:
+                self._post(position, total, last)
+                last_post = now
+        self.progress = (position, total, last)
+
+    def _post(self, position, total, last, done=False, error=None):
+        frames = getattr(self.simulator, self.frames_attr)
+        changes = {frame: frames[frame] for frame in self.simulator.take_dirty_frames()}
+        status = {"position": position, "total": total, "faults": self.simulator.page_faults,
+                  "last": last, "done": done, "error": error}
+        for key, collect in self.collectors.items():
+            status[key] = collect()
+        self.updates.put((changes, status))
+
+    # ----- UI side (Tk thread) -----
+    def _drain(self):
+        merged = {}
+        collected = {key: [] for key in self.collectors}
+        status = None
+        try:
+            while True:
+                changes, status = self.updates.get_nowait()
+                merged.update(changes)
+                for key, items in collected.items():
+                    items.extend(status[key])
+        except queue.Empty:
+            pass
+        if status is not None:
+            status.update(collected)
+            self.on_update(merged, status)
+            if status["done"]:
+                self.finished = True
+                if self.on_finish:
+                    self.on_finish(status)
+                return
+        self.master.after(int(self.interval * 1000), self._drain)
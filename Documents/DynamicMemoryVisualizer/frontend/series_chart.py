@@ -0,0 +1,59 @@
+# File: frontend/series_chart.py
+
+import tkinter as tk
+from collections import deque
+
+# ----------------- Working-Set Chart -----------------
+# A live line chart of the last `capacity` working-set samples: W(t, tau)
+# in blue, scaled to the largest value in view, and the page-fault
+# frequency in red on a fixed 0..1 scale. The two lines are persistent
+# canvas items whose coordinates are replaced on each update.
+class SeriesChart(tk.Frame):
+    def __init__(self, master, width=240, height=100, capacity=120):
+        super().__init__(master)
+        self.chart_width = width
+        self.chart_height = height
+        self.points = deque(maxlen=capacity)  # (working_set, fault_rate)
+        self.canvas = tk.Canvas(self, width=width, height=height, bg="white")
+        self.canvas.pack()
+        self.ws_line = self.canvas.create_line(0, 0, 0, 0, fill="blue", width=2, state=tk.HIDDEN)
+        self.pff_line = self.canvas.create_line(0, 0, 0, 0, fill="red", state=tk.HIDDEN)
+        self.scale_text = self.canvas.create_text(4, 4, anchor="nw", font=("Arial", 8), fill="blue")
+        self.label = tk.Label(self, text="W(t, τ): -  PFF: -")
+        self.label.pack()
+
+    def extend(self, samples):
+        # samples: WorkingSetAnalyzer tuples (time, W, peak, mean, faults, rate)
+        if not samples:
+            return
+        for sample in samples:
+            self.points.append((sample[1], sample[5]))
+        self._redraw()
+        last = samples[-1]
+        self.label.config(text=f"W(t, τ): {last[1]}  PFF: {last[5]:.2f}  (t = {last[0]})")
+
+    def clear(self):
+        self.points.clear()
+        self.canvas.itemconfig(self.ws_line, state=tk.HIDDEN)
+        self.canvas.itemconfig(self.pff_line, state=tk.HIDDEN)
+        self.canvas.itemconfig(self.scale_text, text="")
+        self.label.config(text="W(t, τ): -  PFF: -")
+
+    def _redraw(self):
+        if len(self.points) < 2:
+            return
+        width, height, margin = self.chart_width, self.chart_height, 6
+        top_ws = max(ws for ws, _ in self.points) or 1
+        step = (width - 2 * margin) / (self.points.maxlen - 1)
+        usable = height - 2 * margin
+        ws_coords = []
+        pff_coords = []
+        for i, (ws, rate) in enumerate(self.points):
+            x = margin + i * step
+            ws_coords.extend((x, height - margin - usable * ws / top_ws))
+            pff_coords.extend((x, height - margin - usable * rate))
+        self.canvas.coords(self.ws_line, *ws_coords)
+        self.canvas.coords(self.pff_line, *pff_coords)
+        self.canvas.itemconfig(self.ws_line, state=tk.NORMAL)
+        self.canvas.itemconfig(self.pff_line, state=tk.NORMAL)
+        self.canvas.itemconfig(self.scale_text, text=f"max W = {top_ws}")
@@ -0,0 +1,197 @@
+# Brute-force reference models the simulators are checked against. Each is
+# written for clarity, scanning whole lists where the simulators index;
+# they return one fault flag per reference.
+
+from collections import OrderedDict, deque
+
+
+class BaselinePagingSimulator:
+    # The original list-scanning FIFO/LRU PagingSimulator
+    def __init__(self, num_frames, replacement_algo):
+        self.frames = [None] * num_frames
+        self.page_faults = 0
+        self.replacement_algo = replacement_algo
+        self.queue = deque()
+        self.lru_order = OrderedDict()
+
+    def access_page(self, page):
+        if page in self.frames:
+            if self.replacement_algo == "LRU":
+                self.lru_order.move_to_end(page)
+            return False
+        self.page_faults += 1
+        if None in self.frames:
+            index = self.frames.index(None)
+        elif self.replacement_algo == "FIFO":
+            index = self.queue.popleft()
+        else:
+            _, index = self.lru_order.popitem(last=False)
+        self.frames[index] = page
+        self.queue.append(index)
+        self.lru_order[page] = index
+        return True
+
+
+def baseline_faults(trace, num_frames, algo):
+    simulator = BaselinePagingSimulator(num_frames, algo)
+    return [simulator.access_page(page) for page in trace]
+
+
+def opt_faults(trace, num_frames):
+    # Belady: evict the resident page used furthest in the future
+    resident, flags = set(), []
+    for i, page in enumerate(trace):
+        if page in resident:
+            flags.append(False)
+            continue
+        flags.append(True)
+        if len(resident) == num_frames:
+            def next_use(p):
+                for j in range(i + 1, len(trace)):
+                    if trace[j] == p:
+                        return j
+                return len(trace)
+            resident.remove(max(resident, key=next_use))
+        resident.add(page)
+    return flags
+
+
+def clock_faults(trace, num_frames):
+    # Second chance: frames are filled in index order; on a miss the hand
+    # clears reference bits until it finds a clear one
+    frames = [None] * num_frames
+    bits = [0] * num_frames
+    hand, flags = 0, []
+    for page in trace:
+        if page in frames:
+            bits[frames.index(page)] = 1
+            flags.append(False)
+            continue
+        flags.append(True)
+        if None in frames:
+            index = frames.index(None)
+        else:
+            while bits[hand]:
+                bits[hand] = 0
+                hand = (hand + 1) % num_frames
+            index = hand
+            hand = (hand + 1) % num_frames
+        frames[index] = page
+        bits[index] = 1
+    return flags
+
+
+def lfu_faults(trace, num_frames):
+    # Fewest references since loaded; ties go to the least recently used
+    count, last_used, flags = {}, {}, []
+    for t, page in enumerate(trace):
+        if page in count:
+            count[page] += 1
+            flags.append(False)
+        else:
+            flags.append(True)
+            if len(count) == num_frames:
+                victim = min(count, key=lambda p: (count[p], last_used[p]))
+                del count[victim]
+            count[page] = 1
+        last_used[page] = t
+    return flags
+
+
+def arc_faults(trace, c):
+    # ARC as in Megiddo & Modha, Fig. 4, with lists kept LRU first. REPLACE
+    # falls back to T1 when T2 is empty.
+    t1, t2, b1, b2 = [], [], [], []
+    p = 0.0
+    flags = []
+
+    def replace(page):
+        if t1 and (len(t1) > p or (page in b2 and len(t1) == p) or not t2):
+            b1.append(t1.pop(0))
+        else:
+            b2.append(t2.pop(0))
+
+    for page in trace:
+        if page in t1 or page in t2:
+            (t1 if page in t1 else t2).remove(page)
+            t2.append(page)
+            flags.append(False)
+            continue
+        flags.append(True)
+        if page in b1:
+            p = min(c, p + max(len(b2) / len(b1), 1))
+            replace(page)
+            b1.remove(page)
+            t2.append(page)
+        elif page in b2:
+            p = max(0, p - max(len(b1) / len(b2), 1))
+            replace(page)
+            b2.remove(page)
+            t2.append(page)
+        else:
+            if len(t1) + len(b1) == c:
+                if len(t1) < c:
+                    b1.pop(0)
+                    replace(page)
+                else:
+                    t1.pop(0)
+            elif len(t1) + len(t2) + len(b1) + len(b2) >= c:
+                if len(t1) + len(t2) + len(b1) + len(b2) == 2 * c:
+                    b2.pop(0)
+                replace(page)
+            t1.append(page)
+    return flags
+
+
+REFERENCE_FAULTS = {
+    "OPT": opt_faults,
+    "Clock": clock_faults,
+    "LFU": lfu_faults,
+    "ARC": arc_faults,
+}
+
+
+class HoleScanAllocator:
+    # Segment allocation by rescanning the sorted segment list for holes.
+    # First Fit takes the lowest hole that fits, Best Fit the smallest (lowest
+    # address on ties), Worst Fit the largest (highest address on ties), and
+    # Next Fit the hole holding the end of the previous allocation, else the
+    # first fitting hole above it, else the first fitting hole.
+    def __init__(self, total_memory, strategy):
+        self.total_memory = total_memory
+        self.strategy = strategy
+        self.segments = {}  # label -> (start, size)
+        self.cursor = 0
+
+    def holes(self):
+        holes, position = [], 0
+        for start, size in sorted(self.segments.values()):
+            if start > position:
+                holes.append((position, start - position))
+            position = start + size
+        if position < self.total_memory:
+            holes.append((position, self.total_memory - position))
+        return holes
+
+    def allocate(self, size, label):
+        if label in self.segments or size <= 0:
+            return False
+        fitting = [(start, hole) for start, hole in self.holes() if hole >= size]
+        if not fitting:
+            return False
+        if self.strategy == "First Fit":
+            start = fitting[0][0]
+        elif self.strategy == "Best Fit":
+            start = min(fitting, key=lambda h: (h[1], h[0]))[0]
+        elif self.strategy == "Worst Fit":
+            start = max(fitting, key=lambda h: (h[1], h[0]))[0]
+        else:
+            here = [h for h in fitting if h[0] <= self.cursor < h[0] + h[1]]
+            above = [h for h in fitting if h[0] >= self.cursor]
+            start = (here or above or fitting)[0][0]
+        self.segments[label] = (start, size)
+        self.cursor = start + size
+        return True
+
+    def free(self, label):
+        return self.segments.pop(label, None) is not None
@@ -0,0 +1,101 @@
+import json
+import random
+
+from backend.cli import main
+from backend.trace_io import write_trace
+
+
+def make_trace(tmp_path, length=2000, pages=40, seed=0, pids=None):
+    rng = random.Random(seed)
+    path = tmp_path / "trace.bin"
+    write_trace(str(path), [rng.randrange(pages) for _ in range(length)], pids)
+    return str(path)
+
+
+def run_json(capsys, *argv):
+    assert main([*argv, "--json"]) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_paging_opt_on_binary_trace(tmp_path, capsys):
+    # OPT keeps the trace it was prepared with; the mapped file must still close
+    trace = make_trace(tmp_path)
+    opt = run_json(capsys, "paging", trace, "--frames", "8", "--policy", "OPT")
+    lru = run_json(capsys, "paging", trace, "--frames", "8", "--policy", "LRU")
+    assert opt["accesses"] == 2000
+    assert opt["page_faults"] <= lru["page_faults"]
+
+
+def test_virtual_on_binary_trace_matches_paging_fifo(tmp_path, capsys):
+    trace = make_trace(tmp_path)
+    fifo = run_json(capsys, "paging", trace, "--frames", "8", "--policy", "FIFO")
+    for extra in ([], ["--levels", "2", "--tlb-entries", "4"], ["--compact", "--num-pages", "40"]):
+        stats = run_json(capsys, "virtual", trace, "--frames", "8", *extra)
+        assert stats["page_faults"] == fifo["page_faults"]
+
+
+def test_mrc_on_binary_trace(tmp_path, capsys):
+    trace = make_trace(tmp_path)
+    curve = run_json(capsys, "mrc", trace, "--max-frames", "12")["faults"]
+    assert curve == [run_json(capsys, "paging", trace, "--frames", str(k), "--policy", "LRU")["page_faults"]
+                     for k in range(1, 13)]
+
+
+def test_multi_trace_scheduler_with_large_pids(tmp_path, capsys):
+    pids = [(40000, 4294967295, 7)[i % 3] for i in range(2000)]
+    trace = make_trace(tmp_path, pids=pids)
+    for scope in ("global", "local"):
+        stats = run_json(capsys, "multi", trace, "--frames", "9", "--scope", scope, "--scheduler", "trace")
+        assert stats["accesses"] == 2000
+        assert set(stats["processes"]) == {"40000", "4294967295", "7"}
+        assert sum(p["faults"] for p in stats["processes"].values()) == stats["page_faults"]
+
+
+def test_sweep_on_binary_trace(tmp_path, capsys):
+    trace = make_trace(tmp_path)
+    output = tmp_path / "sweep.json"
+    assert main(["sweep", trace, "--frames", "4,8", "--policies", "FIFO,LRU", "--simulators", "paging,virtual",
+                 "--workers", "1", "-o", str(output)]) == 0
+    rows = {(row["simulator"], row["frames"], row["policy"]): row["page_faults"]
+            for row in json.loads(output.read_text())}
+    assert len(rows) == 6
+    for frames in (4, 8):
+        for policy in ("FIFO", "LRU"):
+            paging = run_json(capsys, "paging", trace, "--frames", str(frames), "--policy", policy)
+            assert rows["paging", frames, policy] == paging["page_faults"]
+        assert rows["virtual", frames, "FIFO"] == rows["paging", frames, "FIFO"]
+
+
+def test_replay_errors_on_binary_traces_are_reported(tmp_path, capsys):
+    # The traceback must not keep the mapped trace from closing
+    path = str(tmp_path / "bad.bin")
+    write_trace(path, [1, 2, 3, 50, 4, 1 << 50], [1, 2, 1, 2, 1, 2])
+    for argv in (["paging", path, "--frames", "2", "--compact", "--num-pages", "10"],
+                 ["virtual", path, "--frames", "2", "--levels", "2"],
+                 ["virtual", path, "--frames", "2", "--levels", "2", "--tlb-entries", "2"],
+                 ["multi", path, "--frames", "2", "--scheduler", "trace"],
+                 ["multi", path, "--frames", "2"]):
+        assert main(argv) == 1, argv
+        assert capsys.readouterr().err.startswith("error: "), argv
+
+
+def test_delegated_command_errors_are_reported(tmp_path, capsys):
+    trace = make_trace(tmp_path)
+    text = tmp_path / "pages.txt"
+    text.write_text("1 2 3\n")
+    for argv in (["sweep", trace, "--frames", "0"],
+                 ["sweep", trace, "--frames", "2", "--policies", "BOGUS"],
+                 ["trace", "info", str(text)]):
+        assert main(argv) == 1, argv
+        assert capsys.readouterr().err.startswith("error: "), argv
+
+
+def test_rejected_sweep_keeps_existing_results(tmp_path, capsys):
+    trace = make_trace(tmp_path)
+    output = tmp_path / "results.csv"
+    output.write_text("earlier results\n")
+    for argv in (["--policies", "BOGUS"], ["--simulators", "bogus"], ["--frames", "0"]):
+        args = ["sweep", trace, "--frames", "4", "--workers", "1", "-o", str(output), *argv]
+        assert main(args) == 1, argv
+        assert capsys.readouterr().err.startswith("error: "), argv
+        assert output.read_text() == "earlier results\n"
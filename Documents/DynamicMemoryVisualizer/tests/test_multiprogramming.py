@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from backend.memory_management import NO_PAGE, PagingSimulator
+from backend.multiprogramming import NO_PID, MultiprogrammedSimulator, round_robin, trace_schedule
+
+
+def test_single_process_matches_paging_simulator():
+    rng = random.Random(0)
+    trace = [rng.randrange(30) for _ in range(2000)]
+    for algo in ("FIFO", "LRU", "Clock"):
+        expected = PagingSimulator(7, algo).run_trace(trace)
+        for scope in ("global", "local"):
+            simulator = MultiprogrammedSimulator(7, algo, scope, quotas={5: 7}, page_table_levels=2, vpn_bits=12)
+            result = simulator.run(round_robin({5: trace}), record=True)
+            assert list(result.fault_flags) == list(expected.fault_flags)
+            assert list(result.evicted) == list(expected.evicted)
+
+
+def test_evicted_pids_mark_no_victim_apart_from_real_pids():
+    simulator = MultiprogrammedSimulator(2, "FIFO")
+    result = simulator.run(trace_schedule([1, 2, 3, 1], [-1, -1, 4294967295, -1]), record=True)
+    assert list(result.evicted) == [NO_PAGE, NO_PAGE, 1, 2]
+    assert list(result.details["evicted_pids"]) == [NO_PID, NO_PID, -1, -1]
+
+
+@pytest.mark.parametrize("scope", ["global", "local"])
+def test_out_of_range_vpage_changes_nothing(scope):
+    simulator = MultiprogrammedSimulator(4, "LRU", scope, default_quota=2, page_table_levels=2, vpn_bits=12)
+    simulator.access(1, 5)
+    for vpage in (-1, 1 << 12, 1 << 47):
+        with pytest.raises(ValueError):
+            simulator.access(2, vpage)
+    assert list(simulator.processes) == [1]
+    assert (simulator.accesses, simulator.page_faults, simulator.context_switches) == (1, 1, 1)
+    assert simulator.assigned == (2 if scope == "local" else 0)
+    assert simulator.access(1, 5) == (False, None)
@@ -0,0 +1,203 @@
+import random
+
+import pytest
+
+from backend.history import HistoryRecorder
+from backend.instrumentation import EventCounter
+from backend.memory_management import (CompactPagingSimulator, CompactVirtualMemorySimulator, PagingSimulator,
+                                       VirtualMemorySimulator, miss_ratio_curve)
+from backend.page_tables import MultiLevelPageTable
+from backend.tlb import TLB
+from tests.reference import REFERENCE_FAULTS, baseline_faults
+
+
+def random_trace(length=1500, pages=24, seed=0):
+    rng = random.Random(seed)
+    return [rng.randrange(pages) for _ in range(length)]
+
+
+def looping_trace(length=600, pages=9):
+    return [i % pages for i in range(length)]
+
+
+TRACES = [random_trace(seed=1), random_trace(pages=60, seed=2), looping_trace()]
+FRAME_COUNTS = [1, 3, 8]
+
+
+def replays(algo, frames, trace):
+    # Fault flags from every way of driving a paging simulator
+    yield "run_trace", list(PagingSimulator(frames, algo).run_trace(trace).fault_flags)
+    simulator = PagingSimulator(frames, algo)
+    simulator.prepare(trace)
+    yield "access_page", [simulator.access_page(page) for page in trace]
+    observed = PagingSimulator(frames, algo)
+    observed.add_observer(EventCounter())
+    yield "observed", list(observed.run_trace(trace).fault_flags)
+    compact = CompactPagingSimulator(frames, algo, num_pages=100)
+    yield "compact", list(compact.run_trace(trace).fault_flags)
+
+
+@pytest.mark.parametrize("algo", ["FIFO", "LRU"])
+@pytest.mark.parametrize("frames", FRAME_COUNTS)
+@pytest.mark.parametrize("trace", TRACES)
+def test_fifo_lru_match_baseline_simulator(algo, frames, trace):
+    expected = baseline_faults(trace, frames, algo)
+    for path, flags in replays(algo, frames, trace):
+        assert [bool(f) for f in flags] == expected, path
+
+
+@pytest.mark.parametrize("algo", sorted(REFERENCE_FAULTS))
+@pytest.mark.parametrize("frames", FRAME_COUNTS)
+@pytest.mark.parametrize("trace", TRACES)
+def test_policies_match_reference(algo, frames, trace):
+    expected = REFERENCE_FAULTS[algo](trace, frames)
+    for path, flags in replays(algo, frames, trace):
+        assert [bool(f) for f in flags] == expected, path
+
+
+def test_opt_never_loses_to_other_policies():
+    trace = random_trace(seed=3)
+    opt = PagingSimulator(6, "OPT").run_trace(trace).page_faults
+    for algo in ("FIFO", "LRU", "Clock", "LFU", "ARC"):
+        assert opt <= PagingSimulator(6, algo).run_trace(trace).page_faults
+
+
+@pytest.mark.parametrize("trace", TRACES)
+def test_miss_ratio_curve_matches_lru_replay(trace):
+    curve = miss_ratio_curve(trace, "LRU", 30)
+    assert curve == [PagingSimulator(k, "LRU").run_trace(trace, record=False).page_faults
+                     for k in range(1, 31)]
+
+
+@pytest.mark.parametrize("levels", [1, 2, 3])
+@pytest.mark.parametrize("tlb", [None, 4])
+def test_virtual_memory_matches_fifo_baseline(levels, tlb):
+    trace = random_trace(seed=4)
+    expected = baseline_faults(trace, 5, "FIFO")
+    for cls in (VirtualMemorySimulator, CompactVirtualMemorySimulator):
+        simulator = cls(5, levels, tlb=TLB(tlb, tlb) if tlb else None)
+        assert [bool(f) for f in simulator.run_trace(trace).fault_flags] == expected
+        stepped = cls(5, levels, tlb=TLB(tlb, tlb) if tlb else None)
+        assert [stepped.access_virtual_page(page) for page in trace] == expected
+
+
+def test_multi_level_page_table_maps_like_a_dict():
+    table, mapping = MultiLevelPageTable(3, 12), {}
+    rng = random.Random(5)
+    for _ in range(2000):
+        vpage = rng.randrange(1 << 12)
+        if vpage in mapping and rng.random() < 0.5:
+            del table[vpage], mapping[vpage]
+        else:
+            table[vpage] = mapping[vpage] = rng.randrange(100)
+    assert len(table) == len(mapping)
+    assert all(table.get(vpage) == mapping.get(vpage) for vpage in range(1 << 12))
+
+
+# ----- invalid input leaves the simulator unchanged -----
+def test_compact_paging_rejects_out_of_range_page_without_side_effects():
+    simulator = CompactPagingSimulator(2, "FIFO", num_pages=10)
+    simulator.access_page(1)
+    simulator.access_page(2)
+    with pytest.raises(ValueError):
+        simulator.access_page(50)
+    assert list(simulator.frames) == [1, 2] and simulator.page_faults == 2
+    assert [simulator.access_page(page) for page in (3, 4, 1)] == [True, True, True]
+    assert sorted(simulator.frames) == [1, 4]
+
+
+def test_compact_virtual_memory_rejects_out_of_range_page_without_side_effects():
+    simulator = CompactVirtualMemorySimulator(2, num_pages=10)
+    for page in (1, 2):
+        simulator.access_virtual_page(page)
+    with pytest.raises(ValueError):
+        simulator.access_virtual_page(50)
+    assert (simulator.accesses, simulator.page_faults) == (2, 2)
+    assert [simulator.access_virtual_page(page) for page in (3, 4, 1)] == [True, True, True]
+
+
+def test_opt_rejects_unexpected_page_before_loading_it():
+    simulator = PagingSimulator(3, "OPT")
+    simulator.prepare([1, 2, 3, 4, 1, 2])
+    simulator.access_page(1)
+    with pytest.raises(ValueError):
+        simulator.access_page(9)
+    assert simulator.frames == [1, None, None] and simulator.page_faults == 1
+    for page in (2, 3, 4, 1, 2):
+        simulator.access_page(page)
+    assert simulator.page_faults == 4
+
+
+def test_run_trace_counts_completed_references_when_one_raises():
+    simulator = VirtualMemorySimulator(4, page_table_levels=2, va_bits=20, tlb=TLB(4, 4))
+    with pytest.raises(ValueError):
+        simulator.run_trace([1, 2, 1, 3, 1 << 30])
+    assert simulator.physical_memory == [1, 2, 3, None]
+    assert (simulator.accesses, simulator.page_faults, simulator.page_walks) == (4, 3, 3)
+    assert (simulator.tlb.hits, simulator.tlb.misses) == (1, 3)
+
+
+# ----- history -----
+def test_history_matches_stepwise_frames():
+    simulator = PagingSimulator(5, "LRU")
+    history = HistoryRecorder(simulator, interval=3, max_steps=600)
+    states = [list(simulator.frames)]
+    for page in random_trace(length=300, pages=12, seed=6):
+        simulator.access_page(page)
+        states.append(list(simulator.frames))
+    for step in range(history.first_step, history.last_step + 1):
+        assert history.frames_at(step) == states[step]
+
+
+def test_history_checkpoints_stay_small_per_step():
+    simulator = PagingSimulator(5000, "FIFO")
+    history = HistoryRecorder(simulator, interval=64)
+    simulator.run_trace(random_trace(length=50_000, pages=15_000, seed=7), record=False)
+    assert history.memory_bytes() / history.last_step < 32
+
+
+@pytest.mark.parametrize("algo", ["FIFO", "LRU", "Clock"])
+def test_compact_dirty_frames_match_regular_simulator(algo):
+    trace = random_trace(length=400, seed=8)
+    regular, compact = PagingSimulator(6, algo), CompactPagingSimulator(6, algo, num_pages=24)
+    for start in range(0, len(trace), 50):
+        chunk = trace[start:start + 50]
+        regular.run_trace(chunk, record=False)
+        compact.run_trace(chunk, record=False)
+        assert compact.take_dirty_frames() == regular.take_dirty_frames()
+        assert list(compact.frames) == regular.frames
+    assert compact.take_dirty_frames() == set()
+    virtual, compact_virtual = VirtualMemorySimulator(6), CompactVirtualMemorySimulator(6, num_pages=24)
+    for page in trace[:60]:
+        virtual.access_virtual_page(page)
+        compact_virtual.access_virtual_page(page)
+        assert compact_virtual.take_dirty_frames() == virtual.take_dirty_frames()
+
+
+@pytest.mark.parametrize("cls", [VirtualMemorySimulator, CompactVirtualMemorySimulator])
+@pytest.mark.parametrize("observe", [False, True])
+def test_virtual_memory_rejects_out_of_range_page_without_side_effects(cls, observe):
+    simulator = cls(2, page_table_levels=2, va_bits=20, tlb=TLB(2, 2))
+    if observe:
+        simulator.add_observer(EventCounter())
+    for page in (1, 2, 3, 1):
+        simulator.access_virtual_page(page)
+    before = (simulator.accesses, simulator.page_faults, simulator.page_walks, simulator.tlb.hits,
+              simulator.tlb.misses, list(simulator.physical_memory))
+    with pytest.raises(ValueError):
+        simulator.access_virtual_page(1 << 8)
+    with pytest.raises(ValueError):
+        simulator.load_virtual_page(1 << 8)
+    assert (simulator.accesses, simulator.page_faults, simulator.page_walks, simulator.tlb.hits,
+            simulator.tlb.misses, list(simulator.physical_memory)) == before
+
+
+def test_page_table_overhead_compares_table_layouts():
+    overheads = []
+    for levels in (1, 2, 3):
+        simulator = VirtualMemorySimulator(4, levels)
+        simulator.access_virtual_page(5)
+        overheads.append(simulator.page_table_overhead())
+    # A linear table covers the whole 36-bit page space; sparse use favours more levels
+    assert overheads[0] == (1 << 36) * 8
+    assert overheads[0] > overheads[1] > overheads[2]
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from backend.free_space import FIT_STRATEGIES
+from backend.memory_management import SegmentationSimulator
+from tests.reference import HoleScanAllocator
+
+
+def churn(seed, operations=400, max_size=60):
+    rng = random.Random(seed)
+    live = []
+    for i in range(operations):
+        if live and rng.random() < 0.45:
+            yield "free", live.pop(rng.randrange(len(live))), 0
+        else:
+            label = f"s{i}"
+            live.append(label)
+            yield "alloc", label, rng.randrange(1, max_size)
+
+
+@pytest.mark.parametrize("strategy", FIT_STRATEGIES)
+@pytest.mark.parametrize("seed", range(5))
+def test_fit_strategies_match_hole_scan(strategy, seed):
+    simulator = SegmentationSimulator(1000, strategy)
+    reference = HoleScanAllocator(1000, strategy)
+    for op, label, size in churn(seed):
+        if op == "alloc":
+            assert simulator.allocate_segment(size, label) == reference.allocate(size, label)
+        else:
+            assert simulator.free_segment(label) == reference.free(label)
+        assert {label: seg[:2] for label, seg in simulator.segment_by_label.items()} == reference.segments
+        holes = reference.holes()
+        assert simulator.free_space.extents() == holes
+        assert simulator.hole_count == len(holes)
+        assert simulator.largest_free_block == max((size for _, size in holes), default=0)
+
+
+def test_failure_reasons():
+    simulator = SegmentationSimulator(100)
+    for i in range(10):
+        simulator.allocate_segment(10, i)
+    for i in range(0, 10, 2):
+        simulator.free_segment(i)
+    assert simulator.external_fragmentation == pytest.approx(0.8)
+    assert simulator.failure_reason(20, "x") == "no free block large enough"
+    assert simulator.failure_reason(60, "x") == "insufficient free memory"
+    assert simulator.failure_reason(0, "x") == "invalid size"
+    assert simulator.failure_reason(5, 1) == "duplicate label"
+    assert simulator.failure_reason(5, "x") is None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_compact_moves_fewest_bytes_and_leaves_one_hole(seed):
+    simulator = SegmentationSimulator(1000)
+    for op, label, size in churn(seed, operations=80, max_size=120):
+        if op == "alloc":
+            simulator.allocate_segment(size, label)
+        else:
+            simulator.free_segment(label)
+    before = sorted(simulator.segment_by_label.values())
+    # Cheapest order-preserving split: a prefix slides down, the rest slides up
+    best = None
+    for k in range(len(before) + 1):
+        cost, address = 0, 0
+        for start, size, _ in before[:k]:
+            cost += size if start != address else 0
+            address += size
+        address = 1000
+        for start, size, _ in reversed(before[k:]):
+            address -= size
+            cost += size if start != address else 0
+        best = cost if best is None else min(best, cost)
+    assert simulator.compact() == best
+    assert simulator.hole_count == (1 if simulator.free_memory else 0)
+    assert simulator.largest_free_block == simulator.free_memory
+    assert simulator.external_fragmentation == 0.0
+    assert [seg[2] for seg in sorted(simulator.segment_by_label.values())] == [seg[2] for seg in before]
+    assert simulator.compact() == 0
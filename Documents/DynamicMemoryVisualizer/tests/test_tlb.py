@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from backend.memory_management import CompactVirtualMemorySimulator, VirtualMemorySimulator
+from backend.tlb import TLB
+
+
+class ReferenceTLB:
+    # Set-associative LRU as lists of vpages, most recent last
+    def __init__(self, size, associativity):
+        self.num_sets = size // associativity
+        self.ways = associativity
+        self.sets = [[] for _ in range(self.num_sets)]
+
+    def access(self, vpage):
+        entries = self.sets[vpage % self.num_sets]
+        hit = vpage in entries
+        if hit:
+            entries.remove(vpage)
+        elif len(entries) == self.ways:
+            entries.pop(0)
+        entries.append(vpage)
+        return hit
+
+
+def test_hit_and_miss_counting():
+    tlb = TLB(4, 2)
+    assert tlb.lookup(1) is None
+    tlb.insert(1, 10)
+    assert tlb.lookup(1) == 10
+    assert tlb.lookup(3) is None
+    assert (tlb.hits, tlb.misses, tlb.hit_rate) == (1, 2, pytest.approx(1 / 3))
+    tlb.reset()
+    assert tlb.lookup(1) is None
+    assert (tlb.hits, tlb.misses, tlb.flushes) == (0, 1, 0)
+
+
+@pytest.mark.parametrize("size,associativity", [(8, 1), (8, 4), (8, 8)])
+def test_lru_matches_reference(size, associativity):
+    rng = random.Random(0)
+    tlb, reference = TLB(size, associativity), ReferenceTLB(size, associativity)
+    for _ in range(3000):
+        vpage = rng.randrange(24)
+        hit = tlb.lookup(vpage) is not None
+        if not hit:
+            tlb.insert(vpage, vpage + 100)
+        assert hit == reference.access(vpage)
+    assert [list(entries) for entries in tlb.sets] == reference.sets
+
+
+def test_random_replacement_stays_consistent():
+    tlb = TLB(8, 4, "Random", seed=1)
+    rng = random.Random(2)
+    for _ in range(3000):
+        vpage = rng.randrange(40)
+        if rng.random() < 0.1:
+            tlb.invalidate(vpage)
+        elif tlb.lookup(vpage) is None:
+            tlb.insert(vpage, vpage + 100)
+        for set_index, entries in enumerate(tlb.sets):
+            keys = tlb.set_keys[set_index]
+            assert len(entries) <= 4 and sorted(keys) == sorted(entries)
+            assert all(frame == vpage + 100 for vpage, frame in entries.items())
+    # The seed fixes the victims
+    runs = []
+    for _ in range(2):
+        tlb = TLB(8, 8, "Random", seed=3)
+        for vpage in range(100):
+            tlb.insert(vpage, vpage)
+        runs.append(sorted(tlb.sets[0]))
+    assert runs[0] == runs[1]
+
+
+@pytest.mark.parametrize("cls", [VirtualMemorySimulator, CompactVirtualMemorySimulator])
+def test_evicted_translation_is_invalidated(cls):
+    simulator = cls(2, tlb=TLB(4, 4))
+    for vpage in (1, 2, 3):  # 3 evicts 1 and takes its frame
+        simulator.access_virtual_page(vpage)
+    assert simulator.tlb.lookup(1) is None
+    assert simulator.access_virtual_page(1) is True
+    assert simulator.tlb.lookup(1) == simulator.page_table[1]
+
+
+@pytest.mark.parametrize("replacement", ["LRU", "Random"])
+@pytest.mark.parametrize("associativity", [1, 4, 16])
+def test_run_trace_matches_per_call_path(replacement, associativity):
+    rng = random.Random(4)
+    trace = [rng.randrange(60) for _ in range(3000)]
+    results = []
+    for bulk in (True, False):
+        simulator = VirtualMemorySimulator(20, tlb=TLB(16, associativity, replacement, seed=5))
+        if bulk:
+            flags = list(simulator.run_trace(trace).fault_flags)
+        else:
+            flags = [int(simulator.access_virtual_page(page)) for page in trace]
+        results.append((flags, simulator.page_walks, simulator.tlb.hits, simulator.tlb.misses,
+                        [dict(entries) for entries in simulator.tlb.sets]))
+    assert results[0] == results[1]
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from backend.trace_io import READ, WRITE, TraceFile, TraceWriter, convert_address_log, open_trace, write_trace
+
+
+@pytest.mark.parametrize("page_width", [4, 8])
+@pytest.mark.parametrize("with_pid", [False, True])
+@pytest.mark.parametrize("with_rw", [False, True])
+def test_writer_round_trip(tmp_path, page_width, with_pid, with_rw):
+    path = str(tmp_path / "trace.bin")
+    pages = [(i * 7919) % 5000 for i in range(3000)]
+    pids = [i % 3 for i in range(3000)]
+    rw = [i % 2 for i in range(3000)]
+    with TraceWriter(path, page_width, 4096, with_pid, with_rw) as writer:
+        for start in range(0, 3000, 1000):  # in chunks, as the converter writes
+            chunk = slice(start, start + 1000)
+            writer.write(pages[chunk], pids[chunk] if with_pid else None, rw[chunk] if with_rw else None)
+    with TraceFile(path) as trace:
+        assert (len(trace), trace.page_width, trace.page_size) == (3000, page_width, 4096)
+        assert list(trace.pages) == pages
+        assert (list(trace.pids) if trace.pids is not None else None) == (pids if with_pid else None)
+        assert (list(trace.rw) if trace.rw is not None else None) == (rw if with_rw else None)
+
+
+def test_open_trace_reads_text_and_binary(tmp_path):
+    text = tmp_path / "pages.txt"
+    text.write_text("1 2, 3 # comment\n0x10\n")
+    pages, trace_file = open_trace(str(text))
+    assert list(pages) == [1, 2, 3, 16] and trace_file is None
+    path = str(tmp_path / "trace.bin")
+    write_trace(path, [1, 2, 3, 16])
+    pages, trace_file = open_trace(path)
+    assert list(pages) == [1, 2, 3, 16]
+    trace_file.close()
+
+
+def test_truncated_trace_is_rejected(tmp_path):
+    path = tmp_path / "trace.bin"
+    write_trace(str(path), range(100))
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="truncated"):
+        TraceFile(str(path))
+
+
+def test_convert_address_log(tmp_path):
+    src = tmp_path / "log.csv"
+    src.write_text("address,pid,kind\n0x1000,1,r\n8191,2,W\n# skipped\n0x0,1,write\n12288,3,0\n")
+    dst = str(tmp_path / "trace.bin")
+    assert convert_address_log(str(src), dst, 4096, 0, 1, 2, ",", chunk_size=2) == 4
+    with TraceFile(dst) as trace:
+        assert list(trace.pages) == [1, 1, 0, 3]
+        assert list(trace.pids) == [1, 2, 1, 3]
+        assert list(trace.rw) == [READ, WRITE, WRITE, READ]
+        assert trace.page_size == 4096
+
+
+def test_failed_conversion_leaves_no_trace(tmp_path):
+    src = tmp_path / "log.txt"
+    src.write_text("\n".join(str(a) for a in (0, 1 << 20, 1 << 40)) + "\n")
+    dst = tmp_path / "trace.bin"
+    with pytest.raises(ValueError, match="does not fit"):
+        convert_address_log(str(src), str(dst), page_size=1, page_width=4)
+    assert not os.path.exists(dst)
+
+
+def test_unknown_access_kind_names_the_line(tmp_path):
+    src = tmp_path / "log.txt"
+    src.write_text("0x1000 r\n0x2000 x\n")
+    dst = tmp_path / "trace.bin"
+    with pytest.raises(ValueError, match=r"log\.txt:2: unknown access kind 'x'"):
+        convert_address_log(str(src), str(dst), rw_column=1)
+    assert not os.path.exists(dst)
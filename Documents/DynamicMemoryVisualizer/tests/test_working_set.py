@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from backend.memory_management import PagingSimulator
+from backend.working_set import WorkingSetAnalyzer
+
+
+def brute_force_working_sets(trace, tau):
+    # W(t, tau) after each reference t = 1..n
+    return [len(set(trace[max(0, t - tau):t])) for t in range(1, len(trace) + 1)]
+
+
+@pytest.mark.parametrize("tau,interval", [(1, 1), (10, 7), (50, 100), (400, 33)])
+def test_samples_match_brute_force(tau, interval):
+    rng = random.Random(tau)
+    trace = [rng.randrange(15) if i % 300 < 150 else rng.randrange(60) for i in range(2000)]
+    simulator = PagingSimulator(8, "LRU")
+    analyzer = WorkingSetAnalyzer(tau, interval)
+    simulator.add_observer(analyzer)
+    flags = simulator.run_trace(trace).fault_flags
+    analyzer.flush()
+    sizes = brute_force_working_sets(trace, tau)
+    expected = []
+    for start in range(0, len(trace), interval):
+        window = sizes[start:start + interval]
+        faults = sum(flags[start:start + interval])
+        expected.append((start + len(window), window[-1], max(window), pytest.approx(sum(window) / len(window)),
+                         faults, pytest.approx(faults / len(window))))
+    assert list(analyzer.series) == expected
+    summary = analyzer.summary()
+    assert summary["working_set"] == sizes[-1]
+    assert summary["peak_working_set"] == max(sizes)
+    assert summary["mean_working_set"] == pytest.approx(sum(sizes) / len(sizes))
+    assert summary["fault_rate"] == pytest.approx(sum(flags) / len(trace))
+
+
+def test_feed_matches_observed_replay():
+    trace = [i % 37 for i in range(1000)]
+    observed = WorkingSetAnalyzer(20, 9)
+    simulator = PagingSimulator(16, "FIFO")
+    simulator.add_observer(observed)
+    simulator.run_trace(trace)
+    fed = WorkingSetAnalyzer(20, 9)
+    fed.feed(trace, PagingSimulator(16, "FIFO").run_trace(trace).fault_flags)
+    assert list(fed.series) == list(observed.series)
+
+
+def test_untaken_samples_are_bounded():
+    analyzer = WorkingSetAnalyzer(5, 1, max_samples=100)
+    analyzer.feed(range(10_000), [1] * 10_000)
+    samples = analyzer.take_samples()
+    assert len(samples) == 100 and samples[-1][0] == 10_000
+    assert analyzer.take_samples() == []